@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CrmConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.crm'
+
+    def ready(self):
+        # Keep the in-memory autocomplete index in sync with customer writes
+        from . import autocomplete  # noqa: F401
@@ -0,0 +1,201 @@
+"""
+In-memory customer autocomplete.
+
+Every process keeps a sorted array of (key, customer pk) pairs for its active
+customers, where the keys are the folded name, the start of each later word of
+the name, the phone digits and the customer id. A lookup is a binary search for
+the typed prefix followed by a short forward scan, so it never touches the
+database once the index is loaded.
+
+Saves and deletes made by this process are applied after their transaction
+commits. Writes made by other processes are picked up by a throttled
+updated_at delta query, and a periodic full reload drops customers that other
+processes deleted.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.text import search_key
+
+from .models import Customer
+
+
+RECORD_FIELDS = ['id', 'customer_id', 'name', 'phone']
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+# Seconds between delta queries for other processes' writes, and between full reloads
+SYNC_INTERVAL = 5
+RELOAD_INTERVAL = 600
+# Rows saved this long before the watermark are fetched again, so a transaction
+# that committed after a later one is not skipped
+SYNC_OVERLAP = timedelta(seconds=30)
+
+PHONE_QUERY = re.compile(r'[\d\s+\-()]+')
+
+
+def customer_keys(customer_id, name, phone):
+    """Prefix keys a customer can be found by"""
+    keys = set()
+    folded = search_key(name)
+    if folded:
+        keys.add(folded)
+        # Also match the start of later words: "saleh" finds "mohamed saleh"
+        for match in re.finditer(r' ', folded):
+            keys.add(folded[match.end():])
+    digits = re.sub(r'\D', '', phone or '')
+    if digits:
+        keys.add(digits)
+    if customer_id:
+        keys.add(search_key(customer_id))
+    return keys
+
+
+def query_key(query):
+    """Fold a typed query the same way as the keys"""
+    if PHONE_QUERY.fullmatch(query or ''):
+        return re.sub(r'\D', '', query)
+    return search_key(query)
+
+
+class CustomerPrefixIndex:
+    """Sorted-array prefix index of active customers"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything; the next lookup reloads from the database"""
+        with self._lock:
+            self._entries = []
+            self._records = {}
+            self._keys = {}
+            self._loaded_at = None
+            self._synced_at = None
+            self._watermark = None
+
+    def _add(self, record):
+        pk = record[0]
+        self._discard(pk)
+        keys = customer_keys(*record[1:])
+        for key in keys:
+            insort(self._entries, (key, pk))
+        self._records[pk] = record
+        self._keys[pk] = keys
+
+    def _discard(self, pk):
+        for key in self._keys.pop(pk, ()):
+            position = bisect_left(self._entries, (key, pk))
+            if position < len(self._entries) and self._entries[position] == (key, pk):
+                del self._entries[position]
+        self._records.pop(pk, None)
+
+    def _apply(self, rows):
+        """Apply (id, customer_id, name, phone, is_active, updated_at) rows"""
+        for *record, is_active, updated_at in rows:
+            if is_active:
+                self._add(tuple(record))
+            else:
+                self._discard(record[0])
+            if updated_at and (self._watermark is None or updated_at > self._watermark):
+                self._watermark = updated_at
+
+    def load(self):
+        """Rebuild the index from all active customers"""
+        rows = Customer.objects.filter(is_active=True).values_list(*RECORD_FIELDS)
+        watermark = Customer.objects.aggregate(latest=Max('updated_at'))['latest']
+        entries = []
+        records = {}
+        keys_of = {}
+        for record in rows.iterator(chunk_size=2000):
+            keys = customer_keys(*record[1:])
+            entries.extend((key, record[0]) for key in keys)
+            records[record[0]] = record
+            keys_of[record[0]] = keys
+        entries.sort()
+
+        with self._lock:
+            self._entries = entries
+            self._records = records
+            self._keys = keys_of
+            self._watermark = watermark
+            self._loaded_at = self._synced_at = time.monotonic()
+
+    def sync(self):
+        """Apply customers saved by any process since the last load or sync"""
+        with self._lock:
+            watermark = self._watermark
+        if watermark is not None:
+            rows = Customer.objects.filter(updated_at__gte=watermark - SYNC_OVERLAP).values_list(
+                *RECORD_FIELDS, 'is_active', 'updated_at'
+            )
+            rows = list(rows)
+            with self._lock:
+                self._apply(rows)
+        with self._lock:
+            self._synced_at = time.monotonic()
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at >= RELOAD_INTERVAL:
+            self.load()
+        elif now - self._synced_at >= SYNC_INTERVAL:
+            self.sync()
+
+    def update(self, customer):
+        """Apply a saved customer"""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._apply([(
+                customer.pk, customer.customer_id, customer.name, customer.phone,
+                customer.is_active, customer.updated_at
+            )])
+
+    def remove(self, pk):
+        """Drop a deleted customer"""
+        with self._lock:
+            self._discard(pk)
+
+    def lookup(self, query, limit=DEFAULT_LIMIT):
+        """Return up to `limit` (id, customer_id, name, phone) records whose keys start with the query"""
+        prefix = query_key(query)
+        if not prefix:
+            return []
+        self._refresh()
+
+        results = []
+        seen = set()
+        with self._lock:
+            position = bisect_left(self._entries, (prefix,))
+            while position < len(self._entries) and len(results) < limit:
+                key, pk = self._entries[position]
+                if not key.startswith(prefix):
+                    break
+                if pk not in seen:
+                    seen.add(pk)
+                    results.append(self._records[pk])
+                position += 1
+        return results
+
+
+customer_index = CustomerPrefixIndex()
+
+
+@receiver(post_save, sender=Customer)
+def update_customer_index(sender, instance, **kwargs):
+    transaction.on_commit(lambda: customer_index.update(instance))
+
+
+@receiver(post_delete, sender=Customer)
+def remove_from_customer_index(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: customer_index.remove(pk))
@@ -1,32 +1,37 @@
-from django.db import models
+from django.db import models, transaction
+from apps.master.sequences import next_number
+from core.text import search_key
 
 # Create your models here.
 class Customer(models.Model):
     customer_id = models.CharField(max_length=255, unique=True, blank=True)
     name = models.CharField(max_length=255)
     phone = models.CharField(max_length=255)
+    search_key = models.CharField(max_length=255, blank=True, default='', editable=False)
     balance = models.DecimalField(max_digits=10, decimal_places=2)
     points = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at'], name='customer_created_idx'),
+            models.Index(fields=['updated_at'], name='customer_updated_idx'),
+            models.Index(fields=['search_key'], name='customer_search_key_idx', opclasses=['varchar_pattern_ops']),
+        ]
+
     def save(self, *args, **kwargs):
-        if not self.customer_id:
-            # Get the highest existing customer_id number
-            last_customer = Customer.objects.filter(
-                customer_id__regex=r'^\d+$'
-            ).order_by('customer_id').last()
-            
-            if last_customer:
-                # Extract the number and increment it
-                last_number = int(last_customer.customer_id)
-                self.customer_id = str(last_number + 1)
-            else:
-                # Start with 1 if no customers exist
-                self.customer_id = '1'
-        
-        super().save(*args, **kwargs)
+        self.search_key = search_key(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_key'}
+
+        # Allocate the id in the insert's transaction, so a failed insert releases it
+        with transaction.atomic():
+            if not self.customer_id:
+                self.customer_id = next_number('customer')
+            super().save(*args, **kwargs)
 
     def __str__(self): 
         return self.name
\ No newline at end of file
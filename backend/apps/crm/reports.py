@@ -0,0 +1,103 @@
+"""
+Customer report engine.
+
+Computes per-customer job order totals in a single grouped query and lets the
+report be filtered and ordered on the computed columns, e.g.
+``?balance_amount__gt=0&ordering=-balance_amount``.
+"""
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Count, DecimalField, Max, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+
+from core.filters import day_start, parse_date
+from core.pagination import CreatedAtCursorPagination
+
+
+# Computed column -> parser for filter values
+REPORT_COLUMNS = {
+    'total_orders': int,
+    'total_amount': Decimal,
+    'balance_amount': Decimal,
+    'last_order_date': parse_date,
+}
+REPORT_LOOKUPS = ['exact', 'gt', 'gte', 'lt', 'lte']
+REPORT_ORDERING_FIELDS = list(REPORT_COLUMNS) + ['name', 'customer_id', 'created_at']
+DEFAULT_REPORT_ORDERING = '-created_at'
+
+# Day lookups on last_order_date -> bounds on the raw datetime, so no date cast is needed
+DAY_LOOKUPS = {
+    'gt': [('gte', 1)],
+    'gte': [('gte', 0)],
+    'lt': [('lt', 0)],
+    'lte': [('lt', 1)],
+    'exact': [('gte', 0), ('lt', 1)],
+}
+
+
+def customer_report_queryset(queryset):
+    """Annotate customers with order count, total amount, outstanding balance and last order date"""
+    active_orders = Q(joborder__is_active=True)
+    amount_field = DecimalField(max_digits=12, decimal_places=2)
+    return queryset.annotate(
+        total_orders=Count('joborder', filter=active_orders),
+        total_amount=Coalesce(
+            Sum('joborder__total_amount', filter=active_orders),
+            Value(0),
+            output_field=amount_field
+        ),
+        balance_amount=Coalesce(
+            Sum('joborder__balance_amount', filter=active_orders),
+            Value(0),
+            output_field=amount_field
+        ),
+        last_order_date=Max('joborder__created_at', filter=active_orders),
+    )
+
+
+def filter_report(queryset, params):
+    """Apply `<column>__<lookup>=value` filters on computed report columns"""
+    filters = {}
+    for column, parse in REPORT_COLUMNS.items():
+        for lookup in REPORT_LOOKUPS:
+            key = column if lookup == 'exact' else f'{column}__{lookup}'
+            value = params.get(key)
+            if value in (None, ''):
+                continue
+            try:
+                parsed = parse(value)
+            except (ValueError, InvalidOperation):
+                raise ValidationError({key: f"Invalid value: {value}"})
+            if column == 'last_order_date':
+                for bound, offset in DAY_LOOKUPS[lookup]:
+                    filters[f'last_order_date__{bound}'] = day_start(parsed + timedelta(days=offset))
+                continue
+            filters[key] = parsed
+    return queryset.filter(**filters)
+
+
+def report_ordering(value):
+    """Validate the requested ordering and return it with an id tie-breaker"""
+    value = value or DEFAULT_REPORT_ORDERING
+    if value.lstrip('-') not in REPORT_ORDERING_FIELDS:
+        raise ValidationError({'ordering': f"Invalid ordering. Allowed: {', '.join(REPORT_ORDERING_FIELDS)}"})
+    direction = '-' if value.startswith('-') else ''
+    return (value, f'{direction}id')
+
+
+class CustomerReportPagination(CreatedAtCursorPagination):
+    """Cursor pagination ordered by the report's requested column"""
+
+    def get_ordering(self, request, queryset, view):
+        return report_ordering(request.query_params.get('ordering'))
+
+
+def build_customer_report(queryset, params):
+    """Return the annotated, filtered customer report queryset for the given query params"""
+    queryset = filter_report(customer_report_queryset(queryset), params)
+    # Customers without orders have no last order date to page on
+    if (params.get('ordering') or '').lstrip('-') == 'last_order_date':
+        queryset = queryset.filter(last_order_date__isnull=False)
+    return queryset
@@ -31,12 +31,15 @@ class CustomerSerializer(serializers.ModelSerializer):
         }
     
     def get_total_orders(self, obj):
-        """Calculate total job orders for this customer"""
+        """Total active job orders, annotated by CustomerViewSet.get_queryset"""
+        if hasattr(obj, 'total_orders'):
+            return obj.total_orders
         return JobOrder.objects.filter(customer=obj, is_active=True).count()
     
     def get_total_order_amount(self, obj):
-        """Calculate total amount from job orders for this customer"""
-        from django.db.models import Sum
+        """Total amount of active job orders, annotated by CustomerViewSet.get_queryset"""
+        if hasattr(obj, 'total_order_amount'):
+            return float(obj.total_order_amount)
         result = JobOrder.objects.filter(customer=obj, is_active=True).aggregate(
             total=Sum('total_amount')
         )
@@ -73,11 +76,11 @@ class CustomerSerializer(serializers.ModelSerializer):
 
 
 class CustomerReportSerializer(serializers.ModelSerializer):
-    """Serializer for customer reports with calculated fields"""
-    total_orders = serializers.SerializerMethodField()
-    total_amount = serializers.SerializerMethodField()
-    balance_amount = serializers.SerializerMethodField()
-    last_order_date = serializers.SerializerMethodField()
+    """Serializer for customer reports; calculated fields come from apps.crm.reports annotations"""
+    total_orders = serializers.IntegerField(read_only=True)
+    total_amount = serializers.FloatField(read_only=True)
+    balance_amount = serializers.FloatField(read_only=True)
+    last_order_date = serializers.DateTimeField(read_only=True)
     email = serializers.SerializerMethodField()
     
     class Meta:
@@ -100,27 +103,6 @@ class CustomerReportSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'customer_id', 'created_at', 'updated_at']
     
-    def get_total_orders(self, obj):
-        """Calculate total job orders for this customer"""
-        return JobOrder.objects.filter(customer=obj, is_active=True).count()
-    
-    def get_total_amount(self, obj):
-        """Calculate total amount from job orders for this customer"""
-        job_orders = JobOrder.objects.filter(customer=obj, is_active=True)
-        total = sum(order.total_amount for order in job_orders)
-        return round(total, 2)
-    
-    def get_balance_amount(self, obj):
-        """Calculate total balance amount from job orders for this customer"""
-        job_orders = JobOrder.objects.filter(customer=obj, is_active=True)
-        balance = sum(order.balance_amount for order in job_orders)
-        return round(balance, 2)
-    
-    def get_last_order_date(self, obj):
-        """Get the date of the most recent job order for this customer"""
-        last_order = JobOrder.objects.filter(customer=obj, is_active=True).order_by('-created_at').first()
-        return last_order.created_at if last_order else None
-    
     def get_email(self, obj):
         """Return empty string for email since it's not in the model"""
         return ""
@@ -1,3 +1,131 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.joborder.models import JobOrder
+from .autocomplete import customer_index
+from .models import Customer
 
-# Create your tests here.
+User = get_user_model()
+
+
+class CustomerAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        customer_index.reset()
+
+    def create_order(self, customer, number, total_amount, balance_amount, is_active=True):
+        return JobOrder.objects.create(
+            job_order_number=number,
+            customer=customer,
+            status='pending',
+            delivery_date='2024-01-15T10:00:00Z',
+            total_amount=total_amount,
+            advance_amount=total_amount - balance_amount,
+            balance_amount=balance_amount,
+            is_active=is_active
+        )
+
+    def test_list_customers_with_order_totals_in_one_query(self):
+        """Test customer listing annotates order totals without per-row queries"""
+        for index in range(5):
+            customer = Customer.objects.create(name=f'Customer {index}', phone=f'05000000{index}', balance=0)
+            self.create_order(customer, f'JO-{index}-1', 100, 0)
+            self.create_order(customer, f'JO-{index}-2', 50, 0)
+            self.create_order(customer, f'JO-{index}-3', 999, 0, is_active=False)
+
+        url = reverse('customer-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(response.data['results']), 5)
+        for customer in response.data['results']:
+            self.assertEqual(customer['total_orders'], 2)
+            self.assertEqual(customer['total_order_amount'], 150.0)
+
+    def test_search_customers(self):
+        """Test customer search returns annotated matches"""
+        customer = Customer.objects.create(name='Ahmed Ali', phone='0551234567', balance=0)
+        Customer.objects.create(name='Other', phone='0559999999', balance=0)
+        self.create_order(customer, 'JO-1', 80, 30)
+
+        response = self.client.get(reverse('customer-search'), {'q': '1234'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['name'] for row in response.data['results']], ['Ahmed Ali'])
+        self.assertEqual(response.data['results'][0]['total_order_amount'], 80.0)
+
+    def test_search_folds_arabic_variants(self):
+        """Test customer search matches names regardless of hamza, taa marbuta and tashkeel"""
+        customer = Customer.objects.create(name='أَحْمَد فاطمة', phone='0551234567', balance=0)
+        Customer.objects.create(name='محمد', phone='0559999999', balance=0)
+        self.assertEqual(customer.search_key, 'احمد فاطمه')
+
+        response = self.client.get(reverse('customer-search'), {'q': 'احمد فاطمه'})
+        self.assertEqual([row['id'] for row in response.data['results']], [customer.id])
+
+        response = self.client.get(reverse('customer-list'), {'search': 'أحمد'})
+        self.assertEqual([row['id'] for row in response.data['results']], [customer.id])
+
+    def test_autocomplete_from_memory(self):
+        """Test autocomplete answers prefix lookups without queries and follows writes"""
+        saleh = Customer.objects.create(name='Mohammed Saleh', phone='055 123 4567', balance=0)
+        Customer.objects.create(name='Salem', phone='0509999999', balance=0)
+        url = reverse('customer-autocomplete')
+
+        response = self.client.get(url, {'q': 'sal'})
+        self.assertEqual([row['name'] for row in response.data], ['Mohammed Saleh', 'Salem'])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'q': '0551234'})
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(response.data, [{
+            'id': saleh.id, 'customer_id': saleh.customer_id, 'name': 'Mohammed Saleh', 'phone': '055 123 4567'
+        }])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            saleh.name = 'Ahmed Saleh'
+            saleh.save()
+            Customer.objects.create(name='Ahmad', phone='0561111111', balance=0)
+        response = self.client.get(url, {'q': 'ahm'})
+        self.assertEqual([row['name'] for row in response.data], ['Ahmad', 'Ahmed Saleh'])
+        self.assertEqual(self.client.get(url, {'q': 'moh'}).data, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            saleh.delete()
+        self.assertEqual([row['name'] for row in self.client.get(url, {'q': 'a', 'limit': 1}).data], ['Ahmad'])
+
+    def test_customer_report_filters_and_orders_on_computed_columns(self):
+        """Test customer report computes totals in one query and filters/orders by balance"""
+        paid = Customer.objects.create(name='Paid', phone='1', balance=0)
+        small = Customer.objects.create(name='Small', phone='2', balance=0)
+        large = Customer.objects.create(name='Large', phone='3', balance=0)
+        Customer.objects.create(name='No Orders', phone='4', balance=0)
+        self.create_order(paid, 'JO-1', 100, 0)
+        self.create_order(small, 'JO-2', 100, 20)
+        self.create_order(large, 'JO-3', 300, 150)
+        self.create_order(large, 'JO-4', 200, 50)
+
+        url = reverse('customer-report')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'balance_amount__gt': '0', 'ordering': '-balance_amount'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        rows = response.data['results']
+        self.assertEqual([row['name'] for row in rows], ['Large', 'Small'])
+        self.assertEqual(rows[0]['total_orders'], 2)
+        self.assertEqual(rows[0]['total_amount'], 500.0)
+        self.assertEqual(rows[0]['balance_amount'], 200.0)
+        self.assertIsNotNone(rows[0]['last_order_date'])
+
+        response = self.client.get(url, {'ordering': 'email'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -3,13 +3,37 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.exceptions import ValidationError
+from django.db.models import Count, DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from .models import Customer
+from apps.joborder.models import JobOrder
+from apps.search.query import search_queryset
 from .serializers import CustomerSerializer, CustomerReportSerializer
+from .reports import CustomerReportPagination, build_customer_report
+from .autocomplete import DEFAULT_LIMIT, MAX_LIMIT, RECORD_FIELDS, customer_index
+from core.filters import NormalizedSearchFilter, filter_date_range
+from core.pagination import CreatedAtCursorPagination, PaginatedActionMixin
 
 
-class CustomerViewSet(viewsets.ModelViewSet):
+def with_order_totals(queryset):
+    """Annotate each customer with the count and total amount of their active job orders"""
+    orders = JobOrder.objects.filter(customer=OuterRef('pk'), is_active=True).order_by().values('customer')
+    return queryset.annotate(
+        total_orders=Coalesce(
+            Subquery(orders.annotate(count=Count('id')).values('count')),
+            Value(0)
+        ),
+        total_order_amount=Coalesce(
+            Subquery(orders.annotate(total=Sum('total_amount')).values('total')),
+            Value(0),
+            output_field=DecimalField(max_digits=12, decimal_places=2)
+        ),
+    )
+
+
+class CustomerViewSet(PaginatedActionMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing customers with full CRUD operations.
     
@@ -21,16 +45,18 @@ class CustomerViewSet(viewsets.ModelViewSet):
     - PATCH /api/crm/customers/{id}/ - Update customer (partial update)
     - DELETE /api/crm/customers/{id}/ - Delete customer
     - GET /api/crm/customers/search/?q=query - Search customers
+    - GET /api/crm/customers/autocomplete/?q=prefix - Top matches by phone, name or customer_id prefix
     - GET /api/crm/customers/active/ - Get only active customers
     """
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = CreatedAtCursorPagination
+    filter_backends = [DjangoFilterBackend, NormalizedSearchFilter, OrderingFilter]
     filterset_fields = ['is_active', 'customer_id']
-    search_fields = ['name', 'phone', 'customer_id']
+    search_fields = ['^search_key', 'phone', 'customer_id']
     ordering_fields = ['created_at', 'updated_at', 'name', 'customer_id']
-    ordering = ['-created_at']
+    ordering = ['-created_at', '-id']
 
     def create(self, request, *args, **kwargs):
         """Override create to provide better error handling"""
@@ -73,7 +99,11 @@ class CustomerViewSet(viewsets.ModelViewSet):
             )
 
     def get_queryset(self):
-        """Return queryset with optional filtering"""
+        """Return filtered queryset with per-customer order totals"""
+        return with_order_totals(self.get_filtered_queryset())
+
+    def get_filtered_queryset(self):
+        """Return customers with optional filtering applied"""
         queryset = Customer.objects.all()
         
         # Filter by active status if requested
@@ -85,21 +115,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
         start_date = self.request.query_params.get('start_date')
         end_date = self.request.query_params.get('end_date')
         
-        if start_date:
-            try:
-                from datetime import datetime
-                start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-                queryset = queryset.filter(created_at__date__gte=start_date_obj)
-            except ValueError:
-                pass  # Invalid date format, ignore the filter
-        
-        if end_date:
-            try:
-                from datetime import datetime
-                end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-                queryset = queryset.filter(created_at__date__lte=end_date_obj)
-            except ValueError:
-                pass  # Invalid date format, ignore the filter
+        queryset = filter_date_range(queryset, 'created_at', start_date, end_date)
             
         return queryset
 
@@ -107,25 +123,30 @@ class CustomerViewSet(viewsets.ModelViewSet):
     def active(self, request):
         """Get only active customers"""
         active_customers = self.get_queryset().filter(is_active=True)
-        serializer = self.get_serializer(active_customers, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(active_customers)
 
     @action(detail=False, methods=['get'])
     def search(self, request):
         """Search customers by name, phone, or customer_id"""
         query = request.query_params.get('q', '')
         if query:
-            customers = self.get_queryset().filter(
-                name__icontains=query
-            ) | self.get_queryset().filter(
-                phone__icontains=query
-            ) | self.get_queryset().filter(
-                customer_id__icontains=query
-            )
-            serializer = self.get_serializer(customers, many=True)
-            return Response(serializer.data)
+            customers = search_queryset(self.get_queryset(), 'customer', query)
+            return self.paginated_response(customers)
         return Response([])
 
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Return the top customers whose phone, name or customer_id starts with q, from memory"""
+        try:
+            limit = min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid limit'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        records = customer_index.lookup(request.query_params.get('q', ''), max(limit, 1))
+        return Response([dict(zip(RECORD_FIELDS, record)) for record in records])
+
     @action(detail=True, methods=['patch'])
     def update_balance(self, request, pk=None):
         """Update customer balance"""
@@ -183,14 +204,14 @@ class CustomerViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def report(self, request):
-        """Get customer report with calculated fields"""
-        queryset = self.get_queryset()
+        """
+        Get customer report with calculated fields.
         
-        # Apply pagination if needed
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = CustomerReportSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = CustomerReportSerializer(queryset, many=True)
-        return Response(serializer.data)
+        Totals are computed in one grouped query. Computed columns can be filtered with
+        `<column>__gt/gte/lt/lte` (e.g. balance_amount__gt=0) and used in `ordering`.
+        """
+        queryset = build_customer_report(self.get_filtered_queryset(), request.query_params)
+        paginator = CustomerReportPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = CustomerReportSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Item, ItemCategory, Stock, StockMovement
+from .models import Item, ItemCategory, Stock, StockMovement, with_current_stock
 
 
 @admin.register(ItemCategory)
@@ -20,14 +20,14 @@ class ItemAdmin(admin.ModelAdmin):
     list_editable = ['is_active']
     readonly_fields = ['get_current_stock']
     
+    def get_queryset(self, request):
+        return with_current_stock(super().get_queryset(request).select_related('category'))
+    
     def get_current_stock(self, obj):
         """Display current stock quantity"""
-        try:
-            stock = Stock.objects.get(item=obj, location='main')
-            return f"{stock.quantity} {obj.unit}"
-        except Stock.DoesNotExist:
-            return f"0 {obj.unit}"
+        return f"{getattr(obj, 'current_stock', 0)} {obj.unit}"
     get_current_stock.short_description = 'Current Stock'
+    get_current_stock.admin_order_field = 'current_stock'
 
 
 @admin.register(Stock)
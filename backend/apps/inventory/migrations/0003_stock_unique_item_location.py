@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:52
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_duplicate_stock(apps, schema_editor):
+    """Fold Stock rows sharing an item and location into the oldest one, summing quantities"""
+    Stock = apps.get_model('inventory', 'Stock')
+    duplicates = (
+        Stock.objects.order_by().values('item_id', 'location')
+        .annotate(rows=Count('id'), total=Sum('quantity'))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates:
+        rows = Stock.objects.filter(item_id=duplicate['item_id'], location=duplicate['location']).order_by('id')
+        keep = rows.first()
+        rows.exclude(pk=keep.pk).delete()
+        Stock.objects.filter(pk=keep.pk).update(quantity=duplicate['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_alter_item_sku'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_stock, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='stock',
+            constraint=models.UniqueConstraint(fields=('item', 'location'), name='unique_stock_item_location'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_stock_unique_item_location'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['item', '-date'], name='stockmovement_item_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['-date'], name='stockmovement_date_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
-import random
-import string
+from django.db.models import DecimalField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from apps.master.sequences import next_number
 
 class Item(models.Model):
     name = models.CharField(max_length=255)
@@ -10,6 +11,12 @@ class Item(models.Model):
     unit = models.CharField(max_length=20, default='meter')  # meter, piece, roll, etc.
     is_active = models.BooleanField(default=True)
     is_raw_material = models.BooleanField(default=True)  # raw/final product
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['updated_at'], name='item_updated_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         # Generate SKU if it's empty or null
@@ -18,12 +25,12 @@ class Item(models.Model):
         super().save(*args, **kwargs)
 
     def generate_sku(self):
-        """Generate a unique 5-digit SKU"""
+        """
+        Generate a unique SKU from the item SKU sequence: 5 digits, growing past
+        them after 99999. Numbers taken by the random SKUs of older items are skipped.
+        """
         while True:
-            # Generate a 5-digit random number
-            sku = ''.join(random.choices(string.digits, k=5))
-            
-            # Check if this SKU already exists
+            sku = next_number('item_sku')
             if not Item.objects.filter(sku=sku).exists():
                 return sku
 
@@ -39,6 +46,24 @@ class Stock(models.Model):
     location = models.CharField(max_length=100, default='main')  # Optional multi-location
     last_updated = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            # One row per item and location, so stock rows can be upserted
+            models.UniqueConstraint(fields=['item', 'location'], name='unique_stock_item_location'),
+        ]
+
+
+def with_current_stock(queryset, location='main'):
+    """Annotate items with their stock quantity at a location (0 when no stock row exists)"""
+    stock = Stock.objects.filter(item=OuterRef('pk'), location=location).values('quantity')[:1]
+    return queryset.annotate(
+        current_stock=Coalesce(
+            Subquery(stock),
+            Value(0),
+            output_field=DecimalField(max_digits=10, decimal_places=2)
+        )
+    )
+
 
 class StockMovement(models.Model):
     item = models.ForeignKey(Item, on_delete=models.CASCADE)
@@ -53,4 +78,12 @@ class StockMovement(models.Model):
         ]
     )
     reference = models.CharField(max_length=100, null=True, blank=True)  # PurchaseOrder, JobOrder, etc.
-    remarks = models.TextField(null=True, blank=True)
\ No newline at end of file
+    remarks = models.TextField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Item stock history
+            models.Index(fields=['item', '-date'], name='stockmovement_item_date_idx'),
+            # Movement list and date range summaries
+            models.Index(fields=['-date'], name='stockmovement_date_idx'),
+        ]
\ No newline at end of file
@@ -26,6 +26,9 @@ class ItemSerializer(serializers.ModelSerializer):
     
     def get_current_stock(self, obj):
         """Get the current stock quantity for this item"""
+        # Annotated by with_current_stock() on list/detail querysets
+        if hasattr(obj, 'current_stock'):
+            return float(obj.current_stock)
         try:
             stock = Stock.objects.get(item=obj, location='main')
             return float(stock.quantity)
@@ -73,3 +76,33 @@ class StockAdjustmentSerializer(serializers.Serializer):
         if value <= 0:
             raise serializers.ValidationError("Quantity must be positive")
         return value
+
+
+class BulkStockAdjustmentLineSerializer(serializers.Serializer):
+    """One line of a bulk stock adjustment; items are checked in bulk by the parent"""
+    item = serializers.IntegerField()
+    quantity = serializers.DecimalField(max_digits=10, decimal_places=2)
+    movement_type = serializers.ChoiceField(choices=['IN', 'OUT', 'ADJUST'])
+    reference = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    remarks = serializers.CharField(required=False, allow_blank=True)
+    
+    def validate_quantity(self, value):
+        """Ensure quantity is positive"""
+        if value <= 0:
+            raise serializers.ValidationError("Quantity must be positive")
+        return value
+
+
+class BulkStockAdjustmentSerializer(serializers.Serializer):
+    """Serializer for applying many stock adjustments in one transaction"""
+    adjustments = BulkStockAdjustmentLineSerializer(many=True, allow_empty=False)
+    location = serializers.CharField(max_length=100, required=False, default='main')
+    
+    def validate_adjustments(self, value):
+        """Ensure every referenced item exists, using a single query"""
+        item_ids = {line['item'] for line in value}
+        existing = set(Item.objects.filter(id__in=item_ids).values_list('id', flat=True))
+        missing = sorted(item_ids - existing)
+        if missing:
+            raise serializers.ValidationError(f"Items do not exist: {', '.join(map(str, missing))}")
+        return value
@@ -0,0 +1,91 @@
+"""
+Stock adjustment service.
+
+Stock quantities are changed with UPDATE ... SET quantity = quantity +/- x so that
+concurrent adjustments never overwrite each other, and a batch of adjustments is
+applied with a fixed number of statements regardless of its size.
+"""
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Value, When
+from django.utils import timezone
+
+from .models import Item, Stock, StockMovement
+
+
+def _fold(adjustments):
+    """
+    Reduce the adjustments of each item to one (mode, amount) pair: ('delta', x)
+    adds x to the stored quantity and ('set', x) replaces it, so later
+    movements apply on top of an earlier ADJUST.
+    """
+    effects = OrderedDict()
+    for adjustment in adjustments:
+        item_id = adjustment['item_id']
+        quantity = Decimal(adjustment['quantity'])
+        mode, amount = effects.get(item_id, ('delta', Decimal('0')))
+        if adjustment['movement_type'] == 'ADJUST':
+            mode, amount = 'set', quantity
+        elif adjustment['movement_type'] == 'IN':
+            amount += quantity
+        else:
+            amount -= quantity
+        effects[item_id] = (mode, amount)
+    return effects
+
+
+def apply_stock_adjustments(adjustments, location='main'):
+    """
+    Record stock movements and update stock levels for a batch of adjustments.
+
+    Each adjustment is a dict with item_id, quantity, movement_type and optional
+    reference/remarks. Returns (movements, {item_id: new_quantity}).
+    """
+    if not adjustments:
+        return [], {}
+
+    effects = _fold(adjustments)
+    output_field = DecimalField(max_digits=10, decimal_places=2)
+
+    with transaction.atomic():
+        movements = StockMovement.objects.bulk_create([
+            StockMovement(
+                item_id=adjustment['item_id'],
+                quantity=adjustment['quantity'],
+                movement_type=adjustment['movement_type'],
+                reference=adjustment.get('reference', ''),
+                remarks=adjustment.get('remarks', '')
+            )
+            for adjustment in adjustments
+        ])
+
+        # Create the stock rows that do not exist yet; existing rows are left untouched
+        Stock.objects.bulk_create(
+            [Stock(item_id=item_id, quantity=0, location=location) for item_id in effects],
+            ignore_conflicts=True
+        )
+
+        now = timezone.now()
+        Stock.objects.filter(item_id__in=effects, location=location).update(
+            quantity=Case(
+                *[
+                    When(
+                        item_id=item_id,
+                        then=Value(amount) if mode == 'set' else F('quantity') + Value(amount)
+                    )
+                    for item_id, (mode, amount) in effects.items()
+                ],
+                output_field=output_field
+            ),
+            last_updated=now
+        )
+        # Items embed their current stock, so delta sync must see them as changed
+        Item.objects.filter(pk__in=effects).update(updated_at=now)
+
+        levels = dict(
+            Stock.objects.filter(item_id__in=effects, location=location).values_list('item_id', 'quantity')
+        )
+
+    return movements, levels
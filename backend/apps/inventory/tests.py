@@ -1,3 +1,99 @@
-from django.test import TestCase
+import io
+import zipfile
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Item, Stock, StockMovement
 
-# Create your tests here.
+User = get_user_model()
+
+
+class ItemAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_items_with_current_stock(self):
+        """Test item listing reads current stock from an annotation and can order/filter by it"""
+        for name, quantity in [('Cotton', 5), ('Linen', 20), ('Silk', None)]:
+            item = Item.objects.create(name=name)
+            if quantity is not None:
+                Stock.objects.create(item=item, quantity=quantity, location='main')
+
+        url = reverse('item-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'ordering': '-current_stock'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            [(item['name'], item['current_stock']) for item in response.data],
+            [('Linen', 20.0), ('Cotton', 5.0), ('Silk', 0.0)]
+        )
+
+        response = self.client.get(url, {'min_stock': '10'})
+        self.assertEqual([item['name'] for item in response.data], ['Linen'])
+
+        response = self.client.get(url, {'max_stock': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('max_stock', response.data)
+
+    def test_adjust_stock(self):
+        """Test stock adjustments update the stored quantity in place"""
+        item = Item.objects.create(name='Cotton')
+        url = reverse('item-adjust-stock', kwargs={'pk': item.id})
+
+        response = self.client.post(url, {'item': item.id, 'quantity': '10', 'movement_type': 'IN'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['new_stock'], 10.0)
+
+        response = self.client.post(url, {'item': item.id, 'quantity': '4', 'movement_type': 'OUT'})
+        self.assertEqual(response.data['new_stock'], 6.0)
+        self.assertEqual(Stock.objects.get(item=item).quantity, 6)
+
+    def test_bulk_adjust_stock_in_fixed_queries(self):
+        """Test a large delivery is applied with a constant number of statements"""
+        items = [Item.objects.create(name=f'Roll {index}') for index in range(30)]
+        Stock.objects.create(item=items[0], quantity=5, location='main')
+        adjustments = [
+            {'item': item.id, 'quantity': '2', 'movement_type': 'IN', 'reference': 'PO-1'}
+            for item in items
+            for _ in range(10)
+        ]
+        adjustments.append({'item': items[1].id, 'quantity': '7', 'movement_type': 'ADJUST'})
+        adjustments.append({'item': items[1].id, 'quantity': '1', 'movement_type': 'OUT'})
+
+        url = reverse('item-bulk-adjust-stock')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, {'adjustments': adjustments}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLess(len(queries), 10)
+        self.assertEqual(response.data['new_stock'][items[0].id], 25.0)
+        self.assertEqual(response.data['new_stock'][items[1].id], 6.0)
+        self.assertEqual(response.data['new_stock'][items[2].id], 20.0)
+        self.assertEqual(StockMovement.objects.count(), 302)
+
+        response = self.client.post(url, {'adjustments': [{'item': 9999, 'quantity': '1', 'movement_type': 'IN'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_stock_movements_as_xlsx(self):
+        """Test the XLSX export is a valid workbook holding every movement"""
+        item = Item.objects.create(name='Cotton & Silk', sku='CS-1')
+        for quantity in (5, 3):
+            StockMovement.objects.create(item=item, quantity=quantity, movement_type='IN')
+
+        response = self.client.get(reverse('movement-export'), {'file_format': 'xlsx'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        workbook = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertIsNone(workbook.testzip())
+        sheet = workbook.read('xl/worksheets/sheet1.xml').decode()
+        self.assertEqual(sheet.count('<row>'), 3)
+        self.assertIn('Cotton &amp; Silk', sheet)
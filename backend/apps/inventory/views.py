@@ -1,14 +1,36 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from decimal import Decimal, InvalidOperation
 from django.db import transaction, models
 from django.utils import timezone
-from .models import Item, ItemCategory, Stock, StockMovement
+from .models import Item, ItemCategory, Stock, StockMovement, with_current_stock
 from .serializers import (
     ItemSerializer, ItemCategorySerializer, StockSerializer, 
-    StockMovementSerializer, StockAdjustmentSerializer
+    StockMovementSerializer, StockAdjustmentSerializer, BulkStockAdjustmentSerializer
 )
+from .stock import apply_stock_adjustments
+from core.export import ExportMixin
+from core.pagination import DateCursorPagination
+
+
+ITEM_ORDERING_FIELDS = ['name', 'sku', 'current_stock']
+
+
+def decimal_param(params, name):
+    """Decimal value of a query parameter, or None when absent; a bad value is a 400"""
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        number = None
+    if number is None or not number.is_finite():
+        raise ValidationError({name: 'Must be a number'})
+    return number
 
 
 class ItemCategoryViewSet(viewsets.ModelViewSet):
@@ -38,7 +60,7 @@ class ItemViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter items by various parameters"""
-        queryset = Item.objects.select_related('category').all()
+        queryset = with_current_stock(Item.objects.select_related('category').all())
         
         # Filter by category
         category = self.request.query_params.get('category', None)
@@ -63,6 +85,19 @@ class ItemViewSet(viewsets.ModelViewSet):
                 models.Q(sku__icontains=search)
             )
         
+        # Filter by current stock level
+        min_stock = decimal_param(self.request.query_params, 'min_stock')
+        if min_stock is not None:
+            queryset = queryset.filter(current_stock__gte=min_stock)
+        max_stock = decimal_param(self.request.query_params, 'max_stock')
+        if max_stock is not None:
+            queryset = queryset.filter(current_stock__lte=max_stock)
+        
+        # Order by one of the allowed fields, e.g. ordering=-current_stock
+        ordering = self.request.query_params.get('ordering', None)
+        if ordering and ordering.lstrip('-') in ITEM_ORDERING_FIELDS:
+            queryset = queryset.order_by(ordering, 'id')
+        
         return queryset
     
     @action(detail=True, methods=['get'])
@@ -80,38 +115,45 @@ class ItemViewSet(viewsets.ModelViewSet):
         serializer = StockAdjustmentSerializer(data=request.data)
         
         if serializer.is_valid():
-            with transaction.atomic():
-                # Create stock movement record
-                movement = StockMovement.objects.create(
-                    item=item,
-                    quantity=serializer.validated_data['quantity'],
-                    movement_type=serializer.validated_data['movement_type'],
-                    reference=serializer.validated_data.get('reference', ''),
-                    remarks=serializer.validated_data.get('remarks', '')
-                )
-                
-                # Update or create stock record
-                stock, created = Stock.objects.get_or_create(
-                    item=item,
-                    location='main',
-                    defaults={'quantity': 0}
-                )
-                
-                # Adjust stock based on movement type
-                if serializer.validated_data['movement_type'] == 'IN':
-                    stock.quantity += serializer.validated_data['quantity']
-                elif serializer.validated_data['movement_type'] == 'OUT':
-                    stock.quantity -= serializer.validated_data['quantity']
-                elif serializer.validated_data['movement_type'] == 'ADJUST':
-                    stock.quantity = serializer.validated_data['quantity']
-                
-                stock.save()
-                
-                return Response({
-                    'message': 'Stock adjusted successfully',
-                    'movement': StockMovementSerializer(movement).data,
-                    'new_stock': float(stock.quantity)
-                }, status=status.HTTP_200_OK)
+            data = serializer.validated_data
+            movements, levels = apply_stock_adjustments([{
+                'item_id': item.id,
+                'quantity': data['quantity'],
+                'movement_type': data['movement_type'],
+                'reference': data.get('reference', ''),
+                'remarks': data.get('remarks', '')
+            }])
+            
+            return Response({
+                'message': 'Stock adjusted successfully',
+                'movement': StockMovementSerializer(movements[0]).data,
+                'new_stock': float(levels[item.id])
+            }, status=status.HTTP_200_OK)
+        
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['post'], url_path='bulk-adjust-stock')
+    def bulk_adjust_stock(self, request):
+        """Apply many stock adjustments in one transaction"""
+        serializer = BulkStockAdjustmentSerializer(data=request.data)
+        
+        if serializer.is_valid():
+            adjustments = [
+                {
+                    'item_id': line['item'],
+                    'quantity': line['quantity'],
+                    'movement_type': line['movement_type'],
+                    'reference': line.get('reference', ''),
+                    'remarks': line.get('remarks', '')
+                }
+                for line in serializer.validated_data['adjustments']
+            ]
+            movements, levels = apply_stock_adjustments(adjustments, location=serializer.validated_data['location'])
+            
+            return Response({
+                'message': f'{len(movements)} stock adjustments applied successfully',
+                'new_stock': {item_id: float(quantity) for item_id, quantity in levels.items()}
+            }, status=status.HTTP_200_OK)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -150,13 +192,24 @@ class StockViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class StockMovementViewSet(viewsets.ModelViewSet):
+class StockMovementViewSet(ExportMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing stock movements
     """
     queryset = StockMovement.objects.select_related('item').all()
     serializer_class = StockMovementSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = DateCursorPagination
+    export_name = 'stock-movements'
+    export_columns = (
+        ('Date', 'date'),
+        ('Item', 'item__name'),
+        ('SKU', 'item__sku'),
+        ('Type', 'movement_type'),
+        ('Quantity', 'quantity'),
+        ('Reference', 'reference'),
+        ('Remarks', 'remarks'),
+    )
     
     def get_queryset(self):
         """Filter movements by various parameters"""
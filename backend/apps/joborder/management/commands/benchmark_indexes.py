@@ -0,0 +1,147 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from apps.crm.models import Customer
+from apps.inventory.models import Item, StockMovement
+from apps.joborder.models import JobOrder
+from apps.receipt.models import Receipt
+from apps.sale.models import Sale
+
+
+INDEXED_MODELS = [Customer, JobOrder, Receipt, Sale, StockMovement]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and print the query plans and timings of the "
+        "hot filter paths with and without the composite indexes. Never touches the "
+        "configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Number of job orders to seed')
+        parser.add_argument('--batch-size', type=int, default=10_000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.seed(options['rows'], options['batch_size'])
+            self.report('WITH INDEXES')
+            self.drop_indexes()
+            self.report('WITHOUT INDEXES')
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def bulk_insert(self, model, rows, batch_size):
+        for start in range(0, len(rows), batch_size):
+            model.objects.bulk_create(rows[start:start + batch_size], batch_size=batch_size)
+
+    def seed(self, rows, batch_size):
+        rng = random.Random(42)
+        now = timezone.now()
+        started = time.perf_counter()
+
+        customer_count = max(rows // 100, 1)
+        self.bulk_insert(Customer, [
+            Customer(customer_id=str(index), name=f'Customer {index}', phone=f'05{index:08d}', balance=0)
+            for index in range(1, customer_count + 1)
+        ], batch_size)
+        customer_ids = list(Customer.objects.values_list('id', flat=True))
+
+        self.bulk_insert(Item, [Item(name=f'Item {index}', sku=f'{index:05d}') for index in range(1, 501)], batch_size)
+        item_ids = list(Item.objects.values_list('id', flat=True))
+
+        statuses = ['pending', 'in_progress', 'completed', 'delivered']
+        methods = ['cash', 'card', 'cash_card']
+        for start in range(0, rows, batch_size):
+            JobOrder.objects.bulk_create([
+                JobOrder(
+                    job_order_number=f'JO-{index:07d}',
+                    customer_id=rng.choice(customer_ids),
+                    status=rng.choice(statuses),
+                    payment_method=rng.choice(methods),
+                    delivery_date=now - timedelta(days=rng.randint(0, 1825)),
+                    total_amount=Decimal('100.00'),
+                    advance_amount=Decimal('40.00'),
+                    balance_amount=Decimal('60.00'),
+                    is_active=rng.random() > 0.05,
+                )
+                for index in range(start, min(start + batch_size, rows))
+            ], batch_size=batch_size)
+        job_order_ids = list(JobOrder.objects.values_list('id', flat=True))
+
+        secondary_rows = rows // 2
+        for start in range(0, secondary_rows, batch_size):
+            end = min(start + batch_size, secondary_rows)
+            Receipt.objects.bulk_create([
+                Receipt(
+                    receipt_id=f'RCP{index:07d}',
+                    receipt_date=now - timedelta(days=rng.randint(0, 1825)),
+                    receipt_amount=Decimal('20.00'),
+                    job_order_id=rng.choice(job_order_ids),
+                )
+                for index in range(start, end)
+            ], batch_size=batch_size)
+            Sale.objects.bulk_create([
+                Sale(
+                    sale_number=f'SALE-{index:07d}',
+                    customer_name='Walk-in',
+                    amount=Decimal('50.00'),
+                    total_amount=Decimal('50.00'),
+                    date=now - timedelta(days=rng.randint(0, 1825)),
+                    payment_method='cash',
+                )
+                for index in range(start, end)
+            ], batch_size=batch_size)
+            StockMovement.objects.bulk_create([
+                StockMovement(item_id=rng.choice(item_ids), quantity=Decimal('1.00'), movement_type='IN')
+                for _ in range(start, end)
+            ], batch_size=batch_size)
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        self.stdout.write(f"Seeded {rows} job orders and {secondary_rows} receipts/sales/movements "
+                          f"in {time.perf_counter() - started:.1f}s")
+
+    def drop_indexes(self):
+        with connection.schema_editor() as editor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    editor.remove_index(model, index)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def hot_queries(self):
+        today = timezone.now()
+        last_week = today - timedelta(days=7)
+        job_order_id = JobOrder.objects.order_by('id').values_list('id', flat=True).first()
+        item_id = Item.objects.order_by('id').values_list('id', flat=True).first()
+        customer_id = Customer.objects.order_by('id').values_list('id', flat=True).first()
+        return [
+            ('Job order list', JobOrder.objects.filter(is_active=True).order_by('-created_at')[:50]),
+            ('Job orders by status', JobOrder.objects.filter(is_active=True, status='pending').order_by('-created_at')[:50]),
+            ('Deliveries this week', JobOrder.objects.filter(is_active=True, delivery_date__gte=last_week, delivery_date__lt=today)),
+            ('Customer orders', JobOrder.objects.filter(customer_id=customer_id, is_active=True)),
+            ('Receipts of a job order', Receipt.objects.filter(job_order_id=job_order_id, is_active=True)),
+            ('Receipts this week', Receipt.objects.filter(receipt_date__gte=last_week, receipt_date__lt=today)),
+            ('Sales this week', Sale.objects.filter(date__gte=last_week, date__lt=today)),
+            ('Item stock history', StockMovement.objects.filter(item_id=item_id).order_by('-date')[:50]),
+            ('Customer list', Customer.objects.order_by('-created_at')[:50]),
+        ]
+
+    def report(self, title):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n=== {title} ==='))
+        for label, queryset in self.hot_queries():
+            plan = queryset.explain()
+            started = time.perf_counter()
+            list(queryset)
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stdout.write(self.style.SUCCESS(f'\n{label}: {elapsed:.2f} ms'))
+            self.stdout.write(plan)
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0002_hot_path_indexes'),
+        ('joborder', '0007_joborder_is_blocked'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joborder',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='joborder_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joborder',
+            index=models.Index(fields=['is_active', 'status', '-created_at'], name='joborder_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joborder',
+            index=models.Index(fields=['is_active', 'delivery_date'], name='joborder_delivery_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joborder',
+            index=models.Index(fields=['customer', 'is_active'], name='joborder_customer_active_idx'),
+        ),
+    ]
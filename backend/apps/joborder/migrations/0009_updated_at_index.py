@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0004_customer_updated_index'),
+        ('joborder', '0008_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joborder',
+            index=models.Index(fields=['updated_at'], name='joborder_updated_idx'),
+        ),
+    ]
@@ -28,6 +28,20 @@ class JobOrder(models.Model):
      is_blocked = models.BooleanField(default=False)
      remarks = models.TextField(null=True, blank=True)
 
+     class Meta:
+        indexes = [
+            # Default listing: active orders, newest first
+            models.Index(fields=['-created_at'], condition=models.Q(is_active=True), name='joborder_active_created_idx'),
+            # Status tabs and stats filters
+            models.Index(fields=['is_active', 'status', '-created_at'], name='joborder_status_created_idx'),
+            # Deliveries screen date range
+            models.Index(fields=['is_active', 'delivery_date'], name='joborder_delivery_date_idx'),
+            # Per-customer order totals and history
+            models.Index(fields=['customer', 'is_active'], name='joborder_customer_active_idx'),
+            # Delta sync
+            models.Index(fields=['updated_at'], name='joborder_updated_idx'),
+        ]
+
      def __str__(self):
         return self.job_order_number
 
@@ -1,7 +1,9 @@
+from django.utils import timezone
 from rest_framework import serializers
 from .models import JobOrder, jobOrderItem, jobOrderMeasurement
 from apps.crm.models import Customer
 from apps.materials.models import Material
+from apps.master.sequences import next_number
 
 
 class CustomerSerializer(serializers.ModelSerializer):
@@ -13,22 +15,25 @@ class CustomerSerializer(serializers.ModelSerializer):
 class JobOrderItemSerializer(serializers.ModelSerializer):
     material_name = serializers.CharField(source='material.name', read_only=True)
     material_price = serializers.DecimalField(source='material.price', max_digits=10, decimal_places=2, read_only=True)
-    material = serializers.PrimaryKeyRelatedField(queryset=Material.objects.all())
+    # Materials of nested lines are resolved in bulk by resolve_materials(), not per line
+    material = serializers.IntegerField(source='material_id')
+    # Writable so that updates can match lines to existing rows
+    id = serializers.IntegerField(required=False)
     
     class Meta:
         model = jobOrderItem
         fields = ['id', 'material', 'material_name', 'material_price', 'quantity', 'fees', 'total_amount', 'is_active']
-        read_only_fields = ['id', 'total_amount']
+        read_only_fields = ['total_amount']
 
 
 class JobOrderMeasurementSerializer(serializers.ModelSerializer):
     material_name = serializers.CharField(source='material.name', read_only=True)
-    material = serializers.PrimaryKeyRelatedField(queryset=Material.objects.all())
+    material = serializers.IntegerField(source='material_id')
+    id = serializers.IntegerField(required=False)
     
     class Meta:
         model = jobOrderMeasurement
         fields = ['id', 'material', 'material_name', 'thool', 'kethet', 'thool_kum', 'ardh_f_kum', 'jamba', 'ragab', 'note1', 'note2', 'note3', 'note4', 'is_active']
-        read_only_fields = ['id']
 
 
 class JobOrderMeasurementReadSerializer(serializers.ModelSerializer):
@@ -40,6 +45,75 @@ class JobOrderMeasurementReadSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+def resolve_materials(*line_groups):
+    """Fetch every material referenced by the given item/measurement lines in one query"""
+    # Read from the database, not the material cache: the lines and the response embed
+    # the material's current name and price, which another worker's cache may not have yet
+    material_ids = {line['material_id'] for lines in line_groups for line in lines}
+    materials = Material.objects.in_bulk(material_ids)
+    missing = sorted(material_ids - materials.keys())
+    if missing:
+        raise serializers.ValidationError(f"Material with ID {missing[0]} does not exist")
+    return materials
+
+
+def item_attributes(item_data, materials):
+    """Model attributes for a job order item line"""
+    quantity = item_data['quantity']
+    fees = item_data['fees']
+    return {
+        'material': materials[item_data['material_id']],
+        'quantity': quantity,
+        'fees': fees,
+        'total_amount': quantity * fees,
+    }
+
+
+def measurement_attributes(measurement_data, materials):
+    """Model attributes for a job order measurement line"""
+    attributes = {key: value for key, value in measurement_data.items() if key not in ('id', 'material_id')}
+    attributes['material'] = materials[measurement_data['material_id']]
+    return attributes
+
+
+def create_lines(job_order, model, lines_data, build_attributes, materials):
+    """Insert all lines of one kind with a single bulk_create"""
+    model.objects.bulk_create([
+        model(job_order=job_order, **build_attributes(line_data, materials))
+        for line_data in lines_data
+    ])
+
+
+def sync_lines(job_order, model, lines_data, build_attributes, materials):
+    """
+    Diff submitted lines against the stored ones by id: matching lines are
+    updated, lines without a known id are inserted and the rest are deleted,
+    each in one statement.
+    """
+    existing = {line.id: line for line in model.objects.filter(job_order=job_order)}
+    now = timezone.now()
+    to_create, to_update, update_fields = [], [], {'updated_at'}
+    
+    for line_data in lines_data:
+        attributes = build_attributes(line_data, materials)
+        line = existing.pop(line_data.get('id'), None)
+        if line is None:
+            to_create.append(model(job_order=job_order, **attributes))
+            continue
+        for attr, value in attributes.items():
+            setattr(line, attr, value)
+        line.updated_at = now
+        update_fields.update(attributes)
+        to_update.append(line)
+    
+    if existing:
+        model.objects.filter(id__in=existing).delete()
+    if to_update:
+        model.objects.bulk_update(to_update, sorted(update_fields))
+    if to_create:
+        model.objects.bulk_create(to_create)
+
+
 class JobOrderCreateSerializer(serializers.ModelSerializer):
     customer_data = CustomerSerializer(required=False)
     customer_id = serializers.IntegerField(required=False, allow_null=True)
@@ -82,11 +156,10 @@ class JobOrderCreateSerializer(serializers.ModelSerializer):
         # Set customer and generate job order number
         validated_data['customer'] = customer
         if not validated_data.get('job_order_number'):
-            validated_data['job_order_number'] = f"JO-{JobOrder.objects.count() + 1:04d}"
+            validated_data['job_order_number'] = next_number('job_order')
         
         # Set default delivery date if not provided
         if not validated_data.get('delivery_date'):
-            from django.utils import timezone
             validated_data['delivery_date'] = timezone.now() + timezone.timedelta(days=7)  # Default to 7 days from now
         
         # Calculate balance amount
@@ -117,75 +190,10 @@ class JobOrderCreateSerializer(serializers.ModelSerializer):
         # Create job order
         job_order = JobOrder.objects.create(**validated_data)
         
-        # Create job order items
-        for item_data in job_order_items_data:
-            # Handle material field - it could be an ID or a Material object
-            material_field = item_data.get('material')
-            if material_field is None:
-                raise serializers.ValidationError("Material field is required for job order items")
-            
-            if isinstance(material_field, Material):
-                material_id = material_field.id
-            else:
-                material_id = material_field
-            
-            # Ensure material_id is a valid integer
-            try:
-                material_id = int(material_id)
-            except (ValueError, TypeError):
-                raise serializers.ValidationError(f"Invalid material ID: {material_id}. Expected an integer, got {type(material_id).__name__}")
-            
-            quantity = item_data['quantity']
-            fees = item_data['fees']
-            total_amount = quantity * fees
-            
-            # Get the Material object
-            try:
-                material = Material.objects.get(id=material_id)
-            except Material.DoesNotExist:
-                raise serializers.ValidationError(f"Material with ID {material_id} does not exist")
-            
-            jobOrderItem.objects.create(
-                job_order=job_order,
-                material=material,
-                quantity=quantity,
-                fees=fees,
-                total_amount=total_amount
-            )
-        
-        # Create job order measurements
-        for measurement_data in job_order_measurements_data:
-            # Handle material field - it could be an ID or a Material object
-            material_field = measurement_data.get('material')
-            if material_field is None:
-                raise serializers.ValidationError("Material field is required for measurements")
-            
-            if isinstance(material_field, Material):
-                material_id = material_field.id
-            else:
-                material_id = material_field
-            
-            # Ensure material_id is a valid integer
-            try:
-                material_id = int(material_id)
-            except (ValueError, TypeError):
-                raise serializers.ValidationError(f"Invalid material ID: {material_id}. Expected an integer, got {type(material_id).__name__}")
-            
-            # Get the Material object
-            try:
-                material = Material.objects.get(id=material_id)
-            except Material.DoesNotExist:
-                raise serializers.ValidationError(f"Material with ID {material_id} does not exist")
-            
-            # Remove material from measurement_data and add the Material object
-            measurement_data_copy = measurement_data.copy()
-            measurement_data_copy.pop('material', None)
-            
-            jobOrderMeasurement.objects.create(
-                job_order=job_order,
-                material=material,
-                **measurement_data_copy
-            )
+        # Create job order items and measurements in bulk
+        materials = resolve_materials(job_order_items_data, job_order_measurements_data)
+        create_lines(job_order, jobOrderItem, job_order_items_data, item_attributes, materials)
+        create_lines(job_order, jobOrderMeasurement, job_order_measurements_data, measurement_attributes, materials)
         
         return job_order
 
@@ -243,90 +251,12 @@ class JobOrderUpdateSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
         
-        # Update job order items if provided
+        # Sync job order items and measurements if provided
+        materials = resolve_materials(job_order_items_data or [], job_order_measurements_data or [])
         if job_order_items_data is not None:
-            # Delete existing items
-            instance.joborderitem_set.all().delete()
-            
-            # Create new items
-            for item_data in job_order_items_data:
-                # Handle material field - it could be an ID or a Material object
-                material_field = item_data.get('material')
-                if material_field is None:
-                    raise serializers.ValidationError("Material field is required for job order items")
-                
-                if isinstance(material_field, Material):
-                    material_id = material_field.id
-                else:
-                    material_id = material_field
-                
-                # Ensure material_id is a valid integer
-                try:
-                    material_id = int(material_id)
-                except (ValueError, TypeError):
-                    raise serializers.ValidationError(f"Invalid material ID: {material_id}. Expected an integer, got {type(material_id).__name__}")
-                
-                quantity = item_data['quantity']
-                fees = item_data['fees']
-                total_amount = quantity * fees
-                
-                # Get the Material object
-                try:
-                    material = Material.objects.get(id=material_id)
-                except Material.DoesNotExist:
-                    raise serializers.ValidationError(f"Material with ID {material_id} does not exist")
-                
-                jobOrderItem.objects.create(
-                    job_order=instance,
-                    material=material,
-                    quantity=quantity,
-                    fees=fees,
-                    total_amount=total_amount
-                )
-        
-        # Update job order measurements if provided
+            sync_lines(instance, jobOrderItem, job_order_items_data, item_attributes, materials)
         if job_order_measurements_data is not None:
-            # Delete existing measurements
-            instance.jobordermeasurement_set.all().delete()
-            
-            # Create new measurements
-            for measurement_data in job_order_measurements_data:
-                print("=== MEASUREMENT DATA DEBUG ===")
-                print("Measurement data:", measurement_data)
-                print("Material field:", measurement_data.get('material'))
-                print("Material type:", type(measurement_data.get('material')))
-                
-                # Handle material field - it could be an ID or a Material object
-                material_field = measurement_data.get('material')
-                if material_field is None:
-                    raise serializers.ValidationError("Material field is required for measurements")
-                
-                if isinstance(material_field, Material):
-                    material_id = material_field.id
-                else:
-                    material_id = material_field
-                
-                # Ensure material_id is a valid integer
-                try:
-                    material_id = int(material_id)
-                except (ValueError, TypeError):
-                    raise serializers.ValidationError(f"Invalid material ID: {material_id}. Expected an integer, got {type(material_id).__name__}")
-                
-                # Get the Material object
-                try:
-                    material = Material.objects.get(id=material_id)
-                except Material.DoesNotExist:
-                    raise serializers.ValidationError(f"Material with ID {material_id} does not exist")
-                
-                # Remove material from measurement_data and add the Material object
-                measurement_data_copy = measurement_data.copy()
-                measurement_data_copy.pop('material', None)
-                
-                jobOrderMeasurement.objects.create(
-                    job_order=instance,
-                    material=material,
-                    **measurement_data_copy
-                )
+            sync_lines(instance, jobOrderMeasurement, job_order_measurements_data, measurement_attributes, materials)
         
         return instance
 
@@ -339,11 +269,17 @@ class JobOrderListSerializer(serializers.ModelSerializer):
     job_order_measurements = serializers.SerializerMethodField()
     
     def get_job_order_measurements(self, obj):
-        measurements = obj.jobordermeasurement_set.filter(is_active=True)
+        # Use the prefetched cache from the viewset queryset when available
+        measurements = getattr(obj, 'active_measurements', None)
+        if measurements is None:
+            measurements = obj.jobordermeasurement_set.filter(is_active=True).select_related('material')
         return JobOrderMeasurementReadSerializer(measurements, many=True).data
     
     def get_job_order_items(self, obj):
-        items = obj.joborderitem_set.filter(is_active=True)
+        # Use the prefetched cache from the viewset queryset when available
+        items = getattr(obj, 'active_items', None)
+        if items is None:
+            items = obj.joborderitem_set.filter(is_active=True).select_related('material')
         return JobOrderItemSerializer(items, many=True).data
     
     class Meta:
@@ -3,6 +3,8 @@ from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from apps.crm.models import Customer
 from apps.materials.models import Material
 from .models import JobOrder, jobOrderItem, jobOrderMeasurement
@@ -205,4 +207,333 @@ class JobOrderAPITestCase(APITestCase):
         self.assertEqual(stats['pending'], 1)
         self.assertEqual(stats['completed'], 1)
         self.assertEqual(stats['total_revenue'], 300.00)
-        self.assertEqual(stats['total_balance'], 150.00)
\ No newline at end of file
+        self.assertEqual(stats['total_balance'], 150.00)
+
+    def test_deliveries_query_count_is_constant(self):
+        """Test deliveries listing does not issue per-order queries"""
+        def create_order(number):
+            job_order = JobOrder.objects.create(
+                job_order_number=number,
+                customer=self.customer,
+                status='pending',
+                delivery_date='2024-01-15T10:00:00Z',
+                total_amount=100.00,
+                advance_amount=50.00,
+                balance_amount=50.00
+            )
+            jobOrderItem.objects.create(
+                job_order=job_order,
+                material=self.material,
+                quantity=1,
+                fees=100.00,
+                total_amount=100.00
+            )
+            jobOrderMeasurement.objects.create(
+                job_order=job_order,
+                material=self.material,
+                thool=145.00,
+                kethet=43.00,
+                thool_kum=61.00,
+                ardh_f_kum=17.00,
+                jamba=9.00,
+                ragab=12.00
+            )
+
+        url = reverse('joborder-deliveries')
+        create_order('JO-0001')
+        with CaptureQueriesContext(connection) as single:
+            self.client.get(url)
+
+        for number in range(2, 11):
+            create_order(f'JO-{number:04d}')
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(many), len(single))
+        self.assertEqual(response.data['results'][0]['job_order_items'][0]['material_name'], 'Test Material')
+
+    def test_get_job_order_stats_grouped(self):
+        """Test job order statistics with breakdowns"""
+        for number, (order_status, method) in enumerate([('pending', 'cash'), ('pending', 'card'), ('delivered', 'cash')], start=1):
+            JobOrder.objects.create(
+                job_order_number=f'JO-{number:04d}',
+                customer=self.customer,
+                status=order_status,
+                payment_method=method,
+                delivery_date='2024-01-15T10:00:00Z',
+                total_amount=100.00,
+                advance_amount=40.00,
+                balance_amount=60.00
+            )
+        
+        url = reverse('joborder-stats')
+        response = self.client.get(url, {'group_by': 'status,payment_method,day'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        stats = response.data
+        self.assertEqual(stats['total_orders'], 3)
+        self.assertEqual(stats['total_revenue'], 300.00)
+        by_status = {row['group']: row for row in stats['breakdowns']['status']}
+        self.assertEqual(by_status['pending']['total_orders'], 2)
+        self.assertEqual(by_status['delivered']['total_balance'], 60.00)
+        by_method = {row['group']: row for row in stats['breakdowns']['payment_method']}
+        self.assertEqual(by_method['cash']['total_orders'], 2)
+        self.assertEqual(len(stats['breakdowns']['day']), 1)
+        
+        response = self.client.get(url, {'group_by': 'customer'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_job_orders_is_cursor_paginated(self):
+        """Test job order listing pages with a cursor and caps page size"""
+        for number in range(1, 6):
+            JobOrder.objects.create(
+                job_order_number=f'JO-{number:04d}',
+                customer=self.customer,
+                status='pending',
+                delivery_date='2024-01-15T10:00:00Z',
+                total_amount=100.00,
+                advance_amount=50.00,
+                balance_amount=50.00
+            )
+        
+        url = reverse('joborder-list')
+        response = self.client.get(url, {'page_size': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = [order['job_order_number'] for order in response.data['results']]
+        self.assertEqual(first_page, ['JO-0005', 'JO-0004', 'JO-0003'])
+        self.assertIsNotNone(response.data['next'])
+        
+        response = self.client.get(response.data['next'])
+        second_page = [order['job_order_number'] for order in response.data['results']]
+        self.assertEqual(second_page, ['JO-0002', 'JO-0001'])
+        self.assertIsNone(response.data['next'])
+
+    def test_recent_job_orders_limit(self):
+        """Test recent rejects a non-integer limit and clamps it to 1..max page size"""
+        for number in range(1, 4):
+            JobOrder.objects.create(
+                job_order_number=f'JO-{number:04d}',
+                customer=self.customer,
+                delivery_date='2024-01-15T10:00:00Z',
+                total_amount=100.00,
+                advance_amount=50.00,
+                balance_amount=50.00
+            )
+        
+        url = reverse('joborder-recent')
+        response = self.client.get(url, {'limit': 'ten'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'limit': -5})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([order['job_order_number'] for order in response.data], ['JO-0003'])
+        response = self.client.get(url, {'limit': 2})
+        self.assertEqual(len(response.data), 2)
+    
+    def test_create_job_order_lines_in_fixed_queries(self):
+        """Test creating job order lines costs the same number of queries regardless of line count"""
+        url = reverse('joborder-list')
+        
+        def payload(lines):
+            return {
+                'customer_id': self.customer.id,
+                'status': 'pending',
+                'delivery_date': '2024-01-15T10:00:00Z',
+                'total_amount': 100.00 * lines,
+                'advance_amount': 0,
+                'job_order_items': [
+                    {'material': self.material.id, 'quantity': 1, 'fees': 100.00}
+                    for _ in range(lines)
+                ],
+                'job_order_measurements': [
+                    {'material': self.material.id, 'thool': 145.00, 'kethet': 43.00, 'thool_kum': 61.00,
+                     'ardh_f_kum': 17.00, 'jamba': 9.00, 'ragab': 12.00}
+                    for _ in range(lines)
+                ]
+            }
+        
+        # Warm up the job order number sequence so both requests take the same path
+        self.client.post(url, payload(1), format='json')
+        
+        with CaptureQueriesContext(connection) as single:
+            response = self.client.post(url, payload(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.post(url, payload(10), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(many), len(single))
+        self.assertEqual(len(response.data['job_order_items']), 10)
+    
+    def test_create_job_order_with_unknown_material(self):
+        """Test creating a job order with a missing material is rejected"""
+        url = reverse('joborder-list')
+        data = {
+            'customer_id': self.customer.id,
+            'status': 'pending',
+            'total_amount': 100.00,
+            'advance_amount': 0,
+            'job_order_items': [{'material': 9999, 'quantity': 1, 'fees': 100.00}]
+        }
+        
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(JobOrder.objects.exists())
+    
+    def test_update_job_order_diffs_lines_by_id(self):
+        """Test updating job order lines keeps, updates, adds and removes lines by id"""
+        job_order = JobOrder.objects.create(
+            job_order_number='JO-0001',
+            customer=self.customer,
+            status='pending',
+            delivery_date='2024-01-15T10:00:00Z',
+            total_amount=300.00,
+            advance_amount=0,
+            balance_amount=300.00
+        )
+        kept = jobOrderItem.objects.create(job_order=job_order, material=self.material, quantity=1, fees=100, total_amount=100)
+        removed = jobOrderItem.objects.create(job_order=job_order, material=self.material, quantity=2, fees=100, total_amount=200)
+        
+        url = reverse('joborder-detail', kwargs={'pk': job_order.id})
+        data = {
+            'job_order_items': [
+                {'id': kept.id, 'material': self.material.id, 'quantity': 3, 'fees': 50.00},
+                {'material': self.material.id, 'quantity': 1, 'fees': 20.00}
+            ]
+        }
+        
+        response = self.client.patch(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        items = {item.id: item for item in job_order.joborderitem_set.all()}
+        self.assertEqual(len(items), 2)
+        self.assertNotIn(removed.id, items)
+        self.assertEqual(items[kept.id].quantity, 3)
+        self.assertEqual(items[kept.id].total_amount, 150.00)
+        self.assertEqual(
+            sorted(item['total_amount'] for item in response.data['job_order_items']),
+            ['150.00', '20.00']
+        )
+    
+    def test_filter_job_orders_by_created_date_range(self):
+        """Test from_date/to_date include whole days without casting created_at"""
+        from datetime import datetime, timezone as dt_timezone
+        created = {
+            'JO-0001': datetime(2024, 1, 9, 23, 59, tzinfo=dt_timezone.utc),
+            'JO-0002': datetime(2024, 1, 10, 0, 0, tzinfo=dt_timezone.utc),
+            'JO-0003': datetime(2024, 1, 11, 23, 59, 59, tzinfo=dt_timezone.utc),
+            'JO-0004': datetime(2024, 1, 12, 0, 0, tzinfo=dt_timezone.utc),
+        }
+        for number, created_at in created.items():
+            job_order = JobOrder.objects.create(
+                job_order_number=number,
+                customer=self.customer,
+                status='pending',
+                delivery_date='2024-01-15T10:00:00Z',
+                total_amount=100.00,
+                advance_amount=0,
+                balance_amount=100.00
+            )
+            JobOrder.objects.filter(pk=job_order.pk).update(created_at=created_at)
+        
+        url = reverse('joborder-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'from_date': '2024-01-10', 'to_date': '2024-01-11'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        numbers = sorted(order['job_order_number'] for order in response.data['results'])
+        self.assertEqual(numbers, ['JO-0002', 'JO-0003'])
+        self.assertFalse(any('django_datetime_cast_date' in query['sql'] for query in queries.captured_queries))
+        
+        # Invalid bounds are ignored as before
+        response = self.client.get(url, {'from_date': 'not-a-date'})
+        self.assertEqual(len(response.data['results']), 4)
+    
+    def test_deliveries_conditional_get(self):
+        """Test polling deliveries with If-None-Match answers 304 until an order or customer changes"""
+        job_order = JobOrder.objects.create(
+            job_order_number='JO-0001',
+            customer=self.customer,
+            status='pending',
+            delivery_date='2024-01-15T10:00:00Z',
+            total_amount=100.00,
+            advance_amount=0,
+            balance_amount=100.00
+        )
+        url = reverse('joborder-deliveries')
+        response = self.client.get(url, {'status': 'pending'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'status': 'pending'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 1)
+        
+        # Another page or filter has its own validator
+        response = self.client.get(url, {'status': 'all'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.customer.name = 'Jane Doe'
+        self.customer.save()
+        response = self.client.get(url, {'status': 'pending'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['customer_name'], 'Jane Doe')
+        
+        etag = response['ETag']
+        job_order.is_active = False
+        job_order.save()
+        response = self.client.get(url, {'status': 'pending'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+        
+        response = self.client.get(reverse('joborder-recent'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(reverse('joborder-recent'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_conditional_get_sees_material_changes(self):
+        """Test renaming a material embedded in an active item invalidates the list's ETag"""
+        job_order = JobOrder.objects.create(
+            job_order_number='JO-0001',
+            customer=self.customer,
+            status='pending',
+            delivery_date='2024-01-15T10:00:00Z',
+            total_amount=100.00,
+            advance_amount=0,
+            balance_amount=100.00
+        )
+        jobOrderItem.objects.create(
+            job_order=job_order, material=self.material, quantity=1, fees=100.00, total_amount=100.00
+        )
+        url = reverse('joborder-recent')
+        etag = self.client.get(url)['ETag']
+        
+        self.material.name = 'Renamed Material'
+        self.material.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['job_order_items'][0]['material_name'], 'Renamed Material')
+    
+    def test_export_streams_filtered_orders_as_csv(self):
+        """Test the CSV export streams the rows matching the list filters"""
+        for number, order_status in [('JO-0001', 'pending'), ('JO-0002', 'delivered')]:
+            JobOrder.objects.create(
+                job_order_number=number,
+                customer=self.customer,
+                status=order_status,
+                delivery_date='2024-01-15T10:00:00Z',
+                total_amount=100.00,
+                advance_amount=40.00,
+                balance_amount=60.00
+            )
+        
+        response = self.client.get(reverse('joborder-export'), {'status': 'pending'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['Job Order', 'Customer ID', 'Customer'])
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('JO-0001,CUST001,John Doe'))
+        
+        response = self.client.get(reverse('joborder-export'), {'file_format': 'pdf'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,8 +1,11 @@
+from decimal import Decimal
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db import transaction, models
+from django.db import transaction
+from django.db.models import Count, F, Max, Prefetch, Q, Sum
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from .models import JobOrder, jobOrderItem, jobOrderMeasurement
 from .serializers import (
@@ -15,11 +18,112 @@ from .serializers import (
 )
 from apps.crm.models import Customer
 from apps.materials.models import Material
+from apps.rollups.models import DailyRollup
+from apps.search.query import search_queryset
+from core.filters import filter_date_range, filter_day_range
+from core.conditional import ConditionalGetMixin
+from core.export import ExportMixin
+from core.pagination import CreatedAtCursorPagination, PaginatedActionMixin
 
 
-class JobOrderViewSet(viewsets.ModelViewSet):
+def with_order_details(queryset):
+    """Attach customer and active items/measurements (with materials) to a job order queryset"""
+    return queryset.select_related('customer').prefetch_related(
+        Prefetch(
+            'joborderitem_set',
+            queryset=jobOrderItem.objects.filter(is_active=True).select_related('material'),
+            to_attr='active_items'
+        ),
+        Prefetch(
+            'jobordermeasurement_set',
+            queryset=jobOrderMeasurement.objects.filter(is_active=True).select_related('material'),
+            to_attr='active_measurements'
+        ),
+    )
+
+
+# Expressions that the stats endpoint can group its aggregates by
+STATS_GROUPINGS = {
+    'day': TruncDate('created_at'),
+    'payment_method': F('payment_method'),
+    'status': F('status'),
+}
+
+
+def stats_aggregates():
+    """Conditional aggregates computing all job order counts and totals in one query"""
+    return {
+        'total_orders': Count('id'),
+        'pending': Count('id', filter=Q(status='pending')),
+        'in_progress': Count('id', filter=Q(status='in_progress')),
+        'completed': Count('id', filter=Q(status='completed')),
+        'delivered': Count('id', filter=Q(status='delivered')),
+        'total_revenue': Sum('total_amount', default=Decimal('0')),
+        'total_balance': Sum('balance_amount', default=Decimal('0')),
+    }
+
+
+# The same groupings and aggregates over the daily rollups, whose rows hold counts
+ROLLUP_STATS_GROUPINGS = {
+    'day': F('date'),
+    'payment_method': F('payment_method'),
+    'status': F('status'),
+}
+
+
+def rollup_stats_aggregates():
+    """stats_aggregates() computed from DailyRollup rows"""
+    return {
+        'total_orders': Sum('count', default=0),
+        'pending': Sum('count', filter=Q(status='pending'), default=0),
+        'in_progress': Sum('count', filter=Q(status='in_progress'), default=0),
+        'completed': Sum('count', filter=Q(status='completed'), default=0),
+        'delivered': Sum('count', filter=Q(status='delivered'), default=0),
+        'total_revenue': Sum('total_amount', default=Decimal('0')),
+        'total_balance': Sum('balance_amount', default=Decimal('0')),
+    }
+
+
+def job_order_rollups(params):
+    """Daily job order rollups matching the status, payment_method and date filters of get_queryset"""
+    queryset = DailyRollup.objects.filter(kind='job_order')
+    if params.get('status'):
+        queryset = queryset.filter(status=params['status'])
+    if params.get('payment_method'):
+        queryset = queryset.filter(payment_method=params['payment_method'])
+    return filter_day_range(queryset, 'date', params.get('from_date'), params.get('to_date'))
+
+
+class JobOrderViewSet(ConditionalGetMixin, ExportMixin, PaginatedActionMixin, viewsets.ModelViewSet):
     queryset = JobOrder.objects.filter(is_active=True).order_by('-created_at')
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
+    # Listed orders embed their customer's name and phone, and the material
+    # names and prices of their active items and measurements
+    conditional_fields = (
+        'updated_at',
+        'customer__updated_at',
+        Max('joborderitem__material__updated_at', filter=Q(joborderitem__is_active=True)),
+        Max('jobordermeasurement__material__updated_at', filter=Q(jobordermeasurement__is_active=True)),
+    )
+    export_name = 'job-orders'
+    export_columns = (
+        ('Job Order', 'job_order_number'),
+        ('Customer ID', 'customer__customer_id'),
+        ('Customer', 'customer__name'),
+        ('Phone', 'customer__phone'),
+        ('Status', 'status'),
+        ('Payment Method', 'payment_method'),
+        ('Created', 'created_at'),
+        ('Delivery Date', 'delivery_date'),
+        ('Total', 'total_amount'),
+        ('Advance', 'advance_amount'),
+        ('Received On Delivery', 'recived_on_delivery_amount'),
+        ('Balance', 'balance_amount'),
+        ('Cash', 'cash_amount'),
+        ('Card', 'card_amount'),
+        ('Remarks', 'remarks'),
+    )
     
     # Explicitly define allowed methods
     http_method_names = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace']
@@ -34,7 +138,7 @@ class JobOrderViewSet(viewsets.ModelViewSet):
             return JobOrderListSerializer
     
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = with_order_details(super().get_queryset())
         
         # Filter by status if provided
         status_filter = self.request.query_params.get('status')
@@ -55,31 +159,12 @@ class JobOrderViewSet(viewsets.ModelViewSet):
         from_date = self.request.query_params.get('from_date')
         to_date = self.request.query_params.get('to_date')
         
-        if from_date:
-            try:
-                from datetime import datetime
-                from_date_obj = datetime.strptime(from_date, '%Y-%m-%d').date()
-                queryset = queryset.filter(created_at__date__gte=from_date_obj)
-            except ValueError:
-                pass  # Invalid date format, ignore the filter
-        
-        if to_date:
-            try:
-                from datetime import datetime
-                to_date_obj = datetime.strptime(to_date, '%Y-%m-%d').date()
-                queryset = queryset.filter(created_at__date__lte=to_date_obj)
-            except ValueError:
-                pass  # Invalid date format, ignore the filter
+        queryset = filter_date_range(queryset, 'created_at', from_date, to_date)
         
         # Search by job order number, customer name, customer phone, or customer ID
         search = self.request.query_params.get('search')
         if search:
-            queryset = queryset.filter(
-                models.Q(job_order_number__icontains=search) |
-                models.Q(customer__name__icontains=search) |
-                models.Q(customer__phone__icontains=search) |
-                models.Q(customer__customer_id__icontains=search)
-            )
+            queryset = search_queryset(queryset, 'job_order', search)
         
         return queryset
     
@@ -119,6 +204,8 @@ class JobOrderViewSet(viewsets.ModelViewSet):
         try:
             with transaction.atomic():
                 job_order = serializer.save()
+                # Reload so the response does not use the pre-update prefetch cache
+                job_order = with_order_details(JobOrder.objects.filter(pk=job_order.pk)).get()
                 response_serializer = JobOrderListSerializer(job_order)
                 return Response(response_serializer.data)
         except Exception as e:
@@ -156,7 +243,7 @@ class JobOrderViewSet(viewsets.ModelViewSet):
     def items(self, request, pk=None):
         """Get job order items"""
         job_order = self.get_object()
-        items = job_order.joborderitem_set.filter(is_active=True)
+        items = job_order.active_items
         serializer = JobOrderItemSerializer(items, many=True)
         return Response(serializer.data)
     
@@ -164,34 +251,61 @@ class JobOrderViewSet(viewsets.ModelViewSet):
     def measurements(self, request, pk=None):
         """Get job order measurements"""
         job_order = self.get_object()
-        measurements = job_order.jobordermeasurement_set.filter(is_active=True)
+        measurements = job_order.active_measurements
         serializer = JobOrderMeasurementReadSerializer(measurements, many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get job order statistics"""
-        queryset = self.get_queryset()
+        """Get job order statistics, optionally broken down by day, payment method or status"""
+        group_by = [key for key in request.query_params.get('group_by', '').split(',') if key]
+        invalid = [key for key in group_by if key not in STATS_GROUPINGS]
+        if invalid:
+            return Response(
+                {'error': f"Invalid group_by value(s): {', '.join(invalid)}. Allowed: {', '.join(STATS_GROUPINGS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        params = request.query_params
+        if params.get('customer_id') or params.get('search'):
+            # Per-customer and search stats need the orders themselves. Aggregates
+            # ignore prefetches; ordering is cleared so it does not leak into GROUP BY
+            queryset = self.get_queryset().order_by()
+            aggregates, groupings = stats_aggregates, STATS_GROUPINGS
+        else:
+            queryset = job_order_rollups(params)
+            aggregates, groupings = rollup_stats_aggregates, ROLLUP_STATS_GROUPINGS
+        stats = queryset.aggregate(**aggregates())
         
-        stats = {
-            'total_orders': queryset.count(),
-            'pending': queryset.filter(status='pending').count(),
-            'in_progress': queryset.filter(status='in_progress').count(),
-            'completed': queryset.filter(status='completed').count(),
-            'delivered': queryset.filter(status='delivered').count(),
-            'total_revenue': sum(order.total_amount for order in queryset),
-            'total_balance': sum(order.balance_amount for order in queryset),
-        }
+        if group_by:
+            stats['breakdowns'] = {}
+            for key in group_by:
+                rows = (
+                    queryset.annotate(group=groupings[key])
+                    .values('group')
+                    .annotate(**aggregates())
+                    .order_by('group')
+                )
+                stats['breakdowns'][key] = list(rows)
         
         return Response(stats)
     
     @action(detail=False, methods=['get'])
     def recent(self, request):
         """Get recent job orders"""
-        limit = int(request.query_params.get('limit', 10))
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            return Response(
+                {'error': 'Invalid limit'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, CreatedAtCursorPagination.max_page_size))
         queryset = self.get_queryset()[:limit]
-        serializer = JobOrderListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.conditional_response(
+            queryset,
+            lambda: Response(JobOrderListSerializer(queryset, many=True).data)
+        )
     
     @action(detail=False, methods=['get'])
     def test(self, request):
@@ -265,42 +379,14 @@ class JobOrderViewSet(viewsets.ModelViewSet):
         from_date = request.query_params.get('from_date')
         to_date = request.query_params.get('to_date')
         
-        if from_date:
-            try:
-                from datetime import datetime, time
-                from_date_obj = datetime.strptime(from_date, '%Y-%m-%d').date()
-                # Use date range starting from beginning of the day
-                from_datetime = datetime.combine(from_date_obj, time.min)
-                if timezone.is_aware(timezone.now()):
-                    from_datetime = timezone.make_aware(from_datetime)
-                queryset = queryset.filter(delivery_date__gte=from_datetime)
-            except ValueError:
-                pass  # Invalid date format, ignore the filter
+        queryset = filter_date_range(queryset, 'delivery_date', from_date, to_date)
         
-        if to_date:
-            try:
-                from datetime import datetime, time
-                to_date_obj = datetime.strptime(to_date, '%Y-%m-%d').date()
-                # Use date range ending at end of the day
-                to_datetime = datetime.combine(to_date_obj, time.max)
-                if timezone.is_aware(timezone.now()):
-                    to_datetime = timezone.make_aware(to_datetime)
-                queryset = queryset.filter(delivery_date__lte=to_datetime)
-            except ValueError:
-                pass  # Invalid date format, ignore the filter
+        # ?search= is already applied by get_queryset
         
-        # Search by job order number, customer name, customer phone, or customer ID
-        search = request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(
-                models.Q(job_order_number__icontains=search) |
-                models.Q(customer__name__icontains=search) |
-                models.Q(customer__phone__icontains=search) |
-                models.Q(customer__customer_id__icontains=search)
-            )
-        
-        serializer = JobOrderListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.conditional_response(
+            queryset,
+            lambda: self.paginated_response(queryset, JobOrderListSerializer)
+        )
     
     @action(detail=True, methods=['post'])
     def toggle_block(self, request, pk=None):
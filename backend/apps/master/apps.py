@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MasterConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.master'
+
+    def ready(self):
+        # Invalidate the reference cache on writes
+        from . import cache  # noqa: F401
@@ -0,0 +1,14 @@
+from core.cache import ReferenceCache
+
+from .models import CompanyDetails
+
+
+company_cache = ReferenceCache('company', [CompanyDetails]).connect()
+
+
+def default_company():
+    """The active default company, or None, from cache"""
+    return company_cache.get_or_set(
+        'default',
+        lambda: CompanyDetails.objects.filter(is_default=True, company_is_active=True).first()
+    )
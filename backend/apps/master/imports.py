@@ -0,0 +1,228 @@
+"""
+Bulk import of customers, materials and inventory items.
+
+Rows are validated with one reusable serializer per import, so fields are built
+once rather than per row, and checks that need the database (item categories,
+SKU uniqueness) run as one query per batch. Each batch of valid rows draws its
+customer ids or SKUs from the document sequences in a single block
+(allocate_numbers) and is written with bulk_create inside its own transaction.
+Invalid rows are reported with their row number and skipped; the valid rows
+around them are still imported.
+
+bulk_create skips save() and post_save signals, so the importers fill
+search_key themselves, index imported customers for search and invalidate the
+material cache. The customer autocomplete picks new rows up on its next delta
+sync.
+"""
+import csv
+import io
+import json
+
+from django.db import transaction
+from rest_framework import serializers
+
+from apps.crm.models import Customer
+from apps.crm.serializers import CustomerSerializer
+from apps.inventory.models import Item, ItemCategory
+from apps.materials.cache import material_cache
+from apps.materials.models import Material
+from apps.materials.serializers import MaterialSerializer
+from apps.search.index import index_objects
+from core.text import search_key
+from .sequences import allocate_numbers
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Row errors listed in a result; the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+class CustomerImportSerializer(CustomerSerializer):
+    class Meta(CustomerSerializer.Meta):
+        fields = ['name', 'phone', 'balance', 'points', 'is_active']
+
+
+class MaterialImportSerializer(MaterialSerializer):
+    class Meta(MaterialSerializer.Meta):
+        fields = ['name', 'thool', 'kethet', 'thool_kum', 'ardh_f_kum', 'jamba', 'ragab', 'price', 'is_active']
+
+
+class ItemImportSerializer(serializers.ModelSerializer):
+    # Plain fields: categories and SKU uniqueness are checked per batch, not per row
+    category = serializers.IntegerField(required=False, allow_null=True)
+    sku = serializers.CharField(max_length=50, required=False, allow_blank=True, allow_null=True)
+
+    class Meta:
+        model = Item
+        fields = ['name', 'sku', 'description', 'category', 'unit', 'is_active', 'is_raw_material']
+
+
+class Importer:
+    """Validation and creation of one kind of imported row"""
+    model = None
+    serializer_class = None
+    # (sequence name, model field) of the identifier allocated to rows without one
+    sequence = None
+
+    def __init__(self):
+        self.serializer = self.serializer_class()
+
+    def validate_row(self, row):
+        """Validated data of a row; raises serializers.ValidationError"""
+        return self.serializer.run_validation(row)
+
+    def check_batch(self, rows):
+        """Database checks over the validated rows of a batch: {index: errors} of rejected rows"""
+        return {}
+
+    def build(self, data):
+        return self.model(**data)
+
+    def after_batch(self, objects):
+        """Work save() or signals would have done for the created objects"""
+
+
+class CustomerImporter(Importer):
+    model = Customer
+    serializer_class = CustomerImportSerializer
+    sequence = ('customer', 'customer_id')
+
+    def build(self, data):
+        data.setdefault('balance', 0)
+        return Customer(search_key=search_key(data['name']), **data)
+
+    def after_batch(self, objects):
+        index_objects('customer', pk__in=[customer.pk for customer in objects])
+
+
+class MaterialImporter(Importer):
+    model = Material
+    serializer_class = MaterialImportSerializer
+
+    def build(self, data):
+        return Material(search_key=search_key(data['name']), **data)
+
+    def after_batch(self, objects):
+        transaction.on_commit(material_cache.invalidate)
+
+
+class ItemImporter(Importer):
+    model = Item
+    serializer_class = ItemImportSerializer
+    sequence = ('item_sku', 'sku')
+
+    def __init__(self):
+        super().__init__()
+        # SKUs seen earlier in this import, so duplicates across batches are caught too
+        self.seen_skus = set()
+
+    def check_batch(self, rows):
+        errors = {}
+        category_ids = {data['category'] for data in rows.values() if data.get('category')}
+        known_categories = set(ItemCategory.objects.filter(pk__in=category_ids).values_list('pk', flat=True))
+        skus = {data['sku'] for data in rows.values() if data.get('sku')}
+        taken_skus = set(Item.objects.filter(sku__in=skus).values_list('sku', flat=True))
+
+        for index, data in rows.items():
+            if data.get('category') and data['category'] not in known_categories:
+                errors[index] = {'category': [f"Item category {data['category']} does not exist"]}
+            elif data.get('sku') and (data['sku'] in taken_skus or data['sku'] in self.seen_skus):
+                errors[index] = {'sku': [f"SKU {data['sku']} is already used"]}
+            elif data.get('sku'):
+                self.seen_skus.add(data['sku'])
+        return errors
+
+    def build(self, data):
+        data['category_id'] = data.pop('category', None)
+        return Item(**data)
+
+
+IMPORTERS = {
+    'customers': CustomerImporter,
+    'materials': MaterialImporter,
+    'items': ItemImporter,
+}
+
+
+def _clean_row(row):
+    """Strip keys and string values and drop empty cells, so optional fields get their defaults"""
+    cleaned = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ('', None):
+            continue
+        cleaned[key.strip()] = value
+    return cleaned
+
+
+def read_rows(stream, file_format):
+    """Rows of a CSV (with a header line) or JSON (a list of objects) file opened in binary mode"""
+    if file_format == 'csv':
+        return csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    if file_format == 'json':
+        rows = json.load(stream)
+        if not isinstance(rows, list):
+            raise ValueError('A JSON import must be a list of objects')
+        return rows
+    raise ValueError(f"Unsupported import format: {file_format}")
+
+
+def _write_batch(importer, batch):
+    """Create the valid rows of a batch; return the number created"""
+    objects = [importer.build(data) for data in batch]
+    with transaction.atomic():
+        if importer.sequence:
+            name, field = importer.sequence
+            missing = [obj for obj in objects if not getattr(obj, field)]
+            if missing:
+                for obj, number in zip(missing, allocate_numbers(name, len(missing))):
+                    setattr(obj, field, number)
+        created = importer.model.objects.bulk_create(objects)
+        importer.after_batch(created)
+    return len(created)
+
+
+def run_import(kind, rows, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Validate and import rows (dicts) of `kind`, batch by batch.
+
+    Returns {'rows', 'created', 'error_count', 'errors'}, where errors lists up
+    to MAX_REPORTED_ERRORS {'row': n, 'errors': {...}} entries with 1-based row
+    numbers. With dry_run nothing is written.
+    """
+    importer = IMPORTERS[kind]()
+    result = {'rows': 0, 'created': 0, 'error_count': 0, 'errors': []}
+
+    def report(number, errors):
+        result['error_count'] += 1
+        if len(result['errors']) < MAX_REPORTED_ERRORS:
+            result['errors'].append({'row': number, 'errors': errors})
+
+    def flush(valid):
+        rejected = importer.check_batch(valid)
+        for number in sorted(rejected):
+            report(number, rejected[number])
+        accepted = [data for number, data in valid.items() if number not in rejected]
+        if accepted and not dry_run:
+            result['created'] += _write_batch(importer, accepted)
+
+    valid = {}
+    for number, row in enumerate(rows, start=1):
+        result['rows'] += 1
+        if not isinstance(row, dict):
+            report(number, {'non_field_errors': ['Expected an object']})
+            continue
+        try:
+            valid[number] = importer.validate_row(_clean_row(row))
+        except serializers.ValidationError as e:
+            report(number, e.detail)
+        if len(valid) >= batch_size:
+            flush(valid)
+            valid = {}
+    if valid:
+        flush(valid)
+    return result
@@ -0,0 +1,41 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.master.imports import DEFAULT_BATCH_SIZE, IMPORTERS, read_rows, run_import
+
+
+class Command(BaseCommand):
+    help = "Bulk import customers, materials or inventory items from a CSV or JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS), help='What the file contains')
+        parser.add_argument('path', help='CSV file with a header line, or JSON list of objects')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows validated and written per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report errors without writing')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        file_format = path.suffix.lstrip('.').lower()
+        if file_format not in ('csv', 'json'):
+            raise CommandError('The file must end in .csv or .json')
+
+        started = time.perf_counter()
+        try:
+            with path.open('rb') as stream:
+                result = run_import(
+                    options['kind'], read_rows(stream, file_format),
+                    batch_size=options['batch_size'], dry_run=options['dry_run']
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if result['error_count'] > len(result['errors']):
+            self.stderr.write(f"... and {result['error_count'] - len(result['errors'])} more rejected rows")
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['created']} of {result['rows']} rows imported, {result['error_count']} rejected "
+            f"in {time.perf_counter() - started:.1f}s"
+        ))
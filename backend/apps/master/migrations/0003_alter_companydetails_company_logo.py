@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('master', '0002_documentsequence'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='companydetails',
+            name='company_logo',
+            field=models.ImageField(blank=True, null=True, upload_to='company/'),
+        ),
+    ]
@@ -17,4 +17,13 @@ class CompanyDetails(models.Model):
     is_default = models.BooleanField(default=False)
 
     def __str__(self):
-        return self.company_name
\ No newline at end of file
+        return self.company_name
+
+class DocumentSequence(models.Model):
+    """Last issued value of a document number sequence (customer ids, job order numbers, etc.)"""
+    name = models.CharField(max_length=50, unique=True)
+    last_value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_value}"
@@ -0,0 +1,143 @@
+"""
+Document number allocator.
+
+Every business document number (customer ids, job order numbers, receipt ids,
+item SKUs and sale numbers) is drawn from a row in the DocumentSequence table.
+The row is locked with SELECT ... FOR UPDATE while it is advanced, so concurrent
+requests never receive the same number and allocation cost does not depend on
+how many documents already exist.
+
+Sequences with a block_size of 1 are gap-free as long as the number is drawn
+inside the transaction that saves the document: the reservation is then rolled
+back with it. The model save() methods and serializer create() methods that
+allocate numbers do so inside such a transaction.
+Sequences with a larger block_size reserve that many numbers per process and hand
+them out from memory, trading gaps after a restart for fewer locked round trips.
+
+`width` is a minimum: numbers are zero-padded to it and grow past it once the
+sequence does. A new sequence starts after the highest number already in use,
+unless `seed_from_documents` is False; it then starts at 1, and the caller
+skips numbers that are already taken (see Item.generate_sku).
+"""
+import re
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+
+from .models import DocumentSequence
+
+
+DEFAULT_SEQUENCES = {
+    'customer': {'model': 'crm.Customer', 'field': 'customer_id', 'prefix': '', 'width': 1, 'block_size': 1},
+    'job_order': {'model': 'joborder.JobOrder', 'field': 'job_order_number', 'prefix': 'JO-', 'width': 4, 'block_size': 1},
+    'receipt': {
+        'model': 'receipt.Receipt', 'field': 'receipt_id', 'prefix': 'RCP', 'width': 3, 'block_size': 1,
+        # Receipts used to be numbered RCP + YYYYMMDD + a 3-digit serial; continue from the serial
+        'legacy_patterns': [r'^RCP\d{8}(\d{3})$'],
+    },
+    'item_sku': {
+        'model': 'inventory.Item', 'field': 'sku', 'prefix': '', 'width': 5, 'block_size': 20,
+        # Legacy SKUs are random 5-digit numbers whose maximum is close to 99999;
+        # start from 1 and skip the taken ones instead of continuing past it
+        'seed_from_documents': False,
+    },
+    'sale': {'model': 'sale.Sale', 'field': 'sale_number', 'prefix': 'SALE-', 'width': 6, 'block_size': 1},
+}
+
+# Numbers reserved by this process but not yet handed out: name -> [next, last]
+_reserved = {}
+_reserved_lock = threading.Lock()
+
+
+def get_sequence_config(name):
+    """Return the configuration of a sequence, with DOCUMENT_SEQUENCES overrides applied"""
+    if name not in DEFAULT_SEQUENCES:
+        raise KeyError(f"Unknown document sequence: {name}")
+    config = dict(DEFAULT_SEQUENCES[name])
+    config.update(getattr(settings, 'DOCUMENT_SEQUENCES', {}).get(name, {}))
+    return config
+
+
+def format_number(name, value):
+    """Render a sequence value with the sequence prefix and zero padding"""
+    config = get_sequence_config(name)
+    return f"{config['prefix']}{value:0{config['width']}d}"
+
+
+def _initial_value(config):
+    """Highest number already used in the documents table, scanned once when the sequence is created"""
+    if not config.get('seed_from_documents', True):
+        return 0
+    model = apps.get_model(config['model'])
+    field = config['field']
+    # Legacy formats first: their numbers would otherwise be read whole
+    patterns = [re.compile(pattern) for pattern in config.get('legacy_patterns', [])]
+    patterns.append(re.compile(r'^' + re.escape(config['prefix']) + r'(\d+)$'))
+
+    highest = 0
+    values = model.objects.filter(**{f'{field}__startswith': config['prefix']}).values_list(field, flat=True)
+    for value in values.iterator():
+        for pattern in patterns:
+            match = pattern.match(value or '')
+            if match:
+                highest = max(highest, int(match.group(1)))
+                break
+    return highest
+
+
+def reserve(name, count=1):
+    """Reserve `count` consecutive values in one locked update and return the first one"""
+    if count < 1:
+        raise ValueError("count must be at least 1")
+
+    with transaction.atomic():
+        sequence = DocumentSequence.objects.select_for_update().filter(name=name).first()
+        if sequence is None:
+            sequence, _ = DocumentSequence.objects.get_or_create(
+                name=name,
+                defaults={'last_value': _initial_value(get_sequence_config(name))}
+            )
+            sequence = DocumentSequence.objects.select_for_update().get(pk=sequence.pk)
+
+        first = sequence.last_value + 1
+        sequence.last_value += count
+        sequence.save(update_fields=['last_value', 'updated_at'])
+    return first
+
+
+def next_value(name):
+    """Allocate the next numeric value of a sequence"""
+    block_size = get_sequence_config(name)['block_size']
+    if block_size <= 1:
+        return reserve(name)
+
+    with _reserved_lock:
+        block = _reserved.get(name)
+        if block and block[0] <= block[1]:
+            value = block[0]
+            block[0] += 1
+            return value
+
+    first = reserve(name, block_size)
+
+    # Only keep the rest of the block once the reservation is durable, otherwise a
+    # rollback would let the database hand the same numbers out again.
+    def keep_block():
+        with _reserved_lock:
+            _reserved[name] = [first + 1, first + block_size - 1]
+
+    transaction.on_commit(keep_block)
+    return first
+
+
+def next_number(name):
+    """Allocate and format the next document number of a sequence"""
+    return format_number(name, next_value(name))
+
+
+def allocate_numbers(name, count):
+    """Allocate `count` consecutive formatted numbers in a single locked update"""
+    first = reserve(name, count)
+    return [format_number(name, value) for value in range(first, first + count)]
@@ -1,3 +1,167 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.crm.models import Customer
+from apps.inventory.models import Item, ItemCategory
+from apps.joborder.models import JobOrder
+from apps.materials.models import Material
+from apps.receipt.models import Receipt
+from .cache import default_company
+from .imports import run_import
+from .models import CompanyDetails, DocumentSequence
+from .sequences import allocate_numbers, next_number
 
-# Create your tests here.
+User = get_user_model()
+
+
+class DocumentSequenceTestCase(TestCase):
+    def test_numbers_are_sequential_and_formatted(self):
+        """Test job order numbers are allocated in order with prefix and padding"""
+        self.assertEqual(next_number('job_order'), 'JO-0001')
+        self.assertEqual(next_number('job_order'), 'JO-0002')
+        self.assertEqual(DocumentSequence.objects.get(name='job_order').last_value, 2)
+
+    def test_sequence_starts_after_existing_documents(self):
+        """Test a new sequence continues from the highest number already in use"""
+        Customer.objects.create(customer_id='41', name='Existing', phone='1', balance=0)
+        Customer.objects.create(customer_id='CUST7', name='Manual', phone='2', balance=0)
+
+        customer = Customer.objects.create(name='New', phone='3', balance=0)
+        self.assertEqual(customer.customer_id, '42')
+
+    def test_receipt_sequence_continues_legacy_serials(self):
+        """Test dated legacy receipt ids (RCP + YYYYMMDD + serial) seed the sequence from their serial"""
+        customer = Customer.objects.create(name='Existing', phone='1', balance=0)
+        job_order = JobOrder.objects.create(
+            job_order_number='JO-0001', customer=customer, status='pending',
+            delivery_date='2024-01-15T10:00:00Z', total_amount=100, advance_amount=0
+        )
+        for receipt_id in ('RCP20240115007', 'RCP005'):
+            Receipt.objects.create(
+                receipt_id=receipt_id, receipt_date='2024-01-15T10:00:00Z', receipt_amount=10, job_order=job_order
+            )
+
+        self.assertEqual(next_number('receipt'), 'RCP008')
+
+    # Blocks are only kept after a commit, which TestCase never does
+    @override_settings(DOCUMENT_SEQUENCES={'item_sku': {'block_size': 1}})
+    def test_item_skus_skip_legacy_random_skus(self):
+        """Test item SKUs start at 00001 whatever legacy SKUs exist, skip taken ones and grow past 5 digits"""
+        Item.objects.create(name='Legacy', sku='00002')
+        Item.objects.create(name='Legacy high', sku='99998')
+
+        self.assertEqual(Item.objects.create(name='First').sku, '00001')
+        self.assertEqual(Item.objects.create(name='Second').sku, '00003')
+
+        DocumentSequence.objects.filter(name='item_sku').update(last_value=99996)
+        self.assertEqual(Item.objects.create(name='Third').sku, '99997')
+        self.assertEqual(Item.objects.create(name='Fourth').sku, '99999')
+        self.assertEqual(Item.objects.create(name='Fifth').sku, '100000')
+
+    def test_failed_insert_releases_the_number(self):
+        """Test a customer insert that fails does not use up its id"""
+        with self.assertRaises(IntegrityError):
+            Customer.objects.create(name='Broken', phone=None, balance=0)
+        self.assertEqual(Customer.objects.create(name='New', phone='1', balance=0).customer_id, '1')
+
+    def test_allocate_block(self):
+        """Test allocating a block of numbers in one update"""
+        numbers = allocate_numbers('receipt', 3)
+        self.assertEqual(numbers, ['RCP001', 'RCP002', 'RCP003'])
+        self.assertEqual(next_number('receipt'), 'RCP004')
+
+    @override_settings(DOCUMENT_SEQUENCES={'sale': {'prefix': 'INV-', 'width': 3}})
+    def test_settings_override(self):
+        """Test prefix and width can be configured from settings"""
+        self.assertEqual(next_number('sale'), 'INV-001')
+
+
+class CompanyCacheTestCase(TestCase):
+    def create_company(self, name, is_default=False):
+        return CompanyDetails.objects.create(
+            company_name=name,
+            company_name_ar=name,
+            company_address='Street 1',
+            company_phone='0500000000',
+            company_email='shop@example.com',
+            company_website='https://example.com',
+            company_currency='SAR',
+            company_open_time='09:00',
+            company_close_time='21:00',
+            is_default=is_default
+        )
+
+    def test_default_company_is_cached_until_a_write(self):
+        """Test the default company is read once and refreshed when companies change"""
+        self.assertIsNone(default_company())
+        company = self.create_company('Main Shop', is_default=True)
+        self.assertEqual(default_company(), company)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(default_company().company_name, 'Main Shop')
+
+        company.company_name = 'Renamed Shop'
+        company.save()
+        self.assertEqual(default_company().company_name, 'Renamed Shop')
+
+
+class BulkImportTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_import_customers_csv(self):
+        """Test customers from a CSV upload get sequential ids and search keys; bad rows are reported"""
+        upload = SimpleUploadedFile(
+            'customers.csv',
+            'name,phone,balance\nAhmed Ali,0500000001,10\n,0500000002,0\nSara,0500000003,\n'.encode()
+        )
+        response = self.client.post(reverse('bulk-import', args=['customers']), {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rows'], 3)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+        self.assertIn('name', response.data['errors'][0]['errors'])
+        customers = list(Customer.objects.order_by('customer_id').values_list('customer_id', 'name', 'search_key'))
+        self.assertEqual(customers, [('1', 'Ahmed Ali', 'ahmed ali'), ('2', 'Sara', 'sara')])
+
+    def test_import_items_checks_categories_and_skus(self):
+        """Test item rows with unknown categories or duplicate SKUs are rejected per batch"""
+        category = ItemCategory.objects.create(name='Fabric')
+        Item.objects.create(name='Existing', sku='SKU-1', category=category)
+        rows = [
+            {'name': 'Cotton', 'category': category.pk},
+            {'name': 'Taken', 'sku': 'SKU-1'},
+            {'name': 'Unknown', 'category': category.pk + 100},
+            {'name': 'Linen', 'sku': 'SKU-2'},
+            {'name': 'Again', 'sku': 'SKU-2'},
+        ]
+        result = run_import('items', rows, batch_size=4)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual([error['row'] for error in result['errors']], [2, 3, 5])
+        self.assertTrue(Item.objects.filter(name='Cotton', category=category).exclude(sku=None).exists())
+        self.assertEqual(Item.objects.get(sku='SKU-2').name, 'Linen')
+
+    def test_dry_run_writes_nothing(self):
+        """Test ?dry_run=true only validates the rows"""
+        measures = {'thool': 1, 'kethet': 1, 'thool_kum': 1, 'ardh_f_kum': 1, 'jamba': 1, 'ragab': 1}
+        rows = [{'name': 'Cotton', 'price': '12.50', **measures}, {'name': 'Bad', 'price': 'abc', **measures}]
+        response = self.client.post(reverse('bulk-import', args=['materials']) + '?dry_run=true', rows, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['created'], response.data['error_count']), (0, 1))
+        self.assertFalse(Material.objects.exists())
+
+    def test_unknown_kind(self):
+        response = self.client.post(reverse('bulk-import', args=['orders']), [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
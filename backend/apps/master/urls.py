@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CompanyDetailsViewSet
+from .views import CompanyDetailsViewSet, ImportView
 
 # Create a router and register our viewsets
 router = DefaultRouter()
@@ -8,4 +8,5 @@ router.register(r'company-details', CompanyDetailsViewSet, basename='company-det
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('import/<slug:kind>/', ImportView.as_view(), name='bulk-import'),
 ]
@@ -1,4 +1,4 @@
-from rest_framework import viewsets, status
+from rest_framework import generics, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -6,6 +6,8 @@ from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from .models import CompanyDetails
+from .cache import default_company
+from .imports import IMPORTERS, read_rows, run_import
 from .serializers import CompanyDetailsSerializer
 
 
@@ -93,13 +95,10 @@ class CompanyDetailsViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def default(self, request):
         """Get the default company details"""
-        default_company = CompanyDetails.objects.filter(
-            is_default=True,
-            company_is_active=True
-        ).first()
+        company = default_company()
         
-        if default_company:
-            serializer = self.get_serializer(default_company)
+        if company:
+            serializer = self.get_serializer(company)
             return Response(serializer.data)
         return Response(
             {'error': 'No default company found'},
@@ -132,3 +131,39 @@ class CompanyDetailsViewSet(viewsets.ModelViewSet):
         company.save()
         serializer = self.get_serializer(company)
         return Response(serializer.data)
+
+
+class ImportView(generics.GenericAPIView):
+    """
+    Bulk import customers, materials or inventory items.
+
+    POST /api/master/import/<customers|materials|items>/ with either a JSON list
+    of objects as the body or a multipart `file` (.csv with a header line, or
+    .json). Add ?dry_run=true to only validate. Responds with the number of rows
+    created and the errors of rejected rows.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, kind):
+        if kind not in IMPORTERS:
+            return Response(
+                {'error': f"Unknown import. Allowed: {', '.join(IMPORTERS)}"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        dry_run = request.query_params.get('dry_run', '').lower() in ('true', '1', 'yes')
+        upload = request.FILES.get('file')
+        try:
+            if upload is not None:
+                file_format = upload.name.rsplit('.', 1)[-1].lower()
+                rows = read_rows(upload, file_format)
+            elif isinstance(request.data, list):
+                rows = request.data
+            else:
+                return Response(
+                    {'error': 'Send a JSON list of rows or a CSV/JSON file as "file"'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            result = run_import(kind, rows, dry_run=dry_run)
+        except ValueError as e:
+            return Response({'error': f'Could not read the import: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'dry_run': dry_run, **result})
@@ -0,0 +1,14 @@
+from core.cache import ReferenceCache
+
+from .models import Material
+
+
+material_cache = ReferenceCache('materials', [Material]).connect()
+
+
+def active_materials():
+    """Active materials, newest first as in the list, from cache"""
+    return material_cache.get_or_set(
+        'active', lambda: list(Material.objects.filter(is_active=True).order_by('-created_at'))
+    )
+
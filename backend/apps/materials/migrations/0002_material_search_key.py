@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+from core.text import search_key
+
+
+def fill_search_keys(apps, schema_editor):
+    Material = apps.get_model('materials', 'Material')
+    batch = []
+    for obj in Material.objects.only('id', 'name').iterator(chunk_size=1000):
+        obj.search_key = search_key(obj.name)
+        batch.append(obj)
+        if len(batch) >= 1000:
+            Material.objects.bulk_update(batch, ['search_key'])
+            batch = []
+    Material.objects.bulk_update(batch, ['search_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('materials', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='material',
+            name='search_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['search_key'], name='material_search_key_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+    ]
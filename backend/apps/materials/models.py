@@ -1,8 +1,10 @@
 from django.db import models
+from core.text import search_key
 
 # Create your models here.
 class Material(models.Model):
     name = models.CharField(max_length=255)
+    search_key = models.CharField(max_length=255, blank=True, default='', editable=False)
     thool = models.DecimalField(max_digits=10, decimal_places=2)
     kethet = models.DecimalField(max_digits=10, decimal_places=2)
     thool_kum = models.DecimalField(max_digits=10, decimal_places=2)
@@ -14,5 +16,18 @@ class Material(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['search_key'], name='material_search_key_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['updated_at'], name='material_updated_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.search_key = search_key(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_key'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
\ No newline at end of file
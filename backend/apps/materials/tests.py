@@ -1,3 +1,95 @@
-from django.test import TestCase
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Material
 
-# Create your tests here.
+User = get_user_model()
+
+
+class MaterialAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_material(self, name):
+        return Material.objects.create(
+            name=name,
+            price=100.00,
+            thool=145.00,
+            kethet=43.00,
+            thool_kum=61.00,
+            ardh_f_kum=17.00,
+            jamba=9.00,
+            ragab=12.00
+        )
+
+    def test_search_matches_prefix_of_folded_name(self):
+        """Test material search matches the start of the name, ignoring case and Arabic variants"""
+        cotton = self.create_material('Japanese Cotton')
+        wool = self.create_material('إنجليزي صوف')
+        self.create_material('Linen')
+
+        response = self.client.get(reverse('material-search'), {'q': 'JAPAN'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data], [cotton.id])
+
+        response = self.client.get(reverse('material-search'), {'q': 'انجليزي'})
+        self.assertEqual([row['id'] for row in response.data], [wool.id])
+
+        # Only the start of the name matches, so the search_key index can serve it
+        response = self.client.get(reverse('material-search'), {'q': 'cotton'})
+        self.assertEqual(response.data, [])
+
+        response = self.client.get(reverse('material-list'), {'search': 'lin'})
+        self.assertEqual([row['name'] for row in response.data], ['Linen'])
+
+    def test_active_materials_come_from_cache_until_a_write(self):
+        """Test the active list is cached and refreshed when a material is saved"""
+        material = self.create_material('Cotton')
+        url = reverse('material-active')
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual([row['name'] for row in response.data], ['Cotton'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            material.is_active = False
+            material.save()
+        self.assertEqual(self.client.get(url).data, [])
+
+    def test_active_materials_apply_filters_and_search(self):
+        """Test the active list honours search and ordering, skipping the cache"""
+        self.create_material('Cotton')
+        self.create_material('Linen')
+        url = reverse('material-active')
+
+        response = self.client.get(url, {'search': 'lin'})
+        self.assertEqual([row['name'] for row in response.data], ['Linen'])
+        response = self.client.get(url, {'ordering': 'name'})
+        self.assertEqual([row['name'] for row in response.data], ['Cotton', 'Linen'])
+        response = self.client.get(url)
+        self.assertEqual([row['name'] for row in response.data], ['Linen', 'Cotton'])
+
+    def test_list_honours_if_modified_since(self):
+        """Test the materials list answers If-Modified-Since with 304 until a material changes"""
+        material = self.create_material('Cotton')
+        url = reverse('material-list')
+        response = self.client.get(url)
+        last_modified = response['Last-Modified']
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Material.objects.filter(pk=material.pk).update(updated_at=material.updated_at + timedelta(seconds=5))
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -3,13 +3,17 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.exceptions import ValidationError
 from .models import Material
+from .cache import active_materials
 from .serializers import MaterialSerializer
+from core.conditional import ConditionalGetMixin
+from core.filters import NormalizedSearchFilter, prefix_q
+from core.text import search_key
 
 
-class MaterialViewSet(viewsets.ModelViewSet):
+class MaterialViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing materials with full CRUD operations.
     
@@ -26,9 +30,9 @@ class MaterialViewSet(viewsets.ModelViewSet):
     queryset = Material.objects.all()
     serializer_class = MaterialSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, NormalizedSearchFilter, OrderingFilter]
     filterset_fields = ['is_active', 'name']
-    search_fields = ['name']
+    search_fields = ['^search_key']
     ordering_fields = ['created_at', 'updated_at', 'name', 'price']
     ordering = ['-created_at']
 
@@ -72,6 +76,14 @@ class MaterialViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def list(self, request, *args, **kwargs):
+        """List materials, answering 304 when the client's copy is current"""
+        respond = super().list
+        return self.conditional_response(
+            self.filter_queryset(self.get_queryset()),
+            lambda: respond(request, *args, **kwargs)
+        )
+
     def get_queryset(self):
         """Return queryset with optional filtering"""
         queryset = Material.objects.all()
@@ -85,19 +97,20 @@ class MaterialViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def active(self, request):
-        """Get only active materials"""
-        active_materials = self.get_queryset().filter(is_active=True)
-        serializer = self.get_serializer(active_materials, many=True)
+        """Get only active materials, from cache unless filters, search or ordering are given"""
+        if request.query_params:
+            materials = self.filter_queryset(self.get_queryset()).filter(is_active=True)
+        else:
+            materials = active_materials()
+        serializer = self.get_serializer(materials, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def search(self, request):
-        """Search materials by name"""
-        query = request.query_params.get('q', '')
+        """Search materials by the start of their name, served by the search_key index"""
+        query = search_key(request.query_params.get('q', ''))
         if query:
-            materials = self.get_queryset().filter(
-                name__icontains=query
-            )
+            materials = self.get_queryset().filter(prefix_q('search_key', query))
             serializer = self.get_serializer(materials, many=True)
             return Response(serializer.data)
         return Response([])
@@ -0,0 +1,137 @@
+"""
+Printable documents: the A5 job order, its payment receipt and the sales bill.
+
+Each document names its template, which objects can be printed (`objects()`),
+how to load an object with everything the template shows (`queryset()`), and
+`version_fields`: aggregates over the object and the rows it prints whose
+values change whenever the printed output would; `updated` is None when the
+object does not exist. The render cache (see render.py) is keyed on them, so
+checking for a cached copy is one aggregate query.
+
+Only active documents are printed, with their active lines, and the line
+aggregates are filtered the same way, so edits to inactive lines keep the key.
+"""
+from django.db.models import Count, Max, Prefetch, Q
+
+from apps.joborder.models import JobOrder
+from apps.joborder.views import with_order_details
+from apps.receipt.models import Receipt
+from apps.sale.models import Sale, SaleItem
+
+
+class Document:
+    """A printable model"""
+    model = None
+    template = None
+    # Field holding the document number, used to name exported files
+    number_field = None
+    # Datetime field that batch printing filters by day
+    date_field = None
+    version_fields = {}
+
+    def objects(self):
+        return self.model.objects.all()
+
+    def queryset(self):
+        return self.objects()
+
+    def context(self, obj):
+        return {'document': obj}
+
+
+class JobOrderDocument(Document):
+    model = JobOrder
+    template = 'printing/job_order.html'
+    number_field = 'job_order_number'
+    date_field = 'created_at'
+    version_fields = {
+        'updated': Max('updated_at'),
+        'customer_updated': Max('customer__updated_at'),
+        'items_updated': Max('joborderitem__updated_at', filter=Q(joborderitem__is_active=True)),
+        'item_count': Count('joborderitem', distinct=True, filter=Q(joborderitem__is_active=True)),
+        'measurements_updated': Max(
+            'jobordermeasurement__updated_at', filter=Q(jobordermeasurement__is_active=True)
+        ),
+        'measurement_count': Count(
+            'jobordermeasurement', distinct=True, filter=Q(jobordermeasurement__is_active=True)
+        ),
+        # The printed lines show their material's name
+        'item_materials_updated': Max(
+            'joborderitem__material__updated_at', filter=Q(joborderitem__is_active=True)
+        ),
+        'measurement_materials_updated': Max(
+            'jobordermeasurement__material__updated_at', filter=Q(jobordermeasurement__is_active=True)
+        ),
+    }
+
+    def objects(self):
+        return JobOrder.objects.filter(is_active=True)
+
+    def queryset(self):
+        return with_order_details(self.objects())
+
+    def context(self, obj):
+        return {
+            'document': obj,
+            'customer': obj.customer,
+            'items': obj.active_items,
+            'measurements': obj.active_measurements,
+        }
+
+
+class ReceiptDocument(Document):
+    model = Receipt
+    template = 'printing/receipt.html'
+    number_field = 'receipt_id'
+    date_field = 'receipt_date'
+    version_fields = {
+        'updated': Max('updated_at'),
+        'order_updated': Max('job_order__updated_at'),
+        'customer_updated': Max('job_order__customer__updated_at'),
+    }
+
+    def objects(self):
+        return Receipt.objects.filter(is_active=True)
+
+    def queryset(self):
+        return self.objects().select_related('job_order', 'job_order__customer')
+
+    def context(self, obj):
+        return {'document': obj, 'job_order': obj.job_order, 'customer': obj.job_order.customer}
+
+
+class SalesBillDocument(Document):
+    model = Sale
+    template = 'printing/sales_bill.html'
+    number_field = 'sale_number'
+    date_field = 'date'
+    version_fields = {
+        'updated': Max('updated_at'),
+        'items_updated': Max('sale_items__updated_at', filter=Q(sale_items__is_active=True)),
+        'item_count': Count('sale_items', distinct=True, filter=Q(sale_items__is_active=True)),
+        # The printed lines show their item's name
+        'item_names_updated': Max('sale_items__item__updated_at', filter=Q(sale_items__is_active=True)),
+    }
+
+    def objects(self):
+        return Sale.objects.filter(is_active=True)
+
+    def queryset(self):
+        return self.objects().prefetch_related(
+            Prefetch(
+                'sale_items',
+                queryset=SaleItem.objects.filter(is_active=True).select_related('item'),
+                to_attr='active_items'
+            )
+        )
+
+    def context(self, obj):
+        return {'document': obj, 'items': obj.active_items}
+
+
+# URL name -> document
+DOCUMENTS = {
+    'job-order': JobOrderDocument,
+    'receipt': ReceiptDocument,
+    'sales-bill': SalesBillDocument,
+}
@@ -0,0 +1,72 @@
+import shutil
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.printing import render
+from apps.printing.documents import DOCUMENTS
+from core.filters import filter_date_range
+
+
+class Command(BaseCommand):
+    help = (
+        "Render job orders, receipts or sales bills into the print cache, optionally "
+        "copying them to a folder for batch printing, and prune unused cache files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', nargs='?', choices=list(DOCUMENTS))
+        parser.add_argument('ids', nargs='*', type=int, help='Document ids')
+        parser.add_argument('--from-date', help='First day (YYYY-MM-DD) of documents to render')
+        parser.add_argument('--to-date', help='Last day (YYYY-MM-DD) of documents to render')
+        parser.add_argument('--file-format', choices=list(render.PRINT_FORMATS), default='html')
+        parser.add_argument('--output', help='Folder to copy the rendered files to, named by document number')
+        parser.add_argument('--prune-days', type=int, help='Delete cache files unused for this many days')
+
+    def handle(self, *args, **options):
+        if options['prune_days'] is not None:
+            removed = render.prune(options['prune_days'])
+            self.stdout.write(f"Removed {removed} unused cache files")
+        kind = options['kind']
+        if kind is None:
+            if options['prune_days'] is None:
+                raise CommandError('Give a document kind, or --prune-days')
+            return
+        if not (options['ids'] or options['from_date'] or options['to_date']):
+            raise CommandError('Give document ids or a --from-date/--to-date range')
+        file_format = options['file_format']
+        if file_format == 'pdf' and render.weasyprint is None:
+            raise CommandError('PDF rendering needs the weasyprint package')
+
+        document = DOCUMENTS[kind]()
+        queryset = document.objects().order_by('pk')
+        if options['ids']:
+            queryset = queryset.filter(pk__in=options['ids'])
+        try:
+            queryset = filter_date_range(
+                queryset, document.date_field, options['from_date'], options['to_date'], strict=True
+            )
+        except ValueError:
+            raise CommandError('Dates must be YYYY-MM-DD')
+
+        output = Path(options['output']) if options['output'] else None
+        if output is not None:
+            output.mkdir(parents=True, exist_ok=True)
+
+        started = time.monotonic()
+        rendered = cached = 0
+        for pk, number in queryset.values_list('pk', document.number_field).iterator():
+            result = render.render_document(kind, pk, file_format)
+            if result is None:
+                continue
+            path, from_cache = result
+            rendered += 1
+            cached += from_cache
+            if output is not None:
+                shutil.copyfile(path, output / f'{number or pk}.{file_format}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{rendered} documents ready ({cached} from cache) in {time.monotonic() - started:.1f}s"
+            + (f", copied to {output}" if output is not None else '')
+        ))
@@ -0,0 +1,147 @@
+"""
+Rendering of printable documents with a content-addressed disk cache.
+
+A rendered file is stored under PRINT_CACHE_DIR as <kind>/<key>.<format>, where
+the key is a hash of everything the output depends on: the document's
+version_fields (its updated_at and those of the rows it prints), the default
+company the header shows, the modification times of the template and the
+templates it extends, and the format.
+An edit changes the key, so cached files never need invalidating: a reprint is
+one aggregate query and a file read, and stale files are removed by age with
+`manage.py print_documents --prune-days`.
+
+Documents are A5 HTML pages. PDFs are made from the same HTML with WeasyPrint
+when it is installed.
+"""
+import base64
+import hashlib
+import mimetypes
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import Context
+from django.template.loader import get_template
+from django.template.loader_tags import ExtendsNode
+
+from apps.master.cache import default_company
+from .documents import DOCUMENTS
+
+try:
+    import weasyprint
+except ImportError:
+    weasyprint = None
+
+PRINT_FORMATS = {
+    'html': 'text/html; charset=utf-8',
+    'pdf': 'application/pdf',
+}
+
+
+def cache_root():
+    return Path(getattr(settings, 'PRINT_CACHE_DIR', settings.BASE_DIR / 'print_cache'))
+
+
+def _stamp(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def template_files(template):
+    """Paths of a template and of the templates it extends"""
+    template = template.template
+    paths = [template.origin.name]
+    extends = template.nodelist.get_nodes_by_type(ExtendsNode)
+    while extends:
+        template = template.engine.get_template(extends[0].parent_name.resolve(Context()))
+        paths.append(template.origin.name)
+        extends = template.nodelist.get_nodes_by_type(ExtendsNode)
+    return paths
+
+
+def cache_key(kind, pk, version, company, template, file_format):
+    """Hash of the inputs a rendered document depends on"""
+    parts = [kind, str(pk), file_format]
+    parts += [f'{name}={_stamp(value)}' for name, value in sorted(version.items())]
+    if company is not None:
+        parts.append(f'company={company.pk}:{_stamp(company.company_updated_at)}')
+    parts += [f'template={os.stat(path).st_mtime_ns}' for path in template_files(template)]
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+
+def logo_data_uri(company):
+    """The company logo inlined as a data: URI, so rendered files are self-contained"""
+    if company is None or not company.company_logo:
+        return None
+    try:
+        with company.company_logo.open('rb') as logo:
+            data = base64.b64encode(logo.read()).decode()
+    except (OSError, ValueError):
+        return None
+    content_type = mimetypes.guess_type(company.company_logo.name)[0] or 'image/png'
+    return f'data:{content_type};base64,{data}'
+
+
+def render_content(document, obj, company, template, file_format):
+    html = template.render({**document.context(obj), 'company': company, 'logo': logo_data_uri(company)})
+    if file_format == 'pdf':
+        return weasyprint.HTML(string=html).write_pdf()
+    return html.encode()
+
+
+def _write(path, content):
+    """Write a cache file atomically, so concurrent readers never see a partial one"""
+    root = cache_root()
+    if not root.exists():
+        root.mkdir(parents=True, exist_ok=True)
+        # Keep rendered documents out of version control
+        (root / '.gitignore').write_text('*\n')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as temp:
+            temp.write(content)
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def render_document(kind, pk, file_format='html'):
+    """
+    Path of the rendered document, from cache when its key is unchanged.
+
+    Returns (path, cached), or None when no such document exists. PDFs need
+    WeasyPrint; callers check `weasyprint` first.
+    """
+    document = DOCUMENTS[kind]()
+    version = document.objects().filter(pk=pk).aggregate(**document.version_fields)
+    if version['updated'] is None:
+        return None
+
+    company = default_company()
+    template = get_template(document.template)
+    path = cache_root() / kind / f'{cache_key(kind, pk, version, company, template, file_format)}.{file_format}'
+    if path.exists():
+        # Touch on use, so pruning only removes documents nobody reprints
+        os.utime(path)
+        return path, True
+
+    obj = document.queryset().filter(pk=pk).first()
+    if obj is None:
+        return None
+    _write(path, render_content(document, obj, company, template, file_format))
+    return path, False
+
+
+def prune(max_age_days):
+    """Delete cached files not used for `max_age_days`; returns how many were removed"""
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for kind in DOCUMENTS:
+        for path in (cache_root() / kind).glob('*.*'):
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+    return removed
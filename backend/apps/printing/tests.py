@@ -0,0 +1,192 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.template.loader import get_template
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.crm.models import Customer
+from apps.joborder.models import JobOrder, jobOrderItem
+from apps.master.models import CompanyDetails
+from apps.printing import render
+from apps.materials.models import Material
+from apps.receipt.models import Receipt
+from apps.inventory.models import Item
+from apps.sale.models import Sale, SaleItem
+
+User = get_user_model()
+
+
+class PrintAPITestCase(APITestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        settings_override = override_settings(PRINT_CACHE_DIR=self.cache_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        CompanyDetails.objects.create(
+            company_name='Main Shop',
+            company_name_ar='Main Shop',
+            company_address='Street 1',
+            company_phone='0500000000',
+            company_email='shop@example.com',
+            company_website='https://example.com',
+            company_currency='SAR',
+            company_open_time='09:00',
+            company_close_time='21:00',
+            is_default=True
+        )
+        self.customer = Customer.objects.create(name='Test Customer', phone='1234567890', balance=0)
+        self.material = Material.objects.create(
+            name='Cotton', price=100, thool=145, kethet=43, thool_kum=61, ardh_f_kum=17, jamba=9, ragab=12
+        )
+        self.job_order = JobOrder.objects.create(
+            job_order_number='JO-0001',
+            customer=self.customer,
+            status='pending',
+            delivery_date='2024-01-15T10:00:00Z',
+            total_amount=150.00,
+            advance_amount=50.00,
+            balance_amount=100.00
+        )
+        jobOrderItem.objects.create(
+            job_order=self.job_order, material=self.material, quantity=1, fees=150.00, total_amount=150.00
+        )
+
+    def print_url(self, kind, pk):
+        return reverse('print-document', args=[kind, pk])
+
+    def test_job_order_print_is_cached(self):
+        """Test a reprint of an unchanged job order is served from the cache with one query"""
+        response = self.client.get(self.print_url('job-order', self.job_order.pk))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        html = b''.join(response.streaming_content).decode()
+        self.assertIn('JO-0001', html)
+        self.assertIn('Main Shop', html)
+        self.assertIn('Cotton', html)
+        self.assertIn('size: A5', html)
+        response.close()
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.print_url('job-order', self.job_order.pk))
+        self.assertEqual(cached['ETag'], response['ETag'])
+        self.assertEqual(b''.join(cached.streaming_content).decode(), html)
+        cached.close()
+
+        not_modified = self.client.get(self.print_url('job-order', self.job_order.pk), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_edits_change_the_cache_key(self):
+        """Test editing the order or its items renders a new document"""
+        first = self.client.get(self.print_url('job-order', self.job_order.pk))
+        first.close()
+
+        jobOrderItem.objects.create(
+            job_order=self.job_order, material=self.material, quantity=2, fees=75.00, total_amount=150.00
+        )
+        second = self.client.get(self.print_url('job-order', self.job_order.pk))
+        second.close()
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+        self.customer.name = 'Renamed Customer'
+        self.customer.save()
+        third = self.client.get(self.print_url('job-order', self.job_order.pk))
+        self.assertIn('Renamed Customer', b''.join(third.streaming_content).decode())
+        third.close()
+
+    def test_material_and_base_template_changes_change_the_cache_key(self):
+        """Test renaming a printed material or editing the base template renders a new document"""
+        first = self.client.get(self.print_url('job-order', self.job_order.pk))
+        first.close()
+
+        self.material.name = 'Linen'
+        self.material.save()
+        second = self.client.get(self.print_url('job-order', self.job_order.pk))
+        self.assertIn('Linen', b''.join(second.streaming_content).decode())
+        second.close()
+        self.assertNotEqual(first['ETag'], second['ETag'])
+
+        base = Path(render.template_files(get_template('printing/job_order.html'))[-1])
+        mtime = base.stat().st_mtime_ns
+        self.addCleanup(os.utime, base, ns=(mtime, mtime))
+        os.utime(base, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+        third = self.client.get(self.print_url('job-order', self.job_order.pk))
+        third.close()
+        self.assertNotEqual(second['ETag'], third['ETag'])
+
+    def test_inactive_documents_are_not_printed(self):
+        receipt = Receipt.objects.create(
+            receipt_id='RCP001', receipt_date='2024-01-10T10:00:00Z', receipt_amount=50.00,
+            job_order=self.job_order, is_active=False
+        )
+        sale = Sale.objects.create(
+            customer_name='Walk-in', amount=20, payment_method='cash', total_amount=20, is_active=False
+        )
+        self.job_order.is_active = False
+        self.job_order.save()
+        for kind, pk in [('job-order', self.job_order.pk), ('receipt', receipt.pk), ('sales-bill', sale.pk)]:
+            response = self.client.get(self.print_url(kind, pk))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_inactive_lines_do_not_change_the_cache_key(self):
+        """Test edits to an inactive line or its item keep the sales bill's key"""
+        item = Item.objects.create(name='Button', sku='B-1')
+        other = Item.objects.create(name='Zip', sku='Z-1')
+        sale = Sale.objects.create(customer_name='Walk-in', amount=20, payment_method='cash', total_amount=20)
+        SaleItem.objects.create(sale=sale, item=item, quantity=1, price=20, total_amount=20)
+        SaleItem.objects.create(sale=sale, item=other, quantity=1, price=5, total_amount=5, is_active=False)
+
+        first = self.client.get(self.print_url('sales-bill', sale.pk))
+        first.close()
+        other.name = 'Renamed Zip'
+        other.save()
+        second = self.client.get(self.print_url('sales-bill', sale.pk))
+        second.close()
+        self.assertEqual(first['ETag'], second['ETag'])
+
+    def test_receipt_and_sales_bill(self):
+        receipt = Receipt.objects.create(
+            receipt_id='RCP001', receipt_date='2024-01-10T10:00:00Z', receipt_amount=50.00, job_order=self.job_order
+        )
+        sale = Sale.objects.create(customer_name='Walk-in', amount=20, payment_method='cash', total_amount=20)
+
+        response = self.client.get(self.print_url('receipt', receipt.pk))
+        self.assertIn('RCP001', b''.join(response.streaming_content).decode())
+        response.close()
+        response = self.client.get(self.print_url('sales-bill', sale.pk))
+        self.assertIn(sale.sale_number, b''.join(response.streaming_content).decode())
+        response.close()
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.get(self.print_url('invoice', 1)).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(self.print_url('receipt', 999)).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.print_url('job-order', self.job_order.pk) + '?file_format=doc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with mock.patch('apps.printing.render.weasyprint', None):
+            response = self.client.get(self.print_url('job-order', self.job_order.pk) + '?file_format=pdf')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_print_command(self):
+        """Test print_documents renders a date range into a folder named by document number"""
+        output = Path(self.cache_dir) / 'out'
+        call_command(
+            'print_documents', 'job-order',
+            '--from-date', self.job_order.created_at.date().isoformat(), '--output', str(output),
+            stdout=StringIO()
+        )
+        self.assertIn('JO-0001', (output / 'JO-0001.html').read_text())
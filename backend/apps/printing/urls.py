@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('<slug:kind>/<int:pk>/', views.PrintView.as_view(), name='print-document'),
+]
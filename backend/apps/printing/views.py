@@ -0,0 +1,52 @@
+from django.http import FileResponse, HttpResponseNotModified
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from . import render
+from .documents import DOCUMENTS
+
+
+class PrintView(generics.GenericAPIView):
+    """
+    A5 print of a job order, receipt or sales bill.
+
+    GET /api/print/<job-order|receipt|sales-bill>/<id>/?file_format=html|pdf
+    Reprints of an unchanged document are served from the render cache; the
+    cache key doubles as the ETag.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, kind, pk):
+        if kind not in DOCUMENTS:
+            return Response(
+                {'error': f"Unknown document. Allowed: {', '.join(DOCUMENTS)}"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        file_format = request.query_params.get('file_format', 'html')
+        if file_format not in render.PRINT_FORMATS:
+            return Response(
+                {'error': f"Invalid file_format. Allowed: {', '.join(render.PRINT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if file_format == 'pdf' and render.weasyprint is None:
+            return Response(
+                {'error': 'PDF rendering needs the weasyprint package; use file_format=html'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rendered = render.render_document(kind, pk, file_format)
+        if rendered is None:
+            return Response({'error': 'Document not found'}, status=status.HTTP_404_NOT_FOUND)
+        path, _ = rendered
+
+        etag = f'"{path.stem}"'
+        if etag in request.headers.get('If-None-Match', ''):
+            return HttpResponseNotModified(headers={'ETag': etag})
+        response = FileResponse(
+            open(path, 'rb'), content_type=render.PRINT_FORMATS[file_format],
+            filename=f'{kind}-{pk}.{file_format}'
+        )
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
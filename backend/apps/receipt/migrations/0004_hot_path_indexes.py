@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('joborder', '0008_hot_path_indexes'),
+        ('receipt', '0003_alter_receipt_options'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['job_order', 'is_active'], name='receipt_joborder_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['receipt_date'], name='receipt_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['-created_at'], name='receipt_created_idx'),
+        ),
+    ]
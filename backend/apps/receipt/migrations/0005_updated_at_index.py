@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('joborder', '0009_updated_at_index'),
+        ('receipt', '0004_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['updated_at'], name='receipt_updated_idx'),
+        ),
+    ]
@@ -19,4 +19,10 @@ class Receipt(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Receipt'
         verbose_name_plural = 'Receipts'
+        indexes = [
+            models.Index(fields=['job_order', 'is_active'], name='receipt_joborder_active_idx'),
+            models.Index(fields=['receipt_date'], name='receipt_date_idx'),
+            models.Index(fields=['-created_at'], name='receipt_created_idx'),
+            models.Index(fields=['updated_at'], name='receipt_updated_idx'),
+        ]
 
@@ -1,6 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import Receipt
 from apps.joborder.models import JobOrder
+from apps.master.sequences import next_number
 
 
 class ReceiptSerializer(serializers.ModelSerializer):
@@ -30,38 +32,14 @@ class ReceiptSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Override create to auto-generate receipt_id"""
         # Auto-generate receipt_id if not provided
-        if 'receipt_id' not in validated_data or not validated_data['receipt_id']:
-            validated_data['receipt_id'] = self.generate_receipt_id()
-        
-        return super().create(validated_data)
+        with transaction.atomic():
+            if 'receipt_id' not in validated_data or not validated_data['receipt_id']:
+                validated_data['receipt_id'] = self.generate_receipt_id()
+            return super().create(validated_data)
 
     def generate_receipt_id(self):
-        """Generate a unique receipt ID starting from 1"""
-        # Get the last receipt to generate next sequence number
-        last_receipt = Receipt.objects.order_by('-id').first()
-        
-        if last_receipt:
-            # Extract sequence number from last receipt ID and increment
-            try:
-                # Handle both old format (RCP20240115001) and new format (RCP001)
-                if last_receipt.receipt_id.startswith('RCP') and len(last_receipt.receipt_id) > 3:
-                    # Extract the numeric part
-                    numeric_part = last_receipt.receipt_id[3:]
-                    # If it's the old format, get the last 3 digits
-                    if len(numeric_part) > 3:
-                        sequence = int(numeric_part[-3:]) + 1
-                    else:
-                        sequence = int(numeric_part) + 1
-                else:
-                    sequence = 1
-            except (ValueError, IndexError):
-                sequence = 1
-        else:
-            sequence = 1
-        
-        # Format: RCP + 3-digit sequence (e.g., RCP001, RCP002, etc.)
-        receipt_id = f'RCP{sequence:03d}'
-        return receipt_id
+        """Generate a unique receipt ID (RCP001, RCP002, ...) from the receipt sequence"""
+        return next_number('receipt')
 
     def validate_receipt_amount(self, value):
         """Validate receipt amount is positive"""
@@ -107,38 +85,14 @@ class ReceiptCreateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """Override create to auto-generate receipt_id"""
-        # Auto-generate receipt_id
-        validated_data['receipt_id'] = self.generate_receipt_id()
-        
-        return super().create(validated_data)
+        # Auto-generate receipt_id in the insert's transaction
+        with transaction.atomic():
+            validated_data['receipt_id'] = self.generate_receipt_id()
+            return super().create(validated_data)
 
     def generate_receipt_id(self):
-        """Generate a unique receipt ID starting from 1"""
-        # Get the last receipt to generate next sequence number
-        last_receipt = Receipt.objects.order_by('-id').first()
-        
-        if last_receipt:
-            # Extract sequence number from last receipt ID and increment
-            try:
-                # Handle both old format (RCP20240115001) and new format (RCP001)
-                if last_receipt.receipt_id.startswith('RCP') and len(last_receipt.receipt_id) > 3:
-                    # Extract the numeric part
-                    numeric_part = last_receipt.receipt_id[3:]
-                    # If it's the old format, get the last 3 digits
-                    if len(numeric_part) > 3:
-                        sequence = int(numeric_part[-3:]) + 1
-                    else:
-                        sequence = int(numeric_part) + 1
-                else:
-                    sequence = 1
-            except (ValueError, IndexError):
-                sequence = 1
-        else:
-            sequence = 1
-        
-        # Format: RCP + 3-digit sequence (e.g., RCP001, RCP002, etc.)
-        receipt_id = f'RCP{sequence:03d}'
-        return receipt_id
+        """Generate a unique receipt ID (RCP001, RCP002, ...) from the receipt sequence"""
+        return next_number('receipt')
 
     def validate_receipt_amount(self, value):
         """Validate receipt amount is positive"""
@@ -1,3 +1,62 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.crm.models import Customer
+from apps.joborder.models import JobOrder
+from .models import Receipt
 
-# Create your tests here.
+User = get_user_model()
+
+
+class ReceiptExportTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        customer = Customer.objects.create(name='John Doe', phone='1234567890', balance=0)
+        self.job_orders = [
+            JobOrder.objects.create(
+                job_order_number=number,
+                customer=customer,
+                delivery_date='2024-01-15T10:00:00Z',
+                total_amount=100.00,
+                advance_amount=0,
+                balance_amount=100.00
+            )
+            for number in ('JO-0001', 'JO-0002')
+        ]
+        for index, job_order in enumerate(self.job_orders, start=1):
+            Receipt.objects.create(
+                receipt_id=f'RCP00{index}',
+                receipt_date='2024-01-10T10:00:00Z',
+                receipt_amount=50.00,
+                job_order=job_order,
+                receipt_remarks='=HYPERLINK("http://example.com")' if index == 1 else 'Paid -in cash'
+            )
+
+    def export_lines(self, **params):
+        response = self.client.get(reverse('receipt-export'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+
+    def test_export_applies_list_filters(self):
+        """Test the export holds the same receipts as the list for a job_order filter"""
+        job_order = self.job_orders[0]
+        response = self.client.get(reverse('receipt-list'), {'job_order': job_order.id})
+        self.assertEqual(len(response.data['results']), 1)
+
+        lines = self.export_lines(job_order=job_order.id)
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('RCP001,'))
+
+    def test_export_quotes_formula_text(self):
+        """Test CSV text starting like a formula is prefixed with a quote"""
+        lines = self.export_lines(job_order=self.job_orders[0].id)
+        self.assertTrue(lines[1].endswith(',"\'=HYPERLINK(""http://example.com"")"'))
+
+        lines = self.export_lines(job_order=self.job_orders[1].id)
+        self.assertTrue(lines[1].endswith(',Paid -in cash'))
@@ -5,12 +5,17 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.exceptions import ValidationError
-from django.db.models import Q
+from django.utils import timezone
 from .models import Receipt
 from .serializers import ReceiptSerializer, ReceiptCreateSerializer
+from apps.rollups.models import DailyRollup
+from apps.search.query import search_queryset
+from core.export import ExportMixin
+from core.filters import filter_date_range, filter_day_range
+from core.pagination import CreatedAtCursorPagination, PaginatedActionMixin
 
 
-class ReceiptViewSet(viewsets.ModelViewSet):
+class ReceiptViewSet(ExportMixin, PaginatedActionMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing receipts with full CRUD operations.
     
@@ -25,14 +30,26 @@ class ReceiptViewSet(viewsets.ModelViewSet):
     - GET /api/receipts/active/ - Get only active receipts
     - GET /api/receipts/by-job-order/{job_order_id}/ - Get receipts for specific job order
     - GET /api/receipts/today/ - Get today's receipts
+    - GET /api/receipts/export/?file_format=csv|xlsx - Download the filtered receipts
     """
     queryset = Receipt.objects.select_related('job_order', 'job_order__customer').all()
     permission_classes = [IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['is_active', 'job_order', 'receipt_date']
     search_fields = ['receipt_id', 'receipt_remarks', 'job_order__job_order_number', 'job_order__customer__name']
     ordering_fields = ['created_at', 'updated_at', 'receipt_date', 'receipt_amount', 'receipt_id']
-    ordering = ['-created_at']
+    ordering = ['-created_at', '-id']
+    export_name = 'receipts'
+    export_columns = (
+        ('Receipt', 'receipt_id'),
+        ('Date', 'receipt_date'),
+        ('Job Order', 'job_order__job_order_number'),
+        ('Customer', 'job_order__customer__name'),
+        ('Amount', 'receipt_amount'),
+        ('Active', 'is_active'),
+        ('Remarks', 'receipt_remarks'),
+    )
 
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -93,10 +110,7 @@ class ReceiptViewSet(viewsets.ModelViewSet):
         start_date = self.request.query_params.get('start_date', None)
         end_date = self.request.query_params.get('end_date', None)
         
-        if start_date:
-            queryset = queryset.filter(receipt_date__date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(receipt_date__date__lte=end_date)
+        queryset = filter_date_range(queryset, 'receipt_date', start_date, end_date)
             
         return queryset
 
@@ -104,22 +118,15 @@ class ReceiptViewSet(viewsets.ModelViewSet):
     def active(self, request):
         """Get only active receipts"""
         active_receipts = self.get_queryset().filter(is_active=True)
-        serializer = self.get_serializer(active_receipts, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(active_receipts)
 
     @action(detail=False, methods=['get'])
     def search(self, request):
         """Search receipts by receipt_id, job order number, or customer name"""
         query = request.query_params.get('q', '')
         if query:
-            receipts = self.get_queryset().filter(
-                Q(receipt_id__icontains=query) |
-                Q(job_order__job_order_number__icontains=query) |
-                Q(job_order__customer__name__icontains=query) |
-                Q(receipt_remarks__icontains=query)
-            )
-            serializer = self.get_serializer(receipts, many=True)
-            return Response(serializer.data)
+            receipts = search_queryset(self.get_queryset(), 'receipt', query)
+            return self.paginated_response(receipts)
         return Response([])
 
     @action(detail=False, methods=['get'], url_path='by-job-order/(?P<job_order_id>[^/.]+)')
@@ -127,8 +134,7 @@ class ReceiptViewSet(viewsets.ModelViewSet):
         """Get receipts for a specific job order"""
         try:
             receipts = self.get_queryset().filter(job_order_id=job_order_id)
-            serializer = self.get_serializer(receipts, many=True)
-            return Response(serializer.data)
+            return self.paginated_response(receipts)
         except Exception as e:
             return Response(
                 {'error': 'Failed to fetch receipts for job order', 'details': str(e)},
@@ -138,22 +144,24 @@ class ReceiptViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def today(self, request):
         """Get today's receipts"""
-        from datetime import date
-        today = date.today()
-        today_receipts = self.get_queryset().filter(receipt_date__date=today)
-        serializer = self.get_serializer(today_receipts, many=True)
-        return Response(serializer.data)
+        today = timezone.localdate()
+        today_receipts = filter_date_range(self.get_queryset(), 'receipt_date', today, today)
+        return self.paginated_response(today_receipts)
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
         """Get receipt summary statistics"""
-        from django.db.models import Sum, Count
-        from datetime import date, timedelta
+        from django.db.models import Q, Sum
+        from datetime import timedelta
         
-        queryset = self.get_queryset()
+        # Totals come from the daily rollups, whose status is 'active' or 'inactive'
+        queryset = DailyRollup.objects.filter(kind='receipt')
+        is_active = request.query_params.get('is_active')
+        if is_active is not None:
+            queryset = queryset.filter(status='active' if is_active.lower() == 'true' else 'inactive')
         
         # Get date range from query params or default to last 30 days
-        end_date = date.today()
+        end_date = timezone.localdate()
         start_date = end_date - timedelta(days=30)
         
         if request.query_params.get('start_date'):
@@ -162,12 +170,23 @@ class ReceiptViewSet(viewsets.ModelViewSet):
             end_date = request.query_params.get('end_date')
         
         # Filter by date range
-        queryset = queryset.filter(receipt_date__date__range=[start_date, end_date])
+        try:
+            queryset = filter_day_range(queryset, 'date', start_date, end_date, strict=True)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid date format. Use YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         # Calculate summary
-        total_receipts = queryset.count()
-        total_amount = queryset.aggregate(total=Sum('receipt_amount'))['total'] or 0
-        active_receipts = queryset.filter(is_active=True).count()
+        totals = queryset.aggregate(
+            receipts=Sum('count', default=0),
+            total=Sum('total_amount', default=0),
+            active=Sum('count', filter=Q(status='active'), default=0),
+        )
+        total_receipts = totals['receipts']
+        total_amount = totals['total']
+        active_receipts = totals['active']
         
         summary = {
             'total_receipts': total_receipts,
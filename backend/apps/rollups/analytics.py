@@ -0,0 +1,160 @@
+"""
+Vectorized reports with NumPy.
+
+Each report fetches only the columns it needs with values_list and works on
+whole arrays: money is converted to int64 cents by the database (so sums are
+exact), timestamps to epoch seconds, and grouping, histograms and rolling
+windows are single NumPy calls instead of loops over model instances.
+
+NumPy is optional; callers check `np` before using this module.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.db.models import BigIntegerField, F
+from django.db.models.functions import Cast, Round
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SECONDS_PER_DAY = 86400
+
+
+def cents(field):
+    """Expression for a decimal money column as whole cents"""
+    # Round first: SQLite keeps decimals as floats, where 19.99 * 100 is 1998.99...
+    return Cast(Round(F(field) * 100), BigIntegerField())
+
+
+def column_arrays(queryset, *columns, dtypes):
+    """
+    Fetch `columns` (field names or expressions) of a queryset as one array each.
+
+    Expressions are annotated under generated names, so callers can pass
+    cents('total_amount') next to plain fields. A dtype of None returns the
+    column as a tuple of Python values, for callers to convert.
+    """
+    names, annotations = [], {}
+    for index, column in enumerate(columns):
+        if isinstance(column, str):
+            names.append(column)
+        else:
+            names.append(f'_column_{index}')
+            annotations[names[-1]] = column
+    rows = list(queryset.order_by().annotate(**annotations).values_list(*names))
+    columns = zip(*rows) if rows else [()] * len(names)
+    return [
+        np.fromiter(values, dtype=dtype, count=len(rows)) if dtype else values
+        for values, dtype in zip(columns, dtypes)
+    ]
+
+
+def from_cents(value):
+    """Decimal amount of an int64 cents value"""
+    return Decimal(int(value)).scaleb(-2)
+
+
+def grouped_sums(keys, *values):
+    """Distinct keys and, for each values array, the int64 sum per key"""
+    groups, inverse = np.unique(keys, return_inverse=True)
+    sums = []
+    for array in values:
+        total = np.zeros(len(groups), dtype=np.int64)
+        np.add.at(total, inverse, array)
+        sums.append(total)
+    return groups, sums
+
+
+def rolling_mean(values, window):
+    """Trailing mean over `window` points; NaN until the window is full"""
+    result = np.full(len(values), np.nan)
+    if window <= len(values):
+        totals = np.cumsum(np.concatenate(([0], values.astype(np.float64))))
+        result[window - 1:] = (totals[window:] - totals[:-window]) / window
+    return result
+
+
+def revenue_by_material(items, materials):
+    """
+    Quantity and revenue per material of the given job order items, largest first.
+
+    `materials` maps material ids to Material objects for the names.
+    """
+    material_ids, quantities, amounts = column_arrays(
+        items, 'material_id', 'quantity', cents('total_amount'), dtypes=(np.int64, np.int64, np.int64)
+    )
+    groups, (quantity_sums, revenue_sums) = grouped_sums(material_ids, quantities, amounts)
+    total = int(revenue_sums.sum())
+    order = np.argsort(-revenue_sums, kind='stable')
+    return {
+        'total_revenue': from_cents(total),
+        'materials': [
+            {
+                'material': int(groups[index]),
+                'material_name': getattr(materials.get(int(groups[index])), 'name', None),
+                'quantity': int(quantity_sums[index]),
+                'revenue': from_cents(revenue_sums[index]),
+                'share': round(float(revenue_sums[index]) * 100 / total, 2) if total else 0.0,
+            }
+            for index in order
+        ],
+    }
+
+
+def turnaround_distribution(orders, max_days=30, percentiles=(50, 75, 90, 95)):
+    """
+    Days from order creation to delivery date: summary statistics and a
+    histogram of one-day buckets, with orders over `max_days` in the last one.
+    """
+    created, delivery = (
+        np.fromiter((value.timestamp() for value in values), dtype=np.float64, count=len(values))
+        for values in column_arrays(orders, 'created_at', 'delivery_date', dtypes=(None, None))
+    )
+    days = np.clip((delivery - created) / SECONDS_PER_DAY, 0, None)
+    if not len(days):
+        return {'orders': 0, 'mean_days': None, 'percentiles': {}, 'histogram': []}
+
+    counts, _ = np.histogram(np.minimum(days, max_days), bins=np.arange(max_days + 2))
+    return {
+        'orders': int(len(days)),
+        'mean_days': round(float(days.mean()), 2),
+        'percentiles': {
+            f'p{percentile}': round(float(value), 2)
+            for percentile, value in zip(percentiles, np.percentile(days, percentiles))
+        },
+        'histogram': [
+            {'days': day if day < max_days else f'{max_days}+', 'orders': int(count)}
+            for day, count in enumerate(counts)
+        ],
+    }
+
+
+def daily_trend(rollups, start_date, end_date, window=7):
+    """
+    Count and revenue of every day between start_date and end_date from daily
+    rollup rows, with a trailing `window`-day moving average of the revenue.
+    """
+    first = start_date.toordinal()
+    span = end_date.toordinal() - first + 1
+    dates, counts, amounts = column_arrays(
+        rollups, 'date', 'count', cents('total_amount'), dtypes=(None, np.int64, np.int64)
+    )
+    offsets = np.fromiter((day.toordinal() - first for day in dates), dtype=np.int64, count=len(dates))
+
+    daily_counts = np.zeros(span, dtype=np.int64)
+    daily_revenue = np.zeros(span, dtype=np.int64)
+    np.add.at(daily_counts, offsets, counts)
+    np.add.at(daily_revenue, offsets, amounts)
+    moving = rolling_mean(daily_revenue, window)
+
+    return [
+        {
+            'date': date.fromordinal(first + index),
+            'count': int(daily_counts[index]),
+            'revenue': from_cents(daily_revenue[index]),
+            'moving_average': None if np.isnan(moving[index]) else from_cents(round(moving[index])),
+        }
+        for index in range(span)
+    ]
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class RollupsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.rollups'
+
+    def ready(self):
+        # Keep the daily rollups in step with job order, sale and receipt writes
+        from . import signals  # noqa: F401
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.rollups.rollup import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily job order, sale and receipt rollups from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows read and written per query')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counts = rebuild_rollups(batch_size=options['batch_size'])
+        for kind, count in counts.items():
+            self.stdout.write(f"{kind}: {count} rows")
+        self.stdout.write(self.style.SUCCESS('Daily rollups rebuilt'))
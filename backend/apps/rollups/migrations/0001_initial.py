@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('job_order', 'Job Order'), ('sale', 'Sale'), ('receipt', 'Receipt')], max_length=20)),
+                ('date', models.DateField()),
+                ('payment_method', models.CharField(blank=True, default='', max_length=50)),
+                ('status', models.CharField(blank=True, default='', max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('balance_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cash_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('card_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'verbose_name': 'Daily Rollup',
+                'verbose_name_plural': 'Daily Rollups',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'date', 'payment_method', 'status'), name='daily_rollup_unique_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def rollup_existing_rows(apps, schema_editor):
+    from apps.rollups.rollup import rebuild_rollups
+
+    rebuild_rollups(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rollups', '0001_initial'),
+        ('joborder', '0009_updated_at_index'),
+        ('sale', '0005_updated_at_index'),
+        ('receipt', '0005_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(rollup_existing_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import models
+
+
+class DailyRollup(models.Model):
+    """
+    Totals of the job orders, sales or receipts of one day, payment method and status.
+
+    Maintained incrementally by apps.rollups.signals and rebuilt from scratch by
+    the rebuild_rollups command. Receipts have no payment method and use
+    'active'/'inactive' as their status.
+    """
+    KIND_CHOICES = [
+        ('job_order', 'Job Order'),
+        ('sale', 'Sale'),
+        ('receipt', 'Receipt'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    date = models.DateField()
+    payment_method = models.CharField(max_length=50, blank=True, default='')
+    status = models.CharField(max_length=50, blank=True, default='')
+    count = models.IntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    balance_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cash_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    card_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = 'Daily Rollup'
+        verbose_name_plural = 'Daily Rollups'
+        constraints = [
+            # Also serves (kind, date) range scans
+            models.UniqueConstraint(
+                fields=['kind', 'date', 'payment_method', 'status'], name='daily_rollup_unique_key'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.date} {self.payment_method}/{self.status}: {self.count}"
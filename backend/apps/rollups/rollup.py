@@ -0,0 +1,144 @@
+"""
+Daily rollup maintenance.
+
+Every counted job order, sale and receipt contributes one to the count and its
+amounts to the totals of exactly one DailyRollup row, picked by its local day,
+payment method and status. A write moves the object's contribution from the
+row of its previous values to the row of its new ones with F() increments, so
+concurrent writers never overwrite each other's totals.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.apps import apps as django_apps
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+def _day(value):
+    # Values assigned before save may still be ISO strings
+    if isinstance(value, str):
+        value = models.DateTimeField().to_python(value)
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+def _amount(value):
+    return Decimal(str(value or 0))
+
+
+def job_order_rollup(order):
+    """Rollup key and amounts of an active job order, by creation day"""
+    if not order.is_active:
+        return None
+    key = (_day(order.created_at), order.payment_method or '', order.status)
+    return key, {
+        'total_amount': _amount(order.total_amount),
+        'balance_amount': _amount(order.balance_amount),
+        'cash_amount': _amount(order.cash_amount),
+        'card_amount': _amount(order.card_amount),
+    }
+
+
+def sale_rollup(sale):
+    """Rollup key and amounts of an active sale, by sale day"""
+    if not sale.is_active:
+        return None
+    return (_day(sale.date), sale.payment_method or '', sale.status), {'total_amount': _amount(sale.total_amount)}
+
+
+def receipt_rollup(receipt):
+    """Rollup key and amounts of a receipt, by receipt day; inactive receipts are counted apart"""
+    status = 'active' if receipt.is_active else 'inactive'
+    return (_day(receipt.receipt_date), '', status), {'total_amount': _amount(receipt.receipt_amount)}
+
+
+# Rollup kind -> (model, contribution function, fields the function reads)
+ROLLUP_SOURCES = {
+    'job_order': ('joborder.JobOrder', job_order_rollup, [
+        'created_at', 'payment_method', 'status', 'is_active',
+        'total_amount', 'balance_amount', 'cash_amount', 'card_amount',
+    ]),
+    'sale': ('sale.Sale', sale_rollup, ['date', 'payment_method', 'status', 'is_active', 'total_amount']),
+    'receipt': ('receipt.Receipt', receipt_rollup, ['receipt_date', 'is_active', 'receipt_amount']),
+}
+
+MODEL_KINDS = {label: kind for kind, (label, _, _) in ROLLUP_SOURCES.items()}
+
+
+def contribution(kind, instance):
+    """(key, amounts) that `instance` adds to the rollups, or None when it is not counted"""
+    if instance is None:
+        return None
+    return ROLLUP_SOURCES[kind][1](instance)
+
+
+def stored_contribution(kind, pk):
+    """Contribution of the row as currently stored, before a pending save"""
+    label, _, fields = ROLLUP_SOURCES[kind]
+    return contribution(kind, django_apps.get_model(label)._base_manager.filter(pk=pk).only(*fields).first())
+
+
+def _add(deltas, entry, sign):
+    if entry is None:
+        return
+    key, amounts = entry
+    delta = deltas[key]
+    delta['count'] += sign
+    for field, value in amounts.items():
+        delta[field] += sign * value
+
+
+def apply_change(kind, previous, current):
+    """Move one object's contribution from `previous` to `current` (either may be None)"""
+    deltas = defaultdict(lambda: defaultdict(Decimal))
+    _add(deltas, previous, -1)
+    _add(deltas, current, 1)
+    deltas = {key: delta for key, delta in deltas.items() if any(delta.values())}
+    if not deltas:
+        return
+
+    DailyRollup = django_apps.get_model('rollups', 'DailyRollup')
+    with transaction.atomic():
+        # Create missing rows first, then increment, like stock levels
+        DailyRollup.objects.bulk_create(
+            [
+                DailyRollup(kind=kind, date=date, payment_method=payment_method, status=status)
+                for date, payment_method, status in deltas
+            ],
+            ignore_conflicts=True
+        )
+        for (date, payment_method, status), delta in deltas.items():
+            DailyRollup.objects.filter(
+                kind=kind, date=date, payment_method=payment_method, status=status
+            ).update(**{
+                field: F(field) + (int(value) if field == 'count' else value)
+                for field, value in delta.items()
+            })
+
+
+def rebuild_rollups(apps=django_apps, batch_size=2000):
+    """
+    Recompute every rollup row from the source tables.
+
+    `apps` lets data migrations pass their historical app registry. Returns the
+    number of rows written per kind.
+    """
+    DailyRollup = apps.get_model('rollups', 'DailyRollup')
+    DailyRollup.objects.all().delete()
+    counts = {}
+    for kind, (label, rollup, fields) in ROLLUP_SOURCES.items():
+        totals = defaultdict(lambda: defaultdict(Decimal))
+        for instance in apps.get_model(label)._base_manager.order_by().only(*fields).iterator(chunk_size=batch_size):
+            _add(totals, rollup(instance), 1)
+        DailyRollup.objects.bulk_create(
+            [
+                DailyRollup(
+                    kind=kind, date=date, payment_method=payment_method, status=status,
+                    count=int(values.pop('count')), **values
+                )
+                for (date, payment_method, status), values in totals.items()
+            ],
+            batch_size=batch_size
+        )
+        counts[kind] = len(totals)
+    return counts
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .rollup import MODEL_KINDS, apply_change, contribution, stored_contribution
+
+
+def _kind(sender):
+    return MODEL_KINDS[sender._meta.label]
+
+
+def remember_contribution(sender, instance, raw=False, **kwargs):
+    """Read what a row contributed before it is overwritten"""
+    kind = _kind(sender)
+    instance._rollup_previous = stored_contribution(kind, instance.pk) if instance.pk else None
+
+
+def update_rollups(sender, instance, **kwargs):
+    """Move a saved row's contribution to the rollup of its new values"""
+    kind = _kind(sender)
+    apply_change(kind, getattr(instance, '_rollup_previous', None), contribution(kind, instance))
+    instance._rollup_previous = None
+
+
+def remove_from_rollups(sender, instance, **kwargs):
+    """Take a deleted row's contribution out of the rollups"""
+    kind = _kind(sender)
+    apply_change(kind, contribution(kind, instance), None)
+
+
+for label in MODEL_KINDS:
+    pre_save.connect(remember_contribution, sender=label)
+    post_save.connect(update_rollups, sender=label)
+    post_delete.connect(remove_from_rollups, sender=label)
@@ -0,0 +1,149 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import skipIf
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.crm.models import Customer
+from apps.joborder.models import JobOrder, jobOrderItem
+from apps.materials.models import Material
+from apps.receipt.models import Receipt
+from apps.sale.models import Sale
+from .analytics import np
+from .models import DailyRollup
+from .rollup import rebuild_rollups
+
+User = get_user_model()
+
+
+class RollupAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.customer = Customer.objects.create(name='Ahmed Ali', phone='0551234567', balance=0)
+
+    def create_order(self, number, order_status='pending', method='cash', total=100):
+        return JobOrder.objects.create(
+            job_order_number=number,
+            customer=self.customer,
+            status=order_status,
+            payment_method=method,
+            delivery_date='2024-01-15T10:00:00Z',
+            total_amount=total,
+            advance_amount=40,
+            balance_amount=total - 40
+        )
+
+    def rollups(self, kind):
+        return {
+            (row.date, row.payment_method, row.status): (row.count, row.total_amount, row.balance_amount)
+            for row in DailyRollup.objects.filter(kind=kind).exclude(count=0)
+        }
+
+
+class DailyRollupTestCase(RollupAPITestCase):
+    def test_writes_update_rollups_incrementally(self):
+        """Test saves, status changes, soft deletes and deletes keep rollups equal to a rebuild"""
+        first = self.create_order('JO-1')
+        second = self.create_order('JO-2', total=250)
+        self.create_order('JO-3', method='card')
+        day = first.created_at.date()
+        self.assertEqual(self.rollups('job_order')[(day, 'cash', 'pending')], (2, Decimal('350'), Decimal('270')))
+
+        second.status = 'delivered'
+        second.save()
+        first.is_active = False
+        first.save()
+        Sale.objects.create(customer_name='Walk-in', amount=80, total_amount=80, payment_method='cash')
+        receipt = Receipt.objects.create(
+            receipt_id='RCP001', receipt_date='2024-01-15T10:00:00Z', receipt_amount=50, job_order=second
+        )
+        Receipt.objects.create(receipt_id='RCP002', receipt_date='2024-01-15T12:00:00Z', receipt_amount=30, job_order=second)
+        receipt.delete()
+
+        incremental = {kind: self.rollups(kind) for kind in ('job_order', 'sale', 'receipt')}
+        self.assertEqual(incremental['job_order'][(day, 'cash', 'delivered')], (1, Decimal('250'), Decimal('210')))
+        self.assertNotIn((day, 'cash', 'pending'), incremental['job_order'])
+
+        rebuild_rollups()
+        self.assertEqual({kind: self.rollups(kind) for kind in incremental}, incremental)
+
+    def test_stats_and_reports_read_rollups(self):
+        """Test the job order stats, receipt summary and monthly report are served from rollups"""
+        order = self.create_order('JO-1')
+        self.create_order('JO-2', order_status='delivered', method='card')
+        Receipt.objects.create(receipt_id='RCP001', receipt_date='2024-01-15T10:00:00Z', receipt_amount=50, job_order=order)
+        Receipt.objects.create(
+            receipt_id='RCP002', receipt_date='2024-02-03T10:00:00Z', receipt_amount=20, job_order=order, is_active=False
+        )
+
+        # Rollups are the only source for the stats from here on
+        JobOrder.objects.all().update(total_amount=0)
+        response = self.client.get(reverse('joborder-stats'), {'group_by': 'payment_method'})
+        self.assertEqual(response.data['total_orders'], 2)
+        self.assertEqual(response.data['total_revenue'], Decimal('200'))
+        self.assertEqual([row['group'] for row in response.data['breakdowns']['payment_method']], ['card', 'cash'])
+
+        response = self.client.get(reverse('receipt-summary'), {'start_date': '2024-01-01', 'end_date': '2024-02-29'})
+        self.assertEqual(response.data['total_receipts'], 2)
+        self.assertEqual(response.data['inactive_receipts'], 1)
+        self.assertEqual(response.data['total_amount'], 70.0)
+
+        response = self.client.get(reverse('rollup-report', kwargs={'kind': 'receipts'}), {'period': 'month'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['count'] for row in response.data['results']], [1, 1])
+
+        response = self.client.get(reverse('rollup-report', kwargs={'kind': 'receipts'}), {'period': 'week'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@skipIf(np is None, 'NumPy is not installed')
+class AnalyticsReportTestCase(RollupAPITestCase):
+    def create_material(self, name):
+        return Material.objects.create(
+            name=name, price=10, thool=0, kethet=0, thool_kum=0, ardh_f_kum=0, jamba=0, ragab=0
+        )
+
+    def test_material_revenue_and_turnaround(self):
+        """Test revenue is summed exactly per material and turnaround is bucketed by day"""
+        cotton, wool = self.create_material('Cotton'), self.create_material('Wool')
+        first, second = self.create_order('JO-1'), self.create_order('JO-2')
+        for order, material, amount in [(first, cotton, '19.99'), (second, cotton, '0.01'), (second, wool, '5.10')]:
+            jobOrderItem.objects.create(job_order=order, material=material, quantity=2, fees=amount, total_amount=amount)
+        JobOrder.objects.filter(pk=first.pk).update(delivery_date=first.created_at + timedelta(days=3, hours=1))
+        JobOrder.objects.filter(pk=second.pk).update(delivery_date=second.created_at + timedelta(days=40))
+
+        response = self.client.get(reverse('report-material-revenue'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_revenue'], Decimal('25.10'))
+        self.assertEqual(
+            [(row['material_name'], row['quantity'], row['revenue']) for row in response.data['materials']],
+            [('Cotton', 4, Decimal('20.00')), ('Wool', 2, Decimal('5.10'))]
+        )
+
+        response = self.client.get(reverse('report-turnaround'), {'max_days': 10})
+        self.assertEqual(response.data['orders'], 2)
+        histogram = {row['days']: row['orders'] for row in response.data['histogram']}
+        self.assertEqual((histogram[3], histogram['10+']), (1, 1))
+
+    def test_daily_trend_fills_days_and_averages(self):
+        """Test the trend has a row per day and a moving average once the window is full"""
+        order = self.create_order('JO-1', total=300)
+        today = order.created_at.date()
+        response = self.client.get(reverse('report-daily-trend'), {
+            'from_date': (today - timedelta(days=2)).isoformat(), 'to_date': today.isoformat(), 'window': 3,
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['revenue'] for row in response.data['days']], [0, 0, Decimal('300')])
+        self.assertEqual([row['moving_average'] for row in response.data['days']], [None, None, Decimal('100')])
+
+        response = self.client.get(reverse('report-daily-trend'), {'window': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(reverse('report-daily-trend'), {'from_date': '2020-01-01', 'to_date': '2024-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('analytics/material-revenue/', views.MaterialRevenueReportView.as_view(), name='report-material-revenue'),
+    path('analytics/turnaround/', views.TurnaroundReportView.as_view(), name='report-turnaround'),
+    path('analytics/daily-trend/', views.DailyTrendReportView.as_view(), name='report-daily-trend'),
+    path('<slug:kind>/', views.RollupReportView.as_view(), name='rollup-report'),
+]
@@ -0,0 +1,150 @@
+from datetime import timedelta
+
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth, TruncYear
+from django.utils import timezone
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.joborder.models import JobOrder, jobOrderItem
+from apps.materials.models import Material
+from core.filters import filter_date_range, filter_day_range, parse_date
+from . import analytics
+from .models import DailyRollup
+
+
+# URL name -> DailyRollup kind
+REPORT_KINDS = {
+    'job-orders': 'job_order',
+    'sales': 'sale',
+    'receipts': 'receipt',
+}
+
+REPORT_PERIODS = {
+    'day': F('date'),
+    'month': TruncMonth('date'),
+    'year': TruncYear('date'),
+}
+
+REPORT_GROUPINGS = ('payment_method', 'status')
+
+
+class RollupReportView(generics.GenericAPIView):
+    """Job order, sale or receipt totals per day, month or year, read from the daily rollups"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, kind):
+        if kind not in REPORT_KINDS:
+            return Response(
+                {'error': f"Unknown report. Allowed: {', '.join(REPORT_KINDS)}"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        period = request.query_params.get('period', 'day')
+        group_by = [key for key in request.query_params.get('group_by', '').split(',') if key]
+        if period not in REPORT_PERIODS or any(key not in REPORT_GROUPINGS for key in group_by):
+            return Response(
+                {'error': f"period must be one of {', '.join(REPORT_PERIODS)}; "
+                          f"group_by may list {', '.join(REPORT_GROUPINGS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = DailyRollup.objects.filter(kind=REPORT_KINDS[kind])
+        try:
+            queryset = filter_day_range(
+                queryset, 'date',
+                request.query_params.get('from_date'), request.query_params.get('to_date'),
+                strict=True
+            )
+        except ValueError:
+            return Response(
+                {'error': 'Invalid date format. Use YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rows = (
+            queryset.annotate(period=REPORT_PERIODS[period])
+            .values('period', *group_by)
+            .annotate(
+                count=Sum('count'),
+                total_amount=Sum('total_amount'),
+                balance_amount=Sum('balance_amount'),
+                cash_amount=Sum('cash_amount'),
+                card_amount=Sum('card_amount'),
+            )
+            .order_by('period', *group_by)
+        )
+        return Response({'kind': kind, 'period': period, 'results': list(rows)})
+
+
+class AnalyticsReportView(generics.GenericAPIView):
+    """Base of the NumPy reports over from_date..to_date (default: the last 30 days, at most max_span_days)"""
+    permission_classes = [IsAuthenticated]
+    default_days = 30
+    max_span_days = 366
+
+    def get(self, request):
+        if analytics.np is None:
+            return Response(
+                {'error': 'This report needs NumPy, which is not installed'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        end_date = timezone.localdate()
+        start_date = end_date - timedelta(days=self.default_days)
+        try:
+            if request.query_params.get('from_date'):
+                start_date = parse_date(request.query_params['from_date'])
+            if request.query_params.get('to_date'):
+                end_date = parse_date(request.query_params['to_date'])
+            if (end_date - start_date).days > self.max_span_days:
+                raise ValueError(f'The date range may span at most {self.max_span_days} days')
+            report = self.build_report(request, start_date, end_date)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'date_range': {'start_date': start_date, 'end_date': end_date}, **report})
+
+    def build_report(self, request, start_date, end_date):
+        """Return the report's fields; raise ValueError for invalid parameters"""
+        raise NotImplementedError
+
+
+class MaterialRevenueReportView(AnalyticsReportView):
+    """Quantity and revenue per material of the job orders created in the range"""
+
+    def build_report(self, request, start_date, end_date):
+        items = jobOrderItem.objects.filter(is_active=True, job_order__is_active=True)
+        items = filter_date_range(items, 'job_order__created_at', start_date, end_date)
+        materials = Material.objects.filter(pk__in=items.values('material_id')).in_bulk()
+        return analytics.revenue_by_material(items, materials)
+
+
+class TurnaroundReportView(AnalyticsReportView):
+    """Distribution of days from creation to delivery date of the job orders created in the range"""
+
+    def build_report(self, request, start_date, end_date):
+        max_days = int(request.query_params.get('max_days', 30))
+        if not 1 <= max_days <= 365:
+            raise ValueError('max_days must be between 1 and 365')
+        orders = filter_date_range(JobOrder.objects.filter(is_active=True), 'created_at', start_date, end_date)
+        if request.query_params.get('status'):
+            orders = orders.filter(status=request.query_params['status'])
+        return analytics.turnaround_distribution(orders, max_days=max_days)
+
+
+class DailyTrendReportView(AnalyticsReportView):
+    """Daily count and revenue of job orders, sales or receipts with a moving average"""
+
+    def build_report(self, request, start_date, end_date):
+        kind = request.query_params.get('kind', 'job-orders')
+        window = int(request.query_params.get('window', 7))
+        if kind not in REPORT_KINDS:
+            raise ValueError(f"kind must be one of {', '.join(REPORT_KINDS)}")
+        if not 1 <= window <= 90:
+            raise ValueError('window must be between 1 and 90')
+        if start_date > end_date:
+            raise ValueError('from_date must not be after to_date')
+
+        rollups = filter_day_range(DailyRollup.objects.filter(kind=REPORT_KINDS[kind]), 'date', start_date, end_date)
+        if kind == 'receipts':
+            rollups = rollups.filter(status='active')
+        return {'kind': kind, 'window': window, 'days': analytics.daily_trend(rollups, start_date, end_date, window)}
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sale', '0003_merge_20251009_1117'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['date'], name='sale_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['-created_at'], name='sale_created_idx'),
+        ),
+    ]
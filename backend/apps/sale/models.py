@@ -1,8 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from apps.inventory.models import Item
-import random
-import string
+from apps.master.sequences import next_number
 
 # Create your models here.
 class Sale(models.Model):
@@ -19,21 +18,23 @@ class Sale(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date'], name='sale_date_idx'),
+            models.Index(fields=['-created_at'], name='sale_created_idx'),
+            models.Index(fields=['updated_at'], name='sale_updated_idx'),
+        ]
+
     def save(self, *args, **kwargs):
-        # Generate sale number if it's empty or null
-        if not self.sale_number:
-            self.sale_number = self.generate_sale_number()
-        super().save(*args, **kwargs)
+        # Generate sale number if it's empty or null, in the insert's transaction
+        with transaction.atomic():
+            if not self.sale_number:
+                self.sale_number = self.generate_sale_number()
+            super().save(*args, **kwargs)
 
     def generate_sale_number(self):
-        """Generate a unique sale number"""
-        while True:
-            # Generate a 6-digit random number with prefix 'SALE-'
-            sale_number = 'SALE-' + ''.join(random.choices(string.digits, k=6))
-            
-            # Check if this sale number already exists
-            if not Sale.objects.filter(sale_number=sale_number).exists():
-                return sale_number
+        """Generate a unique sale number from the sale sequence"""
+        return next_number('sale')
 
     def __str__(self):
         return self.sale_number
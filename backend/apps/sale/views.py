@@ -6,12 +6,26 @@ from django.utils import timezone
 from .models import Sale, SaleItem
 from .serializers import SaleSerializer, SaleListSerializer, SaleItemSerializer
 from apps.inventory.models import Item
-import random
-import string
+from core.export import ExportMixin
+from core.filters import filter_date_range
+from core.pagination import CreatedAtCursorPagination, PaginatedActionMixin
 
-class SaleViewSet(viewsets.ModelViewSet):
+class SaleViewSet(ExportMixin, PaginatedActionMixin, viewsets.ModelViewSet):
     queryset = Sale.objects.all().order_by('-created_at')
     serializer_class = SaleSerializer
+    pagination_class = CreatedAtCursorPagination
+    export_name = 'sales'
+    export_columns = (
+        ('Sale', 'sale_number'),
+        ('Date', 'date'),
+        ('Customer', 'customer_name'),
+        ('Payment Method', 'payment_method'),
+        ('Status', 'status'),
+        ('Amount', 'amount'),
+        ('Total', 'total_amount'),
+        ('Active', 'is_active'),
+        ('Notes', 'notes'),
+    )
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -35,52 +49,17 @@ class SaleViewSet(viewsets.ModelViewSet):
         start_date = self.request.query_params.get('start_date')
         end_date = self.request.query_params.get('end_date')
         
-        if start_date:
-            try:
-                from datetime import datetime
-                start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-                queryset = queryset.filter(date__date__gte=start_date_obj)
-            except ValueError:
-                pass  # Invalid date format, ignore the filter
-        
-        if end_date:
-            try:
-                from datetime import datetime
-                end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-                queryset = queryset.filter(date__date__lte=end_date_obj)
-            except ValueError:
-                pass  # Invalid date format, ignore the filter
+        queryset = filter_date_range(queryset, 'date', start_date, end_date)
         
         return queryset
     
-    def generate_sale_number(self):
-        """Generate a unique sale number"""
-        while True:
-            # Generate a 6-digit random number with prefix 'SALE-'
-            sale_number = 'SALE-' + ''.join(random.choices(string.digits, k=6))
-            
-            # Check if this sale number already exists
-            if not Sale.objects.filter(sale_number=sale_number).exists():
-                return sale_number
-    
-    def perform_create(self, serializer):
-        # Generate automatic sale number
-        sale_number = self.generate_sale_number()
-        serializer.save(sale_number=sale_number)
-    
     def create(self, request, *args, **kwargs):
         """Create a new sale with automatic sale number generation"""
         try:
             with transaction.atomic():
-                # Generate sale number
-                sale_number = self.generate_sale_number()
-                
-                # Prepare data
-                data = request.data.copy()
-                data['sale_number'] = sale_number
-                
-                # Validate and create sale using serializer's create method
-                serializer = self.get_serializer(data=data)
+                # Validate and create sale using serializer's create method;
+                # Sale.save() allocates the sale number
+                serializer = self.get_serializer(data=request.data)
                 serializer.is_valid(raise_exception=True)
                 sale = serializer.save()
                 
@@ -229,8 +208,7 @@ class SaleViewSet(viewsets.ModelViewSet):
             )
         
         sales = Sale.objects.filter(customer_name__icontains=customer_name)
-        serializer = self.get_serializer(sales, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(sales)
     
     @action(detail=False, methods=['get'])
     def by_date_range(self, request):
@@ -245,13 +223,8 @@ class SaleViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            from datetime import datetime
-            start_date = datetime.strptime(start_date, '%Y-%m-%d')
-            end_date = datetime.strptime(end_date, '%Y-%m-%d')
-            
-            sales = Sale.objects.filter(date__date__range=[start_date.date(), end_date.date()])
-            serializer = self.get_serializer(sales, many=True)
-            return Response(serializer.data)
+            sales = filter_date_range(Sale.objects.all(), 'date', start_date, end_date, strict=True)
+            return self.paginated_response(sales)
             
         except ValueError:
             return Response(
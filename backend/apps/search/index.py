@@ -0,0 +1,109 @@
+"""
+Search index maintenance.
+
+Each indexed object has one SearchEntry row holding its searchable values as a
+single string folded with core.text.search_key. Entries are rebuilt from one
+values_list query per batch and written with an upsert, so indexing cost does
+not depend on how many related rows the search used to join at query time.
+"""
+import re
+
+from django.apps import apps as django_apps
+
+from core.text import search_key
+
+
+# Search kind -> (model, fields whose values make up the entry content)
+SEARCH_SOURCES = {
+    'customer': ('crm.Customer', ['customer_id', 'name', 'phone']),
+    'job_order': ('joborder.JobOrder', [
+        'job_order_number', 'customer__customer_id', 'customer__name', 'customer__phone',
+    ]),
+    'receipt': ('receipt.Receipt', [
+        'receipt_id', 'job_order__job_order_number', 'job_order__customer__customer_id',
+        'job_order__customer__name', 'job_order__customer__phone', 'receipt_remarks',
+    ]),
+}
+
+PHONE_PATTERN = re.compile(r'[\d\s+\-()]+')
+
+
+def build_content(values):
+    """Join the searchable values of one object into its entry content"""
+    terms = []
+    for value in values:
+        if value in (None, ''):
+            continue
+        text = search_key(value)
+        terms.append(text)
+        # Also index phone numbers without separators so "0551234" finds "055 123 4"
+        if PHONE_PATTERN.fullmatch(text):
+            digits = re.sub(r'\D', '', text)
+            if digits != text:
+                terms.append(digits)
+    return ' '.join(terms)
+
+
+def indexed_fields(kind):
+    """Model fields that an entry of this kind depends on directly"""
+    return {field.split('__')[0] for field in SEARCH_SOURCES[kind][1]}
+
+
+def _upsert(SearchEntry, entries):
+    SearchEntry.objects.bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['content']
+    )
+
+
+def _write_batch(SearchEntry, kind, batch):
+    """Upsert the entries of a batch whose content changed; return how many did"""
+    existing = dict(
+        SearchEntry.objects.filter(kind=kind, object_id__in=batch).values_list('object_id', 'content')
+    )
+    changed = [
+        SearchEntry(kind=kind, object_id=object_id, content=content)
+        for object_id, content in batch.items()
+        if existing.get(object_id) != content
+    ]
+    if changed:
+        _upsert(SearchEntry, changed)
+    return len(changed)
+
+
+def index_objects(kind, apps=django_apps, batch_size=1000, **filters):
+    """
+    (Re)build the entries of every object of `kind` matching `filters`.
+
+    `apps` lets data migrations pass their historical app registry. Returns the
+    number of entries whose content changed.
+    """
+    model_label, fields = SEARCH_SOURCES[kind]
+    model = apps.get_model(model_label)
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+
+    rows = model._base_manager.filter(**filters).order_by().values_list('pk', *fields)
+    changed = 0
+    batch = {}
+    for row in rows.iterator(chunk_size=batch_size):
+        batch[row[0]] = build_content(row[1:])
+        if len(batch) >= batch_size:
+            changed += _write_batch(SearchEntry, kind, batch)
+            batch = {}
+    if batch:
+        changed += _write_batch(SearchEntry, kind, batch)
+    return changed
+
+
+def remove_objects(kind, object_ids):
+    """Delete the entries of deleted objects"""
+    SearchEntry = django_apps.get_model('search', 'SearchEntry')
+    SearchEntry.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def rebuild_index(apps=django_apps, batch_size=1000):
+    """Drop every entry and index all customers, job orders and receipts again"""
+    apps.get_model('search', 'SearchEntry').objects.all().delete()
+    return {kind: index_objects(kind, apps=apps, batch_size=batch_size) for kind in SEARCH_SOURCES}
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.search.index import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the customer, job order and receipt search index from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Objects indexed per query')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counts = rebuild_index(batch_size=options['batch_size'])
+        for kind, count in counts.items():
+            self.stdout.write(f"{kind}: {count} entries")
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
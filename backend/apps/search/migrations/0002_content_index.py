@@ -0,0 +1,81 @@
+from django.db import migrations, transaction
+from django.db.utils import OperationalError
+
+
+POSTGRES_SQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS search_entry_content_trgm ON search_searchentry USING gin (content gin_trgm_ops)',
+]
+POSTGRES_REVERSE_SQL = [
+    'DROP INDEX IF EXISTS search_entry_content_trgm',
+]
+
+# External-content FTS5 table kept in sync with search_searchentry by triggers
+SQLITE_SQL = [
+    "CREATE VIRTUAL TABLE search_searchentry_fts USING fts5("
+    "content, content='search_searchentry', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER search_searchentry_fts_insert AFTER INSERT ON search_searchentry BEGIN "
+    "INSERT INTO search_searchentry_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER search_searchentry_fts_delete AFTER DELETE ON search_searchentry BEGIN "
+    "INSERT INTO search_searchentry_fts(search_searchentry_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER search_searchentry_fts_update AFTER UPDATE ON search_searchentry BEGIN "
+    "INSERT INTO search_searchentry_fts(search_searchentry_fts, rowid, content) "
+    "VALUES ('delete', old.id, old.content); "
+    "INSERT INTO search_searchentry_fts(rowid, content) VALUES (new.id, new.content); END",
+]
+SQLITE_REVERSE_SQL = [
+    'DROP TRIGGER IF EXISTS search_searchentry_fts_insert',
+    'DROP TRIGGER IF EXISTS search_searchentry_fts_delete',
+    'DROP TRIGGER IF EXISTS search_searchentry_fts_update',
+    'DROP TABLE IF EXISTS search_searchentry_fts',
+]
+
+
+def create_content_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        for sql in POSTGRES_SQL:
+            schema_editor.execute(sql)
+    elif connection.vendor == 'sqlite':
+        try:
+            with transaction.atomic(using=connection.alias):
+                for sql in SQLITE_SQL:
+                    schema_editor.execute(sql)
+        except OperationalError:
+            # SQLite built without FTS5 or the trigram tokenizer (< 3.34): search
+            # falls back to substring matching on search_searchentry.
+            pass
+
+
+def drop_content_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        statements = POSTGRES_REVERSE_SQL
+    elif connection.vendor == 'sqlite':
+        statements = SQLITE_REVERSE_SQL
+    else:
+        return
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def index_existing_objects(apps, schema_editor):
+    from apps.search.index import rebuild_index
+
+    rebuild_index(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('crm', '0002_hot_path_indexes'),
+        ('joborder', '0008_hot_path_indexes'),
+        ('receipt', '0004_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_content_index, drop_content_index),
+        migrations.RunPython(index_existing_objects, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def reindex(apps, schema_editor):
+    from apps.search.index import rebuild_index
+
+    rebuild_index(apps=apps)
+
+
+class Migration(migrations.Migration):
+    """Rebuild entries with content folded by core.text.search_key"""
+
+    dependencies = [
+        ('search', '0002_content_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(reindex, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+    Searchable text of one customer, job order or receipt.
+
+    The content column is indexed with pg_trgm (GIN) on PostgreSQL and mirrored
+    into the search_searchentry_fts FTS5 table on SQLite; see migration 0002.
+    """
+    KIND_CHOICES = [
+        ('customer', 'Customer'),
+        ('job_order', 'Job Order'),
+        ('receipt', 'Receipt'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    content = models.TextField()
+
+    class Meta:
+        verbose_name = 'Search Entry'
+        verbose_name_plural = 'Search Entries'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_entry_unique_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.content}"
@@ -0,0 +1,91 @@
+"""
+Ranked search over the search index.
+
+PostgreSQL matches entries with substring and trigram word-similarity predicates
+served by the GIN pg_trgm index and ranks them by word similarity. SQLite
+matches them through the FTS5 trigram table and ranks them by bm25. Terms
+shorter than a trigram (and SQLite builds without FTS5) fall back to a substring
+scan of the single search table.
+"""
+from django.db import connections, router
+from django.db.models import FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.expressions import RawSQL
+
+from core.text import search_key
+
+from .models import SearchEntry
+
+
+MIN_TRIGRAM_LENGTH = 3
+FTS_TABLE = 'search_searchentry_fts'
+
+_fts_tables = {}
+
+
+def fts_enabled(connection):
+    """Whether the FTS5 table was created for this database (cached per alias)"""
+    if connection.alias not in _fts_tables:
+        _fts_tables[connection.alias] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_tables[connection.alias]
+
+
+def _orm_match(entries, rank):
+    """(matching object ids, rank of the outer row) expressions over a filtered SearchEntry queryset"""
+    ids = entries.values('object_id')
+    if rank is None:
+        return ids, Value(0.0, output_field=FloatField())
+    ranked = entries.filter(object_id=OuterRef('pk')).annotate(rank=rank).values('rank')[:1]
+    return ids, Subquery(ranked, output_field=FloatField())
+
+
+def _trigram_match(kind, term):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    entries = SearchEntry.objects.filter(kind=kind).filter(
+        Q(content__contains=term) | Q(content__trigram_word_similar=term)
+    )
+    return _orm_match(entries, TrigramWordSimilarity(term, 'content'))
+
+
+def _fts_match(connection, kind, term, model):
+    # A quoted FTS5 string is a phrase, which the trigram tokenizer matches as a substring
+    phrase = '"' + term.replace('"', '""') + '"'
+    source = (
+        f"FROM {FTS_TABLE} JOIN {SearchEntry._meta.db_table} AS entry ON entry.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s AND entry.kind = %s"
+    )
+    outer_pk = f"{connection.ops.quote_name(model._meta.db_table)}.{connection.ops.quote_name(model._meta.pk.column)}"
+    ids = RawSQL(f"SELECT entry.object_id {source}", [phrase, kind])
+    rank = RawSQL(
+        f"SELECT -bm25({FTS_TABLE}) {source} AND entry.object_id = {outer_pk}",
+        [phrase, kind],
+        output_field=FloatField()
+    )
+    return ids, rank
+
+
+def _substring_match(kind, term):
+    return _orm_match(SearchEntry.objects.filter(kind=kind, content__contains=term), None)
+
+
+def search_queryset(queryset, kind, query):
+    """
+    Restrict a queryset to the objects whose search entry matches the query and
+    annotate their `search_rank`, which the cursor paginators order by.
+
+    The match is a subquery of the queryset's own query, so the caller's
+    filters (status, is_active, dates) apply to every match, not only to a
+    pre-selected best few.
+    """
+    term = search_key(query)
+    if not term:
+        return queryset.none()
+
+    connection = connections[router.db_for_read(SearchEntry)]
+    if len(term) >= MIN_TRIGRAM_LENGTH and connection.vendor == 'postgresql':
+        ids, rank = _trigram_match(kind, term)
+    elif len(term) >= MIN_TRIGRAM_LENGTH and connection.vendor == 'sqlite' and fts_enabled(connection):
+        ids, rank = _fts_match(connection, kind, term, queryset.model)
+    else:
+        ids, rank = _substring_match(kind, term)
+    return queryset.filter(pk__in=ids).annotate(search_rank=rank)
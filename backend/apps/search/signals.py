@@ -0,0 +1,49 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .index import index_objects, indexed_fields, remove_objects
+
+
+def _affects_index(kind, update_fields):
+    return update_fields is None or bool(indexed_fields(kind) & set(update_fields))
+
+
+@receiver(post_save, sender='crm.Customer')
+def index_customer(sender, instance, created, update_fields=None, **kwargs):
+    """Index a saved customer, and its orders and receipts when its searchable values changed"""
+    if not _affects_index('customer', update_fields):
+        return
+    if index_objects('customer', pk=instance.pk) and not created:
+        index_objects('job_order', customer_id=instance.pk)
+        index_objects('receipt', job_order__customer_id=instance.pk)
+
+
+@receiver(post_save, sender='joborder.JobOrder')
+def index_job_order(sender, instance, created, update_fields=None, **kwargs):
+    """Index a saved job order, and its receipts when its searchable values changed"""
+    if not _affects_index('job_order', update_fields):
+        return
+    if index_objects('job_order', pk=instance.pk) and not created:
+        index_objects('receipt', job_order_id=instance.pk)
+
+
+@receiver(post_save, sender='receipt.Receipt')
+def index_receipt(sender, instance, update_fields=None, **kwargs):
+    """Index a saved receipt"""
+    if _affects_index('receipt', update_fields):
+        index_objects('receipt', pk=instance.pk)
+
+
+@receiver(post_delete, sender='crm.Customer')
+def remove_customer(sender, instance, **kwargs):
+    remove_objects('customer', [instance.pk])
+
+
+@receiver(post_delete, sender='joborder.JobOrder')
+def remove_job_order(sender, instance, **kwargs):
+    remove_objects('job_order', [instance.pk])
+
+
+@receiver(post_delete, sender='receipt.Receipt')
+def remove_receipt(sender, instance, **kwargs):
+    remove_objects('receipt', [instance.pk])
@@ -0,0 +1,122 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.crm.models import Customer
+from apps.joborder.models import JobOrder
+from apps.receipt.models import Receipt
+from .models import SearchEntry
+from .query import FTS_TABLE, fts_enabled, search_queryset
+
+User = get_user_model()
+
+
+class SearchIndexTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='testpass123'
+        )
+        self.customer = Customer.objects.create(
+            customer_id='CUST001',
+            name='Mohammed Saleh',
+            phone='055 123 4567',
+            balance=0
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_order(self, number, customer=None):
+        return JobOrder.objects.create(
+            job_order_number=number,
+            customer=customer or self.customer,
+            status='pending',
+            delivery_date='2024-01-15T10:00:00Z',
+            total_amount=100.00,
+            advance_amount=0,
+            balance_amount=100.00
+        )
+
+    def test_entries_follow_saves_and_deletes(self):
+        """Test entries are written on save and refreshed when the customer changes"""
+        order = self.create_order('JO-0001')
+        receipt = Receipt.objects.create(
+            receipt_id='RCP001',
+            receipt_date='2024-01-15T10:00:00Z',
+            receipt_amount=50,
+            job_order=order
+        )
+        entry = SearchEntry.objects.get(kind='job_order', object_id=order.id)
+        self.assertEqual(entry.content, 'jo-0001 cust001 mohamed saleh 055 123 4567 0551234567')
+
+        self.customer.name = 'Ahmed Saleh'
+        self.customer.save()
+        self.assertIn('ahmed saleh', SearchEntry.objects.get(kind='job_order', object_id=order.id).content)
+        self.assertIn('ahmed saleh', SearchEntry.objects.get(kind='receipt', object_id=receipt.id).content)
+
+        order.delete()
+        self.assertFalse(SearchEntry.objects.filter(kind__in=['job_order', 'receipt']).exists())
+
+    def test_search_uses_fts_table_on_sqlite(self):
+        """Test SQLite searches are answered from the FTS5 trigram table"""
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        self.assertTrue(fts_enabled(connection))
+        order = self.create_order('JO-0001')
+        with CaptureQueriesContext(connection) as queries:
+            found = list(search_queryset(JobOrder.objects.all(), 'job_order', '1234567').values_list('pk', flat=True))
+        self.assertEqual(found, [order.id])
+        self.assertIn(FTS_TABLE, queries[0]['sql'])
+        self.assertFalse(search_queryset(JobOrder.objects.all(), 'job_order', 'nobody').exists())
+
+    def test_job_order_search_is_ranked(self):
+        """Test job order search returns the closest match first"""
+        other = Customer.objects.create(
+            customer_id='CUST002',
+            name='Saleh Saleh Saleh',
+            phone='0500000000',
+            balance=0
+        )
+        first = self.create_order('JO-0001')
+        second = self.create_order('JO-0002', customer=other)
+
+        response = self.client.get(reverse('joborder-list'), {'search': 'saleh'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [order['id'] for order in response.data['results']]
+        self.assertEqual(sorted(ids), sorted([first.id, second.id]))
+        self.assertEqual(ids[0], second.id)
+
+        # The cursor pages through results in rank order
+        response = self.client.get(reverse('joborder-list'), {'search': 'saleh', 'page_size': 1})
+        self.assertEqual([order['id'] for order in response.data['results']], [second.id])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([order['id'] for order in response.data['results']], [first.id])
+
+        # Terms shorter than a trigram still match as substrings
+        response = self.client.get(reverse('joborder-list'), {'search': '02'})
+        self.assertEqual([order['id'] for order in response.data['results']], [second.id])
+
+    def test_customer_search_matches_phone_without_separators(self):
+        """Test customer search finds phone numbers typed without spaces"""
+        response = self.client.get(reverse('customer-search'), {'q': '0551234'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([customer['id'] for customer in response.data['results']], [self.customer.id])
+
+    def test_search_applies_list_filters_to_every_match(self):
+        """Test filters narrow all matches, so pages reach past the best-ranked few"""
+        for index in range(1, 8):
+            order = self.create_order(f'JO-{index:04d}')
+            if index % 2:
+                JobOrder.objects.filter(pk=order.pk).update(status='delivered')
+        JobOrder.objects.filter(job_order_number='JO-0007').update(is_active=False)
+
+        response = self.client.get(
+            reverse('joborder-list'), {'search': 'saleh', 'status': 'delivered', 'page_size': 2}
+        )
+        numbers = [order['job_order_number'] for order in response.data['results']]
+        response = self.client.get(response.data['next'])
+        numbers += [order['job_order_number'] for order in response.data['results']]
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(sorted(numbers), ['JO-0001', 'JO-0003', 'JO-0005'])
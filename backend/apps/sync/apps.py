@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SyncConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.sync'
+
+    def ready(self):
+        # Record hard deletes of synced rows and resend orders when their customer changes
+        from . import signals  # noqa: F401
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.sync.models import Tombstone
+from apps.sync.views import retention_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS. Sync tokens that old "
+        "are already refused, so no client can still need them."
+    )
+
+    def handle(self, *args, **options):
+        removed, _ = Tombstone.objects.filter(deleted_at__lt=retention_cutoff()).delete()
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} tombstones"))
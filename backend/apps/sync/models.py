@@ -0,0 +1,25 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """
+    Id of a hard-deleted row of a sync model.
+
+    Recorded by apps.sync.signals and sent in the `deleted` list of sync
+    responses, so clients also drop rows that were removed rather than
+    deactivated.
+    """
+    model = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Tombstone'
+        verbose_name_plural = 'Tombstones'
+        indexes = [
+            models.Index(fields=['model', 'deleted_at'], name='tombstone_model_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted at {self.deleted_at}"
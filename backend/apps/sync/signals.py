@@ -0,0 +1,51 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from apps.joborder.models import JobOrder
+from apps.receipt.models import Receipt
+from .models import Tombstone
+
+# Sender -> sync model name, for every model served by the sync endpoint
+TOMBSTONED_MODELS = {
+    'crm.Customer': 'customers',
+    'materials.Material': 'materials',
+    'inventory.Item': 'items',
+    'joborder.JobOrder': 'job-orders',
+    'sale.Sale': 'sales',
+    'receipt.Receipt': 'receipts',
+}
+
+
+def record_tombstone(sender, instance, **kwargs):
+    """Remember a hard-deleted row, including rows removed by a cascade"""
+    Tombstone.objects.create(model=TOMBSTONED_MODELS[sender._meta.label], object_id=instance.pk)
+
+
+for label in TOMBSTONED_MODELS:
+    post_delete.connect(record_tombstone, sender=label, dispatch_uid=f'sync_tombstone_{label}')
+
+
+# Customer fields that job orders and receipts embed in their sync rows
+EMBEDDED_CUSTOMER_FIELDS = ('name', 'phone', 'customer_id')
+
+
+def remember_embedded_customer_fields(sender, instance, update_fields=None, **kwargs):
+    """Keep the stored values of the embedded fields, to compare after the save"""
+    instance._embedded_before = None
+    if instance.pk is None or (update_fields is not None and not set(update_fields) & set(EMBEDDED_CUSTOMER_FIELDS)):
+        return
+    instance._embedded_before = sender.objects.filter(pk=instance.pk).values_list(*EMBEDDED_CUSTOMER_FIELDS).first()
+
+
+def touch_customer_documents(sender, instance, created, **kwargs):
+    """Mark the customer's job orders and receipts changed when the fields they embed change"""
+    before = getattr(instance, '_embedded_before', None)
+    if created or before is None or before == tuple(getattr(instance, field) for field in EMBEDDED_CUSTOMER_FIELDS):
+        return
+    now = timezone.now()
+    JobOrder.objects.filter(customer=instance).update(updated_at=now)
+    Receipt.objects.filter(job_order__customer=instance).update(updated_at=now)
+
+
+pre_save.connect(remember_embedded_customer_fields, sender='crm.Customer', dispatch_uid='sync_customer_before')
+post_save.connect(touch_customer_documents, sender='crm.Customer', dispatch_uid='sync_customer_documents')
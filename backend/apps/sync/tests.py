@@ -0,0 +1,144 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.crm.models import Customer
+from apps.inventory.models import Item
+from apps.inventory.stock import apply_stock_adjustments
+from apps.joborder.models import JobOrder
+from apps.materials.models import Material
+from apps.receipt.models import Receipt
+from .models import Tombstone
+from .views import decode_position, encode_position
+
+User = get_user_model()
+
+
+@mock.patch('apps.sync.views.SETTLE_WINDOW', timedelta(0))
+class SyncAPITestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def sync(self, model, **params):
+        return self.client.get(reverse('sync', kwargs={'model': model}), params)
+
+    def test_pages_through_changes_and_reports_deletions(self):
+        """Test changed rows are paged oldest first and soft-deleted rows are sent as ids"""
+        customers = [
+            Customer.objects.create(name=f'Customer {index}', phone=f'05000000{index}', balance=0)
+            for index in range(3)
+        ]
+
+        response = self.sync('customers', limit=2)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data['changed']], [customers[0].id, customers[1].id])
+        self.assertTrue(response.data['has_more'])
+
+        response = self.sync('customers', limit=2, since=response.data['next'])
+        self.assertEqual([row['id'] for row in response.data['changed']], [customers[2].id])
+        self.assertFalse(response.data['has_more'])
+        watermark = response.data['next']
+
+        # Nothing new since the watermark
+        response = self.sync('customers', since=watermark)
+        self.assertEqual(response.data['changed'], [])
+        self.assertEqual(response.data['deleted'], [])
+
+        customers[1].is_active = False
+        customers[1].save()
+        customers[2].name = 'Renamed'
+        customers[2].save()
+
+        response = self.sync('customers', since=watermark)
+        self.assertEqual([row['name'] for row in response.data['changed']], ['Renamed'])
+        self.assertEqual(response.data['deleted'], [customers[1].id])
+
+    def test_reports_hard_deletes(self):
+        """Test deleted materials and customers, and the orders removed with them, are sent as ids"""
+        material = Material.objects.create(
+            name='Cotton', price=100, thool=145, kethet=43, thool_kum=61, ardh_f_kum=17, jamba=9, ragab=12
+        )
+        customer = Customer.objects.create(name='Customer', phone='0500000000', balance=0)
+        job_order = JobOrder.objects.create(
+            job_order_number='JO-0001', customer=customer, delivery_date='2024-01-15T10:00:00Z',
+            total_amount=100, advance_amount=0, balance_amount=100
+        )
+        watermarks = {model: self.sync(model).data['next'] for model in ('materials', 'customers', 'job-orders')}
+        # The first sync of a client has nothing to delete
+        self.assertEqual(self.sync('materials').data['deleted'], [])
+
+        response = self.client.delete(reverse('material-detail', args=[material.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = self.client.delete(reverse('customer-detail', args=[customer.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(self.sync('materials', since=watermarks['materials']).data['deleted'], [material.id])
+        self.assertEqual(self.sync('customers', since=watermarks['customers']).data['deleted'], [customer.id])
+        self.assertEqual(self.sync('job-orders', since=watermarks['job-orders']).data['deleted'], [job_order.id])
+
+    def test_stock_adjustment_marks_item_changed(self):
+        """Test items are resent after their stock level changes"""
+        item = Item.objects.create(name='Cotton Roll', sku='CR-1')
+        watermark = self.sync('items').data['next']
+
+        apply_stock_adjustments([{'item_id': item.id, 'quantity': '5', 'movement_type': 'IN'}])
+
+        response = self.sync('items', since=watermark)
+        self.assertEqual([row['id'] for row in response.data['changed']], [item.id])
+
+    def test_rejects_unknown_model_and_bad_token(self):
+        """Test an unknown model is a 404 and a malformed token a 400"""
+        self.assertEqual(self.sync('users').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.sync('customers', since='not-a-token').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.sync('customers', limit='many').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_customer_edit_resends_their_orders_and_receipts(self):
+        """Test orders and receipts embedding a customer's name are sent again after it changes"""
+        customer = Customer.objects.create(name='Customer', phone='0500000000', balance=0)
+        job_order = JobOrder.objects.create(
+            job_order_number='JO-0001', customer=customer, delivery_date='2024-01-15T10:00:00Z',
+            total_amount=100, advance_amount=0, balance_amount=100
+        )
+        receipt = Receipt.objects.create(
+            receipt_id='RCP001', receipt_date='2024-01-10T10:00:00Z', receipt_amount=50, job_order=job_order
+        )
+        watermarks = {model: self.sync(model).data['next'] for model in ('job-orders', 'receipts')}
+
+        customer.balance = 10
+        customer.save()
+        self.assertEqual(self.sync('job-orders', since=watermarks['job-orders']).data['changed'], [])
+
+        customer.name = 'Renamed'
+        customer.save()
+        response = self.sync('job-orders', since=watermarks['job-orders'])
+        self.assertEqual([row['customer_name'] for row in response.data['changed']], ['Renamed'])
+        response = self.sync('receipts', since=watermarks['receipts'])
+        self.assertEqual([row['id'] for row in response.data['changed']], [receipt.id])
+        self.assertEqual(response.data['changed'][0]['customer_name'], 'Renamed')
+
+    def test_expired_tokens_are_refused_and_old_tombstones_pruned(self):
+        """Test tokens older than the tombstone retention get 410 and prune_tombstones removes those tombstones"""
+        with self.settings(SYNC_TOMBSTONE_RETENTION_DAYS=30):
+            old = timezone.now() - timedelta(days=31)
+            Tombstone.objects.create(model='customers', object_id=1, deleted_at=old)
+            recent = Tombstone.objects.create(model='customers', object_id=2)
+
+            response = self.sync('customers', since=encode_position(old, 0))
+            self.assertEqual(response.status_code, status.HTTP_410_GONE)
+            response = self.sync('customers', since=encode_position(old + timedelta(days=2), 0))
+            self.assertEqual(response.data['deleted'], [2])
+            # A caught-up token moves forward even without changes, so it does not expire
+            self.assertGreater(decode_position(response.data['next'])[0], timezone.now() - timedelta(minutes=1))
+
+            call_command('prune_tombstones', stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.all()), [recent])
@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('<slug:model>/', views.SyncView.as_view(), name='sync'),
+]
@@ -0,0 +1,151 @@
+"""
+Delta sync for offline-capable POS clients.
+
+GET /api/sync/<model>/?since=<token> returns the rows of one model changed
+after the position in the token, oldest change first, split into `changed`
+(serialized like the model's API) and `deleted` (ids of rows soft-deleted with
+is_active=False, and of hard-deleted rows from their tombstones). Clients keep
+the returned `next` token per model and call again while `has_more` is true.
+
+Positions are (updated_at, id) keysets served by the updated_at indexes. Once a
+client has caught up, the token is held back SETTLE_WINDOW behind the server
+clock, so rows of transactions that commit late with an earlier updated_at are
+sent again on the next call rather than skipped. Tombstones are sent for the
+time span a response covers, bounds included, so an id may be sent twice.
+Job order lines are not synced on their own: an edit that removes lines also
+saves the order, which is sent again with its remaining active lines. Editing
+a customer's name, phone or customer_id marks their job orders and receipts
+changed too, as those rows embed them (see signals.py).
+
+Tombstones are kept for SYNC_TOMBSTONE_RETENTION_DAYS and then removed by
+`manage.py prune_tombstones`. A token older than that could miss deletions, so
+it is refused with 410 and the client syncs the model again without `since`.
+"""
+import base64
+import binascii
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.crm.models import Customer
+from apps.crm.serializers import CustomerSerializer
+from apps.crm.views import with_order_totals
+from apps.inventory.models import Item, with_current_stock
+from apps.inventory.serializers import ItemSerializer
+from apps.joborder.models import JobOrder
+from apps.joborder.serializers import JobOrderListSerializer
+from apps.joborder.views import with_order_details
+from apps.materials.models import Material
+from apps.materials.serializers import MaterialSerializer
+from apps.receipt.models import Receipt
+from apps.receipt.serializers import ReceiptSerializer
+from apps.sale.models import Sale
+from apps.sale.serializers import SaleSerializer
+from .models import Tombstone
+
+
+# Sync model name -> (queryset factory, serializer)
+SYNC_SOURCES = {
+    'customers': (lambda: with_order_totals(Customer.objects.all()), CustomerSerializer),
+    'materials': (lambda: Material.objects.all(), MaterialSerializer),
+    'items': (lambda: with_current_stock(Item.objects.select_related('category')), ItemSerializer),
+    'job-orders': (lambda: with_order_details(JobOrder.objects.all()), JobOrderListSerializer),
+    'sales': (lambda: Sale.objects.prefetch_related('sale_items__item'), SaleSerializer),
+    'receipts': (lambda: Receipt.objects.select_related('job_order', 'job_order__customer'), ReceiptSerializer),
+}
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 2000
+SETTLE_WINDOW = timedelta(seconds=30)
+
+
+def encode_position(updated_at, pk):
+    """Opaque, URL-safe token for an (updated_at, id) position"""
+    return base64.urlsafe_b64encode(f'{updated_at.isoformat()}|{pk}'.encode()).decode()
+
+
+def decode_position(token):
+    """Parse a token from encode_position; raises ValueError when invalid"""
+    try:
+        updated_at, pk = base64.urlsafe_b64decode(token.encode()).decode().split('|')
+        updated_at = datetime.fromisoformat(updated_at)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid sync token: {token}")
+    if timezone.is_naive(updated_at):
+        raise ValueError(f"Invalid sync token: {token}")
+    return updated_at, int(pk)
+
+
+def retention_cutoff():
+    """Oldest time tombstones are kept for, and so the oldest usable token position"""
+    return timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def changed_since(queryset, position):
+    """Rows after the (updated_at, id) position, in position order"""
+    if position is not None:
+        updated_at, pk = position
+        queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, pk__gt=pk))
+    return queryset.order_by('updated_at', 'pk')
+
+
+def deleted_between(model, start, end):
+    """Ids of rows hard-deleted from the `start` position up to `end` (None for no bound)"""
+    queryset = Tombstone.objects.filter(model=model, deleted_at__gte=start[0])
+    if end is not None:
+        queryset = queryset.filter(deleted_at__lte=end[0])
+    return list(queryset.order_by('deleted_at').values_list('object_id', flat=True))
+
+
+class SyncView(generics.GenericAPIView):
+    """Changes of one model since a client's watermark"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, model):
+        if model not in SYNC_SOURCES:
+            return Response(
+                {'error': f"Unknown sync model. Allowed: {', '.join(SYNC_SOURCES)}"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        try:
+            since = request.query_params.get('since')
+            position = decode_position(since) if since else None
+            limit = max(min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_LIMIT), 1)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if position is not None and position[0] < retention_cutoff():
+            return Response(
+                {'error': 'Sync token expired. Sync again without since'},
+                status=status.HTTP_410_GONE
+            )
+
+        start = position
+        make_queryset, serializer_class = SYNC_SOURCES[model]
+        rows = list(changed_since(make_queryset(), position)[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        if has_more:
+            position = (rows[-1].updated_at, rows[-1].pk)
+        else:
+            # Caught up: advance the watermark, even for a model without changes so the token
+            # does not expire, but hold it back so late commits are picked up next time
+            position = (timezone.now() - SETTLE_WINDOW, 0)
+
+        changed = [row for row in rows if row.is_active]
+        deleted = [row.pk for row in rows if not row.is_active]
+        if start is not None:
+            # A client without a token has nothing to delete
+            deleted += deleted_between(model, start, position if has_more else None)
+        return Response({
+            'model': model,
+            'changed': serializer_class(changed, many=True, context=self.get_serializer_context()).data,
+            'deleted': list(dict.fromkeys(deleted)),
+            'next': encode_position(*position),
+            'has_more': has_more,
+        })
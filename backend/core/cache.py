@@ -0,0 +1,84 @@
+"""
+Cache for small reference tables (materials, company details).
+
+Each ReferenceCache owns a namespace whose keys embed a version number stored
+in the cache itself. Saving or deleting any of the namespace's models bumps the
+version right away and again once the transaction commits, which retires every
+key of the namespace at once without having to know which keys were filled.
+
+The version lives in the configured cache backend, so invalidation reaches
+every process that shares it (the file backend on one host); with the
+per-process local-memory backend other workers only see changes once
+REFERENCE_CACHE_TIMEOUT expires.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+
+# Bump when the shape of cached values changes so old entries are never read
+CACHE_SCHEMA_VERSION = 1
+
+# Stored in place of None so that "no default company" is cached too
+_MISSING = '__missing__'
+
+
+class ReferenceCache:
+    """Versioned cache namespace invalidated by saves and deletes of its models"""
+
+    def __init__(self, namespace, models):
+        self.namespace = namespace
+        self.models = models
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'REFERENCE_CACHE_ALIAS', 'default')]
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'REFERENCE_CACHE_TIMEOUT', 300)
+
+    def _version_key(self):
+        return f'ref:{CACHE_SCHEMA_VERSION}:{self.namespace}:version'
+
+    def version(self):
+        """Current version of the namespace, starting it at 1 when unset"""
+        version = self.cache.get(self._version_key())
+        if version is None:
+            self.cache.add(self._version_key(), 1, None)
+            version = self.cache.get(self._version_key(), 1)
+        return version
+
+    def key(self, name):
+        return f'ref:{CACHE_SCHEMA_VERSION}:{self.namespace}:{self.version()}:{name}'
+
+    def get_or_set(self, name, loader):
+        """Return the cached value of `name`, calling loader() to fill it on a miss"""
+        key = self.key(name)
+        value = self.cache.get(key)
+        if value is None:
+            value = loader()
+            self.cache.set(key, _MISSING if value is None else value, self.timeout)
+            return value
+        return None if value == _MISSING else value
+
+    def invalidate(self):
+        """Retire every key of the namespace"""
+        try:
+            self.cache.incr(self._version_key())
+        except ValueError:
+            # Version key evicted or never set: any new version is fresh
+            self.cache.set(self._version_key(), self.version() + 1, None)
+
+    def _invalidate_on_write(self, sender, **kwargs):
+        # Again after commit, in case a concurrent reader cached the old rows meanwhile
+        self.invalidate()
+        transaction.on_commit(self.invalidate)
+
+    def connect(self):
+        """Invalidate the namespace whenever one of its models is saved or deleted"""
+        for model in self.models:
+            post_save.connect(self._invalidate_on_write, sender=model, weak=False)
+            post_delete.connect(self._invalidate_on_write, sender=model, weak=False)
+        return self
@@ -0,0 +1,119 @@
+"""
+Index-friendly filtering helpers.
+
+Filtering with `field__date__gte` wraps the column in a date cast, so the database
+cannot use an index on it. These helpers turn YYYY-MM-DD bounds into half-open
+[start of first day, start of the day after the last day) ranges of aware
+datetimes in the shop's timezone (settings.TIME_ZONE), applied as plain >= / <
+predicates on the raw column.
+
+Name searches go through the search_key columns (see core.text) instead of
+icontains on the raw name.
+"""
+from datetime import date, datetime, time, timedelta
+
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.filters import SearchFilter
+
+from .text import search_key
+
+
+DATE_FORMAT = '%Y-%m-%d'
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD string (or pass through a date); raises ValueError when invalid"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, DATE_FORMAT).date()
+
+
+def day_start(day):
+    """Aware datetime at midnight of the given date in the shop's timezone"""
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def date_range_bounds(start_date=None, end_date=None):
+    """Return (lower, upper) aware datetimes for inclusive day bounds; either may be None"""
+    lower = day_start(parse_date(start_date)) if start_date else None
+    upper = day_start(parse_date(end_date) + timedelta(days=1)) if end_date else None
+    return lower, upper
+
+
+def _parse_bound(value, strict):
+    if not value:
+        return None
+    try:
+        return parse_date(value)
+    except ValueError:
+        if strict:
+            raise
+        return None
+
+
+def filter_date_range(queryset, field, start_date=None, end_date=None, strict=False):
+    """
+    Filter `field` to the days between start_date and end_date (both inclusive).
+
+    An invalid bound is ignored unless `strict` is set, in which case the
+    ValueError is raised to the caller.
+    """
+    lower, upper = date_range_bounds(_parse_bound(start_date, strict), _parse_bound(end_date, strict))
+    if lower is not None:
+        queryset = queryset.filter(**{f'{field}__gte': lower})
+    if upper is not None:
+        queryset = queryset.filter(**{f'{field}__lt': upper})
+    return queryset
+
+
+def filter_day_range(queryset, field, start_date=None, end_date=None, strict=False):
+    """Like filter_date_range, for a DateField holding local days"""
+    start, end = _parse_bound(start_date, strict), _parse_bound(end_date, strict)
+    if start is not None:
+        queryset = queryset.filter(**{f'{field}__gte': start})
+    if end is not None:
+        queryset = queryset.filter(**{f'{field}__lte': end})
+    return queryset
+
+
+class NormalizedSearchFilter(SearchFilter):
+    """
+    SearchFilter that folds the search terms with search_key, for searching search_key columns.
+
+    Fields prefixed with '^' match the start of the column with prefix_q, which the
+    column's pattern index can serve; DRF's own '^' is istartswith, which no index
+    serves. Other fields keep DRF's lookups.
+    """
+
+    def get_search_terms(self, request):
+        terms = [search_key(term) for term in super().get_search_terms(request)]
+        return [term for term in terms if term]
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+
+        for term in search_terms:
+            condition = Q()
+            for field in search_fields:
+                if field.startswith('^'):
+                    condition |= prefix_q(field[1:], term)
+                else:
+                    condition |= Q(**{self.construct_search(field, queryset): term})
+            queryset = queryset.filter(condition)
+        return queryset
+
+
+def prefix_q(field, prefix):
+    """Q matching rows whose `field` starts with prefix, servable by an index on `field`"""
+    q = Q(**{f'{field}__startswith': prefix})
+    if connection.vendor == 'sqlite':
+        # SQLite only uses an index for LIKE under case_sensitive_like, so also bound the range
+        q &= Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + '\U0010ffff'})
+    return q
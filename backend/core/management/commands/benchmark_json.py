@@ -0,0 +1,86 @@
+import io
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.crm.models import Customer
+from apps.joborder.models import JobOrder, jobOrderItem, jobOrderMeasurement
+from apps.joborder.serializers import JobOrderListSerializer
+from apps.materials.models import Material
+
+
+def build_deliveries(count):
+    """Serialized deliveries payload of `count` job orders, built without touching the database"""
+    now = timezone.now()
+    materials = [Material(id=index, name=f'Material {index}', price=Decimal('45.50')) for index in range(1, 21)]
+    orders = []
+    for index in range(1, count + 1):
+        customer = Customer(
+            id=index, customer_id=f'CUST{index:05d}', name=f'عميل رقم {index}', phone=f'05{index:08d}', balance=0
+        )
+        order = JobOrder(
+            id=index, job_order_number=f'JO-{index:06d}', customer=customer, status='completed',
+            delivery_date=now + timedelta(days=index % 30), total_amount=Decimal('350.00'),
+            advance_amount=Decimal('100.00'), balance_amount=Decimal('250.00'), payment_method='cash',
+            cash_amount=Decimal('100.00'), remarks='Deliver before noon', created_at=now, updated_at=now,
+        )
+        order.active_items = [
+            jobOrderItem(
+                id=index * 10 + line, material=materials[(index + line) % 20], quantity=line + 1,
+                fees=Decimal('25.00'), total_amount=Decimal('116.00'),
+            )
+            for line in range(2)
+        ]
+        order.active_measurements = [
+            jobOrderMeasurement(
+                id=index, material=materials[index % 20], thool=Decimal('145.00'), kethet=Decimal('43.00'),
+                thool_kum=Decimal('61.00'), ardh_f_kum=Decimal('17.00'), jamba=Decimal('9.00'),
+                ragab=Decimal('12.00'), note1='Two pockets',
+            )
+        ]
+        orders.append(order)
+    return {'count': count, 'results': JobOrderListSerializer(orders, many=True).data}
+
+
+def best_of(repeat, func):
+    """Fastest of `repeat` runs of func(), in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = "Compare DRF's json renderer/parser with the orjson ones on a deliveries-sized payload."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=5000, help='Job orders in the payload')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement; the fastest is reported')
+
+    def handle(self, *args, **options):
+        try:
+            from core.renderers import ORJSONParser, ORJSONRenderer
+        except ImportError:
+            self.stderr.write(self.style.ERROR('orjson is not installed'))
+            return
+
+        data = build_deliveries(options['orders'])
+        repeat = options['repeat']
+        body = JSONRenderer().render(data)
+        self.stdout.write(f"{options['orders']} job orders, {len(body) / 1024:.0f} KiB of JSON")
+
+        for label, renderer, parser in [
+            ('json', JSONRenderer(), JSONParser()),
+            ('orjson', ORJSONRenderer(), ORJSONParser()),
+        ]:
+            render_ms = best_of(repeat, lambda: renderer.render(data))
+            parse_ms = best_of(repeat, lambda: parser.parse(io.BytesIO(body)))
+            self.stdout.write(f"{label:>7}: render {render_ms:8.1f} ms   parse {parse_ms:8.1f} ms")
+
@@ -0,0 +1,117 @@
+"""
+Response compression.
+
+Django's GZipMiddleware compresses every response of 200 bytes or more. This
+one only compresses content types that shrink well (COMPRESSION_CONTENT_TYPES)
+and bodies of at least COMPRESSION_MIN_SIZE bytes, so small replies are not
+worth the CPU, and prefers brotli over gzip when the brotli package is
+installed and the client accepts it. Streaming responses (exports) have no
+known size and are compressed chunk by chunk whenever their type allows it.
+"""
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_CONTENT_TYPES = (
+    'application/json',
+    'application/javascript',
+    'image/svg+xml',
+    'text/css',
+    'text/csv',
+    'text/html',
+    'text/javascript',
+    'text/plain',
+)
+
+# Quality 4-5 is the usual trade-off for dynamic content; 11 is for static assets
+BROTLI_QUALITY = 5
+
+
+def accepted_encodings(header):
+    """Codings listed in an Accept-Encoding header, without those refused with q=0"""
+    codings = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            codings.add(coding.strip().lower())
+    return codings
+
+
+def brotli_sequence(sequence):
+    """Brotli-compress an iterable of chunks, flushing after each one"""
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in sequence:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Brotli/gzip compression limited by size and content type"""
+
+    def select_encoding(self, request):
+        codings = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and 'br' in codings:
+            return 'br'
+        if 'gzip' in codings:
+            return 'gzip'
+        return None
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        allowed = getattr(settings, 'COMPRESSION_CONTENT_TYPES', DEFAULT_CONTENT_TYPES)
+        if content_type not in allowed:
+            return response
+        if not response.streaming and len(response.content) < getattr(settings, 'COMPRESSION_MIN_SIZE', 1024):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.select_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                # Async streams are left alone; every streaming response here is sync
+                return response
+            if encoding == 'br':
+                response.streaming_content = brotli_sequence(response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content, max_random_bytes=self.max_random_bytes
+                )
+            del response.headers['Content-Length']
+        else:
+            if encoding == 'br':
+                compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+            else:
+                compressed = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+            # Keep the original when compression does not pay off
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(response.content))
+
+        # A compressed body is a different representation: weaken strong ETags (RFC 9110 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
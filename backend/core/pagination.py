@@ -0,0 +1,43 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    The cursor encodes the last seen position instead of an offset, so every
+    page costs the same index range scan no matter how deep the client goes.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def get_ordering(self, request, queryset, view):
+        # Search results (see apps.search.query) are paged by relevance instead
+        if 'search_rank' in queryset.query.annotations:
+            return ('-search_rank', '-id')
+        return super().get_ordering(request, queryset, view)
+
+
+class DateCursorPagination(CreatedAtCursorPagination):
+    """Keyset pagination over (date, id) for models keyed on a business date"""
+    ordering = ('-date', '-id')
+
+
+class PaginatedActionMixin:
+    """Helpers for paginating custom list actions with the viewset's paginator"""
+
+    def paginated_response(self, queryset, serializer_class=None):
+        """Serialize one page of the queryset, or the full queryset when pagination is disabled"""
+        serializer_class = serializer_class or self.get_serializer_class()
+        context = self.get_serializer_context()
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = serializer_class(page, many=True, context=context)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = serializer_class(queryset, many=True, context=context)
+        return Response(serializer.data)
@@ -0,0 +1,58 @@
+"""
+orjson-based JSON renderer and parser.
+
+Drop-in replacements for DRF's JSONRenderer and JSONParser, enabled by the
+FAST_JSON setting. Output matches DRF's: values orjson does not handle the same
+way (datetimes, Decimals, lazy strings, ...) go through DRF's JSONEncoder, so
+datetimes keep the 'Z' suffix and Decimals outside serializers still render as
+numbers.
+"""
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+
+# Dict keys may be ints (e.g. {item_id: quantity}); datetimes are left to DRF's encoder
+RENDER_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer that serializes with orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = RENDER_OPTIONS
+        # orjson only indents by two spaces; any requested indent gets that
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=options)
+        except orjson.JSONEncodeError as e:
+            # Surface unserializable values the way json.dumps does
+            raise TypeError(str(e)) from e
+
+        # Escape the separators JavaScript treats as newlines, like DRF does
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser that parses with orjson"""
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read() if stream is not None else b''
+            if encoding.lower().replace('-', '') != 'utf8':
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (orjson.JSONDecodeError, UnicodeDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -10,8 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -54,10 +56,17 @@ INSTALLED_APPS = [
     'apps.sale',
     'apps.receipt',
     'apps.master',
+    'apps.search',
+    'apps.sync',
+    'apps.rollups',
+    'apps.printing',
+    'core',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Compresses what every middleware below has produced; see core/middleware.py
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -90,24 +99,89 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+DB_ENGINE = os.getenv('DB_ENGINE', 'django.db.backends.sqlite3')
+
+if DB_ENGINE == 'django.db.backends.postgresql':
+    # Persistent connections with health checks; set DB_POOL=True to use the
+    # psycopg 3 connection pool instead (requires the psycopg[pool] package).
+    DB_POOL = os.getenv('DB_POOL', 'False').lower() == 'true'
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', 'tailor_billing'),
+            'USER': os.getenv('DB_USER', ''),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # Pooled connections are returned to the pool, so they must not also be persistent
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
+            'OPTIONS': {
+                'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+            },
+        }
+    }
+    if DB_POOL:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+        }
+    # Trigram lookups used by the search index
+    INSTALLED_APPS.append('django.contrib.postgres')
+else:
+    # SQLite fallback. busy_timeout, synchronous=NORMAL and (with SQLITE_WAL) WAL mode
+    # are applied to every new connection by core.db; IMMEDIATE transactions take the write lock
+    # up front instead of failing with "database is locked" on lock upgrade.
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': BASE_DIR / os.getenv('DB_NAME', 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            'OPTIONS': {
+                'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000')) / 1000,
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
     }
-}
 
+SQLITE_PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000')),
+}
+# WAL is a persistent property of the database file, so it is only switched on where
+# asked for (deployments): applying it unconditionally rewrites the checked-in db.sqlite3
+# whenever a management command runs.
+if os.getenv('SQLITE_WAL', 'False').lower() == 'true':
+    SQLITE_PRAGMAS['journal_mode'] = 'WAL'
+
+
+# Cache
+# Local memory is per process; use the file backend to share the cache (and its
+# invalidations) between the workers of one host.
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            # Outside the source tree by default, so cache files never end up in git
+            'LOCATION': os.getenv('CACHE_LOCATION') or os.path.join(tempfile.gettempdir(), 'tailor-billing-cache'),
+            'KEY_PREFIX': 'tailor',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'tailor-billing',
+            'KEY_PREFIX': 'tailor',
+        }
+    }
 
-# DATABASES = {
-#     'default': {
-#         'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.sqlite3'),
-#         'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
-#         'USER': os.getenv('DB_USER', ''),
-#         'PASSWORD': os.getenv('DB_PASSWORD', ''),
-#         'HOST': os.getenv('DB_HOST', ''),
-#         'PORT': os.getenv('DB_PORT', ''),
-#     }
-# }
+# Seconds reference data (materials, company details) stays cached; see core.cache
+REFERENCE_CACHE_TIMEOUT = int(os.getenv('REFERENCE_CACHE_TIMEOUT', '300'))
 
 
 # Password validation
@@ -163,6 +237,39 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Render and parse JSON with orjson (see core/renderers.py); falls back to DRF's
+# json-based classes when disabled or when orjson is not installed.
+FAST_JSON = os.getenv('FAST_JSON', 'True').lower() == 'true' and find_spec('orjson') is not None
+
+if FAST_JSON:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    )
+
+# Response compression: bodies smaller than this many bytes are sent as is
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+
+# Rows fetched per query by the streaming CSV/XLSX exports (see core/export.py)
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '2000'))
+
+# Rendered job orders, receipts and sales bills (see apps/printing/render.py)
+PRINT_CACHE_DIR = os.getenv('PRINT_CACHE_DIR') or str(BASE_DIR / 'print_cache')
+
+# Days tombstones of hard-deleted rows are kept for the sync endpoint (see apps/sync/views.py).
+# Older sync tokens are refused, and those clients sync again from scratch.
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', '90'))
+
+# Document number sequences (see apps/master/sequences.py for the defaults).
+# Override prefix, width or block_size per sequence, e.g.
+# {'sale': {'prefix': 'INV-', 'width': 6}}
+DOCUMENT_SEQUENCES = {}
+
 # JWT settings
 from datetime import timedelta
 SIMPLE_JWT = {
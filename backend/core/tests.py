@@ -0,0 +1,68 @@
+import gzip
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from .middleware import CompressionMiddleware
+from .renderers import ORJSONParser, ORJSONRenderer
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    def test_output_matches_drf_renderer(self):
+        """Test orjson output parses to the same value as DRF's for datetimes, Decimals and int keys"""
+        data = {
+            'created_at': datetime(2024, 1, 15, 10, 30, 0, 123456, tzinfo=dt_timezone.utc),
+            'delivery_date': date(2024, 1, 20),
+            'total': Decimal('350.50'),
+            'stock': {7: Decimal('2.00')},
+            'name': 'ثوب قطن\u2028',
+        }
+        rendered = ORJSONRenderer().render(data)
+        expected = JSONRenderer().render(data)
+        self.assertEqual(ORJSONParser().parse(BytesIO(rendered)), ORJSONParser().parse(BytesIO(expected)))
+        self.assertIn(b'"2024-01-15T10:30:00.123456Z"', rendered)
+        self.assertIn(b'\\u2028', rendered)
+
+    def test_parser_rejects_invalid_json(self):
+        """Test malformed bodies raise a ParseError"""
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"total": '))
+
+
+class CompressionMiddlewareTestCase(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, accept_encoding='gzip, deflate'):
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_compresses_large_json(self):
+        """Test JSON above the threshold is gzipped and keeps its content"""
+        body = b'{"results": [' + b','.join([b'{"status": "pending"}'] * 500) + b']}'
+        response = self.process(HttpResponse(body, content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), body)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @override_settings(COMPRESSION_MIN_SIZE=1024)
+    def test_skips_small_and_binary_responses(self):
+        """Test small bodies and content types outside the allowlist are sent as is"""
+        response = self.process(HttpResponse(b'{"ok": true}', content_type='application/json'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.process(HttpResponse(b'\x89PNG' * 1000, content_type='image/png'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.process(HttpResponse(b'a' * 5000, content_type='text/plain'), accept_encoding='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_compresses_streaming_responses(self):
+        """Test streamed CSV is compressed chunk by chunk"""
+        rows = [f'{index},pending\n'.encode() for index in range(100)]
+        response = self.process(StreamingHttpResponse(iter(rows), content_type='text/csv'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b''.join(rows))
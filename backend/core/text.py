@@ -0,0 +1,37 @@
+"""
+Search key normalization.
+
+Names are stored as typed, so the same customer can be entered as "أحمد",
+"احمد" or "أَحْمَد", and the same material as "Cotton" or "cotton". search_key()
+folds such variants to one form that is stored next to the name and compared
+against the equally folded search term.
+"""
+import re
+import unicodedata
+
+
+ARABIC_FOLDS = str.maketrans({
+    'ٱ': 'ا',  # alef wasla -> alef (other alef forms lose their hamza/madda below)
+    'ة': 'ه',  # taa marbuta -> haa
+    'ى': 'ي',  # alef maqsura -> yaa
+    'ی': 'ي',  # farsi yeh -> yaa
+    'ک': 'ك',  # keheh -> kaf
+    'ـ': None,      # tatweel
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},  # Arabic-Indic digits
+    **{chr(0x06f0 + digit): str(digit) for digit in range(10)},  # Extended Arabic-Indic digits
+})
+# Repeated Latin letters, so "Mohammed" and "Mohamed" share a key
+LATIN_REPEATS = re.compile(r'([a-z])\1+')
+
+
+def search_key(value):
+    """Fold a name to its search key: no diacritics or tashkeel, unified letter forms, lower case"""
+    if value is None:
+        return ''
+    # NFKD splits presentation forms and hamza/madda carriers (أ إ آ ؤ ئ) into a base
+    # letter plus combining marks, which are dropped together with tashkeel and accents
+    text = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = text.translate(ARABIC_FOLDS).casefold()
+    text = LATIN_REPEATS.sub(r'\1', text)
+    return ' '.join(text.split())
@@ -28,6 +28,9 @@ urlpatterns = [
     path('api/materials/', include('apps.materials.urls')),
     path('api/sales/', include('apps.sale.urls')),
     path('api/master/', include('apps.master.urls')),
+    path('api/sync/', include('apps.sync.urls')),
+    path('api/reports/', include('apps.rollups.urls')),
+    path('api/print/', include('apps.printing.urls')),
     # path('api/transactions/', include('apps.transactions.urls')),
     # path('api/services/', include('apps.service.urls')),
 ]
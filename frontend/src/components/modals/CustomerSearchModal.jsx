@@ -59,7 +59,7 @@ export default function CustomerSearchModal({ isOpen, onClose, onSelectCustomer,
     setLoading(true);
     try {
       const data = await customerApi.getActiveCustomers();
-      setCustomers(data);
+      setCustomers(data.results || data);
     } catch (error) {
       console.error('Error loading customers:', error);
       // Fallback to sample data if API fails
@@ -76,9 +76,10 @@ export default function CustomerSearchModal({ isOpen, onClose, onSelectCustomer,
     try {
       if (query.trim() === '') {
         const data = await customerApi.getActiveCustomers();
-        setCustomers(data);
+        setCustomers(data.results || data);
       } else {
-        const data = await customerApi.searchCustomers(query);
+        // Prefix matches from the server's in-memory autocomplete index
+        const data = await customerApi.autocompleteCustomers(query, 20);
         setCustomers(data);
       }
     } catch (error) {
@@ -99,14 +100,28 @@ export default function CustomerSearchModal({ isOpen, onClose, onSelectCustomer,
     }
   };
 
-  const handleSelectCustomer = (customer) => {
-    setSelectedCustomer(customer);
-    onSelectCustomer(customer);
+  // Autocomplete results only carry id, customer_id, name and phone; load the full record
+  const withDetails = async (customer) => {
+    if (customer.balance !== undefined) {
+      return customer;
+    }
+    try {
+      return await customerApi.getCustomer(customer.id);
+    } catch (error) {
+      console.error('Error loading customer:', error);
+      return customer;
+    }
+  };
+
+  const handleSelectCustomer = async (customer) => {
+    const details = await withDetails(customer);
+    setSelectedCustomer(details);
+    onSelectCustomer(details);
     onClose();
   };
 
-  const handleEditCustomer = (customer) => {
-    onEditCustomer(customer);
+  const handleEditCustomer = async (customer) => {
+    onEditCustomer(await withDetails(customer));
   };
 
   const handleCreateCustomer = () => {
@@ -200,15 +215,17 @@ export default function CustomerSearchModal({ isOpen, onClose, onSelectCustomer,
                       </div>
                     </div>
                     <div className="flex items-center space-x-4">
-                      <div className="text-right">
-                        <div className="flex items-center space-x-1 text-sm">
-                          <DollarSign className="w-3 h-3 text-green-600" />
-                          <span className="text-green-600 font-medium">${formatCurrency(customer.balance)}</span>
-                        </div>
-                        <div className="text-xs text-gray-500 dark:text-gray-400">
-                          {customer.points || 0} points
+                      {customer.balance !== undefined && (
+                        <div className="text-right">
+                          <div className="flex items-center space-x-1 text-sm">
+                            <DollarSign className="w-3 h-3 text-green-600" />
+                            <span className="text-green-600 font-medium">${formatCurrency(customer.balance)}</span>
+                          </div>
+                          <div className="text-xs text-gray-500 dark:text-gray-400">
+                            {customer.points || 0} points
+                          </div>
                         </div>
-                      </div>
+                      )}
                       <div className="flex items-center space-x-2">
                         <button
                           onClick={(e) => {
@@ -25,13 +25,6 @@ export default function EditReceiptModal({ open, onClose, onSubmit, editingRecei
   const [showJobOrderDropdown, setShowJobOrderDropdown] = useState(false);
   const { showNotification } = useNotification();
 
-  // Fetch job orders when modal opens
-  useEffect(() => {
-    if (open) {
-      fetchJobOrders();
-    }
-  }, [open]);
-
   // Close dropdown when clicking outside
   useEffect(() => {
     const handleClickOutside = (event) => {
@@ -55,23 +48,44 @@ export default function EditReceiptModal({ open, onClose, onSubmit, editingRecei
         receipt_remarks: editingReceipt.receipt_remarks || "",
         job_order: editingReceipt.job_order?.toString() || "",
       });
+      // The receipt's job order may be older than the first page of results
+      if (editingReceipt.job_order) {
+        jobOrdersApi.getJobOrder(editingReceipt.job_order)
+          .then((jobOrder) => rememberJobOrders([jobOrder]))
+          .catch((error) => console.error('Error fetching job order:', error));
+      }
     }
   }, [editingReceipt, open]);
 
-  const fetchJobOrders = async () => {
+  // Job orders are searched on the server, so orders past the first page can be found
+  useEffect(() => {
+    if (!open) return;
+    const timeout = setTimeout(() => fetchJobOrders(jobOrderSearchTerm.trim()), 300);
+    return () => clearTimeout(timeout);
+  }, [open, jobOrderSearchTerm]);
+
+  // Keep every job order seen so far, so the selected one stays known between searches
+  const rememberJobOrders = (orders) => {
+    setJobOrders((current) => [...current.filter((jo) => !orders.some((order) => order.id === jo.id)), ...orders]);
+  };
+
+  const fetchJobOrders = async (search = '') => {
     try {
       setJobOrdersLoading(true);
-      const response = await jobOrdersApi.getJobOrders({ is_active: true });
+      const params = { is_active: true };
+      if (search) {
+        params.search = search;
+      }
+      const response = await jobOrdersApi.getJobOrders(params);
       // Handle both paginated and non-paginated responses
       const jobOrdersData = response.results || response;
       const jobOrdersArray = Array.isArray(jobOrdersData) ? jobOrdersData : [];
-      setJobOrders(jobOrdersArray);
+      rememberJobOrders(jobOrdersArray);
       setFilteredJobOrders(jobOrdersArray);
     } catch (error) {
       console.error('Error fetching job orders:', error);
       showNotification('Error fetching job orders', 'error');
       // Fallback to empty array on error
-      setJobOrders([]);
       setFilteredJobOrders([]);
     } finally {
       setJobOrdersLoading(false);
@@ -97,21 +111,10 @@ export default function EditReceiptModal({ open, onClose, onSubmit, editingRecei
     }
   };
 
-  // Filter job orders based on search term
+  // Search job orders on the server (see the effect above)
   const handleJobOrderSearch = (searchTerm) => {
     setJobOrderSearchTerm(searchTerm);
     setShowJobOrderDropdown(true);
-    
-    if (!searchTerm.trim()) {
-      setFilteredJobOrders(jobOrders);
-    } else {
-      const filtered = jobOrders.filter(jobOrder => 
-        jobOrder.job_order_number?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        jobOrder.customer_phone?.includes(searchTerm) ||
-        jobOrder.customer_name?.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-      setFilteredJobOrders(filtered);
-    }
   };
 
   const handleSubmit = async (e) => {
@@ -4,3 +4,8 @@ import { twMerge } from "tailwind-merge"
 export function cn(...inputs) {
   return twMerge(clsx(inputs))
 }
+
+// Cursor of a `next`/`previous` link of a cursor-paginated list
+export function cursorFromUrl(url) {
+  return url ? new URL(url, window.location.origin).searchParams.get("cursor") : null
+}
@@ -5,6 +5,7 @@ import { Button } from '../../components/ui/button';
 import CustomerModal from '../../components/modals/CustomerModal';
 import customerApi from '../../services/customerApi';
 import { useNotification } from '../../hooks/useNotification';
+import { cursorFromUrl } from '../../lib/utils';
 
 export default function Customers() {
   const [searchTerm, setSearchTerm] = useState('');
@@ -14,26 +15,43 @@ export default function Customers() {
   const [showCustomerModal, setShowCustomerModal] = useState(false);
   const [editingCustomer, setEditingCustomer] = useState(null);
   const [customers, setCustomers] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [submitting, setSubmitting] = useState(false);
   const { showNotification } = useNotification();
 
-  // Load customers on component mount
+  // Load customers on mount and search on the server, so unloaded pages are matched too
   useEffect(() => {
     loadCustomers();
-  }, []);
+  }, [searchTerm]);
 
-  const loadCustomers = async () => {
+  // Without a cursor the list is reloaded; with one the next page is appended
+  const loadCustomers = async (cursor = null) => {
     try {
-      setLoading(true);
-      const response = await customerApi.getCustomers();
-      setCustomers(response.results || response);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
+      const params = {};
+      if (searchTerm.trim()) {
+        params.search = searchTerm.trim();
+      }
+      if (cursor) {
+        params.cursor = cursor;
+      }
+      const response = await customerApi.getCustomers(params);
+      const customersData = response.results || response;
+      setCustomers((current) => (cursor ? [...current, ...customersData] : customersData));
+      setNextCursor(cursorFromUrl(response.next));
     } catch (error) {
       console.error('Error loading customers:', error);
       const errorMessage = error.message || 'Failed to load customers';
       showNotification(errorMessage, 'error');
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -339,6 +357,13 @@ export default function Customers() {
                 )}
               </tbody>
             </table>
+            {nextCursor && (
+              <div className="flex justify-center p-4 border-t border-gray-200 dark:border-gray-700">
+                <Button variant="outline" size="sm" onClick={() => loadCustomers(nextCursor)} disabled={loadingMore}>
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </Button>
+              </div>
+            )}
           </div>
         )}
       </div>
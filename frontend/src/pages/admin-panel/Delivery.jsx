@@ -3,6 +3,7 @@ import { Plus, Search, Filter, MoreVertical, Eye, Edit, Trash2, Truck, CheckCirc
 import { deliveryApi } from '../../services/deliveryApi';
 import DeliveryEditModal from '../../components/modals/DeliveryEditModal';
 import { formatCurrency, safeParseFloat } from '../../utils/currencyUtils';
+import { cursorFromUrl } from '../../lib/utils';
 
 export default function Delivery() {
   // Get today's date in YYYY-MM-DD format
@@ -20,7 +21,9 @@ export default function Delivery() {
   const [fromDate, setFromDate] = useState(getTodayDate());
   const [toDate, setToDate] = useState(getTodayDate());
   const [deliveries, setDeliveries] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
   const [stats, setStats] = useState({
     scheduled: 0,
@@ -44,9 +47,14 @@ export default function Delivery() {
     fetchDeliveries();
   }, [statusFilter, searchTerm, fromDate, toDate, blockedFilter]);
 
-  const fetchDeliveries = async () => {
+  // Without a cursor the list is reloaded; with one the next page is appended
+  const fetchDeliveries = async (cursor = null) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
       const params = {};
       
       if (statusFilter !== 'all') {
@@ -68,14 +76,20 @@ export default function Delivery() {
       if (toDate) {
         params.to_date = toDate;
       }
+      if (cursor) {
+        params.cursor = cursor;
+      }
       
       const data = await deliveryApi.getDeliveries(params);
-      setDeliveries(data);
+      const deliveriesData = data.results || data;
+      setDeliveries((current) => (cursor ? [...current, ...deliveriesData] : deliveriesData));
+      setNextCursor(cursorFromUrl(data.next));
     } catch (err) {
       console.error('Error fetching deliveries:', err);
       setError('Failed to fetch deliveries');
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -691,6 +705,17 @@ export default function Delivery() {
                 )}
               </tbody>
             </table>
+            {nextCursor && (
+              <div className="flex justify-center p-4 border-t border-gray-200 dark:border-gray-700">
+                <button
+                  onClick={() => fetchDeliveries(nextCursor)}
+                  disabled={loadingMore}
+                  className="px-4 py-2 text-sm border border-gray-300 dark:border-gray-600 rounded-lg text-gray-700 dark:text-gray-300 hover:bg-gray-50 dark:hover:bg-gray-700 disabled:opacity-60"
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </div>
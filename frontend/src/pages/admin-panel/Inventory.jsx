@@ -39,6 +39,7 @@ import {
   getLowStockAlerts
 } from "../../services/inventoryApi"
 import { useNotification } from "../../hooks/useNotification"
+import { cursorFromUrl } from "../../lib/utils"
 
 const Inventory = () => {
   const [searchTerm, setSearchTerm] = useState("")
@@ -55,7 +56,9 @@ const Inventory = () => {
   const [categories, setCategories] = useState([])
   const [inventoryItems, setInventoryItems] = useState([])
   const [stockMovements, setStockMovements] = useState([])
+  const [movementsCursor, setMovementsCursor] = useState(null)
   const [loading, setLoading] = useState(false)
+  const [loadingMore, setLoadingMore] = useState(false)
   
   const { showNotification } = useNotification()
 
@@ -83,6 +86,7 @@ const Inventory = () => {
           getItems()
         ])
         setStockMovements(movementsData.results || movementsData)
+        setMovementsCursor(cursorFromUrl(movementsData.next))
         setInventoryItems(itemsData.results || itemsData)
       }
     } catch (error) {
@@ -93,6 +97,21 @@ const Inventory = () => {
     }
   }
 
+  // Stock movements are cursor-paginated; append the next page
+  const loadMoreMovements = async () => {
+    setLoadingMore(true)
+    try {
+      const movementsData = await getStockMovements({ cursor: movementsCursor })
+      setStockMovements((current) => [...current, ...(movementsData.results || movementsData)])
+      setMovementsCursor(cursorFromUrl(movementsData.next))
+    } catch (error) {
+      console.error('Error loading stock movements:', error)
+      showNotification('Error loading stock movements', 'error')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const filteredItems = inventoryItems.filter((item) => {
     const matchesSearch = item.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
                          item.sku.toLowerCase().includes(searchTerm.toLowerCase())
@@ -554,6 +573,17 @@ const Inventory = () => {
             </tbody>
           </table>
         </div>
+        {movementsCursor && (
+          <div className="flex justify-center p-4 border-t border-gray-200 dark:border-gray-700">
+            <button
+              onClick={loadMoreMovements}
+              disabled={loadingMore}
+              className="px-4 py-2 text-sm border border-gray-300 dark:border-gray-600 rounded-lg text-gray-700 dark:text-gray-300 hover:bg-gray-50 dark:hover:bg-gray-700 disabled:opacity-60"
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   )
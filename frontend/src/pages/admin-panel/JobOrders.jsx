@@ -7,10 +7,13 @@ import EditJobOrder from "../../components/forms/EditJobOrder"
 import jobOrdersApi from "../../services/jobOrdersApi"
 import { formatCurrency, safeParseFloat } from "../../utils/currencyUtils"
 import JobOrderA5 from "../../components/print/joborder-a5"
+import { cursorFromUrl } from "../../lib/utils"
 
 export default function JobOrders() {
   const [jobOrders, setJobOrders] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [isLoading, setIsLoading] = useState(true)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
   const [error, setError] = useState(null)
   const [stats, setStats] = useState({
     total_orders: 0,
@@ -234,9 +237,14 @@ export default function JobOrders() {
     return () => window.removeEventListener("afterprint", onAfter)
   }, [])
 
-  const loadJobOrders = async () => {
+  // Without a cursor the list is reloaded; with one the next page is appended
+  const loadJobOrders = async (cursor = null) => {
     try {
-      setIsLoading(true)
+      if (cursor) {
+        setIsLoadingMore(true)
+      } else {
+        setIsLoading(true)
+      }
       setError(null) // Clear previous errors
 
       // Pass parameters to the API
@@ -250,6 +258,9 @@ export default function JobOrders() {
         params.from_date = dateFilter.from
         params.to_date = dateFilter.to
       }
+      if (cursor) {
+        params.cursor = cursor
+      }
 
       const response = await jobOrdersApi.getJobOrders(params)
       console.log("API Response:", response) // Debug log
@@ -267,14 +278,19 @@ export default function JobOrders() {
         jobOrdersData = []
       }
 
-      setJobOrders(jobOrdersData)
+      setJobOrders((current) => (cursor ? [...current, ...jobOrdersData] : jobOrdersData))
+      setNextCursor(cursorFromUrl(response?.next))
     } catch (error) {
       console.error("Error loading job orders:", error)
       const errorMessage = error.response?.data?.error || error.message || "Failed to load job orders"
       setError(errorMessage)
-      setJobOrders([]) // Ensure it's always an array
+      if (!cursor) {
+        setJobOrders([]) // Ensure it's always an array
+        setNextCursor(null)
+      }
     } finally {
       setIsLoading(false)
+      setIsLoadingMore(false)
     }
   }
 
@@ -689,6 +705,17 @@ export default function JobOrders() {
                   )}
                 </tbody>
               </table>
+              {nextCursor && (
+                <div className="flex justify-center p-4 border-t border-gray-200 dark:border-gray-700">
+                  <button
+                    onClick={() => loadJobOrders(nextCursor)}
+                    disabled={isLoadingMore}
+                    className="px-4 py-2 text-sm border border-gray-300 dark:border-gray-600 rounded-lg text-gray-700 dark:text-gray-300 hover:bg-gray-50 dark:hover:bg-gray-700 disabled:opacity-60"
+                  >
+                    {isLoadingMore ? "Loading..." : "Load more"}
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>
@@ -70,7 +70,7 @@ export default function Materials() {
     setError(null)
     try {
       const data = await jobOrdersApi.getJobOrders()
-      setJobOrders(data || [])
+      setJobOrders(data?.results ?? data ?? [])
     } catch (error) {
       console.error("Error loading job orders:", error)
       setError("Failed to load job orders. Please try again.")
@@ -4,36 +4,56 @@ import AddReceiptModal from '../../components/modals/AddReceiptModal';
 import EditReceiptModal from '../../components/modals/EditReceiptModal';
 import { useNotification } from '../../hooks/useNotification';
 import receiptApi from '../../services/receiptApi';
+import { cursorFromUrl } from '../../lib/utils';
 
 export default function ReceiptPage() {
   const [searchTerm, setSearchTerm] = useState('');
   const [statusFilter, setStatusFilter] = useState('all');
   const [receipts, setReceipts] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [showAddModal, setShowAddModal] = useState(false);
   const [showEditModal, setShowEditModal] = useState(false);
   const [editingReceipt, setEditingReceipt] = useState(null);
   const { showNotification } = useNotification();
 
-  // Fetch receipts on component mount
+  // Fetch receipts on mount and search on the server, so unloaded pages are matched too
   useEffect(() => {
     fetchReceipts();
-  }, []);
+  }, [searchTerm]);
 
-  const fetchReceipts = async () => {
-    setLoading(true);
+  // Without a cursor the list is reloaded; with one the next page is appended
+  const fetchReceipts = async (cursor = null) => {
+    if (cursor) {
+      setLoadingMore(true);
+    } else {
+      setLoading(true);
+    }
     try {
-      const response = await receiptApi.getReceipts();
+      const params = {};
+      if (searchTerm.trim()) {
+        params.search = searchTerm.trim();
+      }
+      if (cursor) {
+        params.cursor = cursor;
+      }
+      const response = await receiptApi.getReceipts(params);
       // Handle both paginated and non-paginated responses
-      const receiptsData = response.results || response;
-      setReceipts(Array.isArray(receiptsData) ? receiptsData : []);
+      const receiptsData = Array.isArray(response.results || response) ? response.results || response : [];
+      setReceipts((current) => (cursor ? [...current, ...receiptsData] : receiptsData));
+      setNextCursor(cursorFromUrl(response.next));
     } catch (error) {
       console.error('Error fetching receipts:', error);
       showNotification('Error fetching receipts', 'error');
-      // Set empty array on error instead of mock data
-      setReceipts([]);
+      if (!cursor) {
+        // Set empty array on error instead of mock data
+        setReceipts([]);
+        setNextCursor(null);
+      }
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -324,6 +344,17 @@ export default function ReceiptPage() {
             </tbody>
           </table>
         </div>
+        {nextCursor && (
+          <div className="flex justify-center p-4 border-t border-gray-200 dark:border-gray-700">
+            <button
+              onClick={() => fetchReceipts(nextCursor)}
+              disabled={loadingMore}
+              className="px-4 py-2 text-sm border border-gray-300 dark:border-gray-600 rounded-lg text-gray-700 dark:text-gray-300 hover:bg-gray-50 dark:hover:bg-gray-700 disabled:opacity-60"
+            >
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
       </div>
 
       {/* Modals */}
@@ -13,6 +13,7 @@ import { salesAPI } from "../../services/salesApi"
 import { customerApi } from "../../services/customerApi.js"
 import { inventoryAPI } from "../../services/inventoryApi"
 import LoadingSpinner from "../../components/LoadingSpinner"
+import { cursorFromUrl } from "../../lib/utils"
 import { printJobOrderReport, printSalesReport, printCustomerReport, printSummaryReport } from "../../utils/printUtils"
 import {
   FileText,
@@ -47,8 +48,8 @@ const Reports = () => {
   })
   const [jobOrderPagination, setJobOrderPagination] = useState({
     current_page: 1,
-    total_pages: 1,
-    total_count: 0,
+    next_cursor: null,
+    previous_cursor: null,
     page_size: 10,
   })
   const [jobOrderPageSize, setJobOrderPageSize] = useState(10)
@@ -71,8 +72,8 @@ const Reports = () => {
   const [items, setItems] = useState([])
   const [salesPagination, setSalesPagination] = useState({
     current_page: 1,
-    total_pages: 1,
-    total_count: 0,
+    next_cursor: null,
+    previous_cursor: null,
     page_size: 10,
   })
   const [salesPageSize, setSalesPageSize] = useState(10)
@@ -91,8 +92,8 @@ const Reports = () => {
   })
   const [customerPagination, setCustomerPagination] = useState({
     current_page: 1,
-    total_pages: 1,
-    total_count: 0,
+    next_cursor: null,
+    previous_cursor: null,
     page_size: 10,
   })
   const [customerPageSize, setCustomerPageSize] = useState(10)
@@ -132,15 +133,17 @@ const Reports = () => {
   ]
 
   // Fetch Job Order Report
-  const fetchJobOrderReport = async (page = 1) => {
+  const fetchJobOrderReport = async (cursor = null, page = 1) => {
     try {
       setLoading(true)
       setError(null)
       
       const params = {
-        page,
         page_size: jobOrderPageSize,
       }
+      if (cursor) {
+        params.cursor = cursor
+      }
       
       // Add payment method filter if not 'all'
       if (jobOrderFilters.payment_method && jobOrderFilters.payment_method !== 'all') {
@@ -168,9 +171,9 @@ const Reports = () => {
       
       setJobOrderData(data)
       setJobOrderPagination({
-        current_page: response.current_page || 1,
-        total_pages: response.total_pages || 1,
-        total_count: response.total_count || data.length,
+        current_page: page,
+        next_cursor: cursorFromUrl(response.next),
+        previous_cursor: cursorFromUrl(response.previous),
         page_size: jobOrderPageSize,
       })
       
@@ -200,15 +203,17 @@ const Reports = () => {
   }
 
   // Fetch Sales Report
-  const fetchSalesReport = async (page = 1) => {
+  const fetchSalesReport = async (cursor = null, page = 1) => {
     try {
       setLoading(true)
       setError(null)
       
       const params = {
-        page,
         page_size: salesPageSize,
       }
+      if (cursor) {
+        params.cursor = cursor
+      }
       
       // Add payment method filter if not 'all'
       if (salesFilters.payment_method && salesFilters.payment_method !== 'all') {
@@ -239,9 +244,9 @@ const Reports = () => {
       
       setSalesData(data)
       setSalesPagination({
-        current_page: response.current_page || 1,
-        total_pages: response.total_pages || 1,
-        total_count: response.total_count || data.length,
+        current_page: page,
+        next_cursor: cursorFromUrl(response.next),
+        previous_cursor: cursorFromUrl(response.previous),
         page_size: salesPageSize,
       })
       
@@ -269,15 +274,17 @@ const Reports = () => {
   }
 
   // Fetch Customer Report
-  const fetchCustomerReport = async (page = 1) => {
+  const fetchCustomerReport = async (cursor = null, page = 1) => {
     try {
       setLoading(true)
       setError(null)
       
       const params = {
-        page,
         page_size: customerPageSize,
       }
+      if (cursor) {
+        params.cursor = cursor
+      }
       
       // Add date filters if provided
       if (customerFilters.start_date) {
@@ -294,9 +301,9 @@ const Reports = () => {
       
       setCustomerData(data)
       setCustomerPagination({
-        current_page: response.current_page || 1,
-        total_pages: response.total_pages || 1,
-        total_count: response.total_count || data.length,
+        current_page: page,
+        next_cursor: cursorFromUrl(response.next),
+        previous_cursor: cursorFromUrl(response.previous),
         page_size: customerPageSize,
       })
       
@@ -361,7 +368,7 @@ const Reports = () => {
 
   // Apply filters
   const applyJobOrderFilters = () => {
-    fetchJobOrderReport(1)
+    fetchJobOrderReport()
   }
 
   // Reset filters to today
@@ -375,40 +382,52 @@ const Reports = () => {
   }
 
   const applySalesFilters = () => {
-    fetchSalesReport(1)
+    fetchSalesReport()
   }
 
   const applyCustomerFilters = () => {
-    fetchCustomerReport(1)
+    fetchCustomerReport()
   }
 
   // Pagination handlers
-  const handleJobOrderPageChange = (page) => {
-    fetchJobOrderReport(page)
+  const handleJobOrderPageChange = (direction) => {
+    if (direction === 'next') {
+      fetchJobOrderReport(jobOrderPagination.next_cursor, jobOrderPagination.current_page + 1)
+    } else {
+      fetchJobOrderReport(jobOrderPagination.previous_cursor, jobOrderPagination.current_page - 1)
+    }
   }
 
-  const handleSalesPageChange = (page) => {
-    fetchSalesReport(page)
+  const handleSalesPageChange = (direction) => {
+    if (direction === 'next') {
+      fetchSalesReport(salesPagination.next_cursor, salesPagination.current_page + 1)
+    } else {
+      fetchSalesReport(salesPagination.previous_cursor, salesPagination.current_page - 1)
+    }
   }
 
-  const handleCustomerPageChange = (page) => {
-    fetchCustomerReport(page)
+  const handleCustomerPageChange = (direction) => {
+    if (direction === 'next') {
+      fetchCustomerReport(customerPagination.next_cursor, customerPagination.current_page + 1)
+    } else {
+      fetchCustomerReport(customerPagination.previous_cursor, customerPagination.current_page - 1)
+    }
   }
 
   // Page size change handlers
   const handleJobOrderPageSizeChange = (newSize) => {
     setJobOrderPageSize(newSize)
-    fetchJobOrderReport(1) // Reset to first page
+    fetchJobOrderReport() // Reset to first page
   }
 
   const handleSalesPageSizeChange = (newSize) => {
     setSalesPageSize(newSize)
-    fetchSalesReport(1) // Reset to first page
+    fetchSalesReport() // Reset to first page
   }
 
   const handleCustomerPageSizeChange = (newSize) => {
     setCustomerPageSize(newSize)
-    fetchCustomerReport(1) // Reset to first page
+    fetchCustomerReport() // Reset to first page
   }
 
   // Print handlers
@@ -515,7 +534,7 @@ const Reports = () => {
             <div>
               <CardTitle>Job Order Report</CardTitle>
               <CardDescription>
-                Showing {jobOrderData.length} of {jobOrderPagination.total_count} records
+                Showing {jobOrderData.length} records on this page
               </CardDescription>
             </div>
             <div className="flex items-center space-x-2">
@@ -601,18 +620,18 @@ const Reports = () => {
           </div>
 
           {/* Pagination */}
-          {jobOrderPagination.total_pages > 1 && (
+          {(jobOrderPagination.next_cursor || jobOrderPagination.previous_cursor) && (
             <div className="flex items-center justify-between mt-4">
               <div className="text-sm text-gray-500">
-                Page {jobOrderPagination.current_page} of {jobOrderPagination.total_pages} 
+                Page {jobOrderPagination.current_page}
                 ({jobOrderPageSize} records per page)
               </div>
               <div className="flex items-center space-x-2">
                 <Button
                   variant="outline"
                   size="sm"
-                  onClick={() => handleJobOrderPageChange(jobOrderPagination.current_page - 1)}
-                  disabled={jobOrderPagination.current_page <= 1}
+                  onClick={() => handleJobOrderPageChange('previous')}
+                  disabled={!jobOrderPagination.previous_cursor}
                 >
                   <ChevronLeft className="w-4 h-4" />
                   Previous
@@ -620,8 +639,8 @@ const Reports = () => {
                 <Button
                   variant="outline"
                   size="sm"
-                  onClick={() => handleJobOrderPageChange(jobOrderPagination.current_page + 1)}
-                  disabled={jobOrderPagination.current_page >= jobOrderPagination.total_pages}
+                  onClick={() => handleJobOrderPageChange('next')}
+                  disabled={!jobOrderPagination.next_cursor}
                 >
                   Next
                   <ChevronRight className="w-4 h-4" />
@@ -754,7 +773,7 @@ const Reports = () => {
             <div>
               <CardTitle>Sales Report</CardTitle>
               <CardDescription>
-                Showing {salesData.length} of {salesPagination.total_count} records
+                Showing {salesData.length} records on this page
               </CardDescription>
             </div>
             <div className="flex items-center space-x-2">
@@ -848,18 +867,18 @@ const Reports = () => {
           </div>
 
           {/* Pagination */}
-          {salesPagination.total_pages > 1 && (
+          {(salesPagination.next_cursor || salesPagination.previous_cursor) && (
             <div className="flex items-center justify-between mt-4">
               <div className="text-sm text-gray-500">
-                Page {salesPagination.current_page} of {salesPagination.total_pages}
+                Page {salesPagination.current_page}
                 ({salesPageSize} records per page)
               </div>
               <div className="flex items-center space-x-2">
                 <Button
                   variant="outline"
                   size="sm"
-                  onClick={() => handleSalesPageChange(salesPagination.current_page - 1)}
-                  disabled={salesPagination.current_page <= 1}
+                  onClick={() => handleSalesPageChange('previous')}
+                  disabled={!salesPagination.previous_cursor}
                 >
                   <ChevronLeft className="w-4 h-4" />
                   Previous
@@ -867,8 +886,8 @@ const Reports = () => {
                 <Button
                   variant="outline"
                   size="sm"
-                  onClick={() => handleSalesPageChange(salesPagination.current_page + 1)}
-                  disabled={salesPagination.current_page >= salesPagination.total_pages}
+                  onClick={() => handleSalesPageChange('next')}
+                  disabled={!salesPagination.next_cursor}
                 >
                   Next
                   <ChevronRight className="w-4 h-4" />
@@ -991,7 +1010,7 @@ const Reports = () => {
             <div>
               <CardTitle>Customer Report</CardTitle>
               <CardDescription>
-                Showing {customerData.length} of {customerPagination.total_count} customers
+                Showing {customerData.length} customers on this page
               </CardDescription>
             </div>
             <div className="flex items-center space-x-2">
@@ -1072,18 +1091,18 @@ const Reports = () => {
           </div>
 
           {/* Pagination */}
-          {customerPagination.total_pages > 1 && (
+          {(customerPagination.next_cursor || customerPagination.previous_cursor) && (
             <div className="flex items-center justify-between mt-4">
               <div className="text-sm text-gray-500">
-                Page {customerPagination.current_page} of {customerPagination.total_pages}
+                Page {customerPagination.current_page}
                 ({customerPageSize} records per page)
               </div>
               <div className="flex items-center space-x-2">
                 <Button
                   variant="outline"
                   size="sm"
-                  onClick={() => handleCustomerPageChange(customerPagination.current_page - 1)}
-                  disabled={customerPagination.current_page <= 1}
+                  onClick={() => handleCustomerPageChange('previous')}
+                  disabled={!customerPagination.previous_cursor}
                 >
                   <ChevronLeft className="w-4 h-4" />
                   Previous
@@ -1091,8 +1110,8 @@ const Reports = () => {
                 <Button
                   variant="outline"
                   size="sm"
-                  onClick={() => handleCustomerPageChange(customerPagination.current_page + 1)}
-                  disabled={customerPagination.current_page >= customerPagination.total_pages}
+                  onClick={() => handleCustomerPageChange('next')}
+                  disabled={!customerPagination.next_cursor}
                 >
                   Next
                   <ChevronRight className="w-4 h-4" />
@@ -8,6 +8,7 @@ import { salesAPI } from "../../services/salesApi"
 import { useNotification } from "../../hooks/useNotification"
 import { buildA5TailorInvoiceHTML } from "../../components/print/a5-tailor-invoice"
 import { printHTMLInNewWindow } from "../../components/print/print"
+import { cursorFromUrl } from "../../lib/utils"
 
 export default function Sales() {
   // Get today's date in YYYY-MM-DD format
@@ -20,7 +21,9 @@ export default function Sales() {
   const [isEditModalOpen, setIsEditModalOpen] = useState(false)
   const [editingSale, setEditingSale] = useState(null)
   const [sales, setSales] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [error, setError] = useState(null)
   const { showNotification } = useNotification()
 
@@ -29,9 +32,14 @@ export default function Sales() {
     loadSales()
   }, [startDate, endDate])
 
-  const loadSales = async () => {
+  // Without a cursor the list is reloaded; with one the next page is appended
+  const loadSales = async (cursor = null) => {
     try {
-      setLoading(true)
+      if (cursor) {
+        setLoadingMore(true)
+      } else {
+        setLoading(true)
+      }
       setError(null)
       
       // Build query parameters
@@ -42,6 +50,9 @@ export default function Sales() {
       if (endDate) {
         params.end_date = endDate
       }
+      if (cursor) {
+        params.cursor = cursor
+      }
       
       const response = await salesAPI.getSales(params)
       // Handle both array response and object with data/results property
@@ -53,14 +64,19 @@ export default function Sales() {
       } else if (response?.results && Array.isArray(response.results)) {
         salesData = response.results
       }
-      setSales(salesData)
+      setSales((current) => (cursor ? [...current, ...salesData] : salesData))
+      setNextCursor(cursorFromUrl(response?.next))
     } catch (err) {
       console.error("Error loading sales:", err)
-      setError("Failed to load sales data")
-      setSales([]) // Set empty array on error
       showNotification("Failed to load sales data", "error")
+      if (!cursor) {
+        setError("Failed to load sales data")
+        setSales([]) // Set empty array on error
+        setNextCursor(null)
+      }
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
@@ -450,6 +466,17 @@ export default function Sales() {
               </tbody>
             </table>
           </div>
+          {nextCursor && (
+            <div className="flex justify-center p-4 border-t border-gray-200 dark:border-gray-700">
+              <button
+                onClick={() => loadSales(nextCursor)}
+                disabled={loadingMore}
+                className="px-4 py-2 text-sm border border-gray-300 dark:border-gray-600 rounded-lg text-gray-700 dark:text-gray-300 hover:bg-gray-50 dark:hover:bg-gray-700 disabled:opacity-60"
+              >
+                {loadingMore ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </div>
       )}
 
@@ -25,6 +25,19 @@ const customerApi = {
     }
   },
 
+  // Autocomplete customers by phone, name or customer ID prefix
+  autocompleteCustomers: async (query, limit = 10) => {
+    try {
+      const response = await api.get('/crm/customers/autocomplete/', {
+        params: { q: query, limit }
+      });
+      return response.data;
+    } catch (error) {
+      console.error('Error autocompleting customers:', error);
+      throw error;
+    }
+  },
+
   // Get customer by ID
   getCustomer: async (id) => {
     try {